@@ -7,6 +7,7 @@ import automol.chi
 import automol.graph
 from automol.graph import FunctionalGroup
 import automol.form
+from mechanalyzer.calculator import ich_cache
 
 
 # Name remaping function
@@ -173,9 +174,9 @@ def functional_group_name(ich, name='', rename_rule_dct=None,
         #   conn_string, 3, remove_char_lst=('-', '_'))
 
         # NEW SCHEME
-        c_conn_str = automol.chi.connectivity(
+        c_conn_str = ich_cache.connectivity(
             ich, parse_connection_layer=True, parse_h_layer=False)
-        h_conn_str = automol.chi.connectivity(
+        h_conn_str = ich_cache.connectivity(
             ich, parse_connection_layer=False, parse_h_layer=True)
         chash = ioformat.hash_string(c_conn_str, 3, remove_char_lst=('-', '_'))
         hhash = ioformat.hash_string(h_conn_str, 3, remove_char_lst=('-', '_'))
@@ -222,7 +223,7 @@ def functional_group_name(ich, name='', rename_rule_dct=None,
                        for fgrp_name, fgrp_lst in rename_rule_dct.items()}
     print(rename_rule_dct)
     # Get the ich, geom, and gra and other info used for getting name
-    gra = automol.chi.graph(ich)
+    gra = ich_cache.graph(ich)
     fml = automol.graph.formula(gra)
 
     # Get the number of atoms and functional groups
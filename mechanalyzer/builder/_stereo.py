@@ -4,8 +4,11 @@
     maybe remove all inchis that are not incomplete?
 """
 import os
+import time
+import functools
 import itertools as it
 from copy import deepcopy
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 import automol
 from chemkin_io.writer._util import format_rxn_name
@@ -29,59 +32,124 @@ def expand_mech_stereo(inp_mech_rxn_dct, inp_mech_spc_dct, nprocs='auto',
         stereochemistry already added to them.
     """
 
-    def _expand(name_ich_dct, rxns, output_queue):
-        """ Expand reactons
-        """
-        # First loop over all reactions to add stereo
-        all_ste_rxns = []
-        for rxn in rxns:
-
-            log1 = f'\nExpanding Stereo for Reaction: {format_rxn_name(rxn)}\n'
-            print(log1)
-
-            # Reformat reaction to use InChI instead of mechanism name
-            # Split thrdbdy off, not needed for stereo code, add back later
-            rxn_ich = _rxn_name_to_ich(rxn, name_ich_dct)
-            _rxn_ich = (rxn_ich[0], rxn_ich[1])
-            thrdbdy = rxn_ich[2]
-
-            # Build list of all stereochemically allowed versions of reaction
-            ste_rxns_lst, log2 = _ste_rxn_lsts(_rxn_ich, enant=enant)
-            print(log2)
-            # Appropriately format the reactions with third body
-            ste_rxns_lst = _add_third(ste_rxns_lst, thrdbdy)
-            all_ste_rxns.append(ste_rxns_lst)
-        output_queue.put(tuple(all_ste_rxns))
-        print(f'Processor {os.getpid()} finished')
+    # The expansions arrive in the order of the PESs and connected channel
+    # sets, as soon as all earlier ones are finished
+    all_ste_rxns = ()
+    for _, ste_rxns_lst in expand_mech_stereo_iter(
+            inp_mech_rxn_dct, inp_mech_spc_dct, nprocs=nprocs, enant=enant):
+        all_ste_rxns += ste_rxns_lst
+
+    return all_ste_rxns
+
+
+def expand_mech_stereo_iter(inp_mech_rxn_dct, inp_mech_spc_dct,
+                            nprocs='auto', enant=True):
+    """ Expand each reaction to all of its stereochemical versions, yielding
+        the results in the order of the PESs and connected channel sets
+
+        One pool of worker processes is used for the whole mechanism. The
+        name-to-InChI map is sent to each worker once, and the reactions
+        of all PESs are submitted together, largest species first, so that
+        the longest expansions do not hold up the end of the run. Each
+        result is yielded as soon as it and all results before it are done.
+
+        :param nprocs: number of worker processes, or 'auto' for all CPUs;
+            with 1, the reactions are expanded in this process
+        :type nprocs: int or str
+        :param enant: Include all enantiomers? Otherwise, includes only
+            canonical enantiomer species and reactions.
+        :type enant: bool
+        :return: generator of each rxn and its stereo expansions
+        :rtype: generator of (rxn, ste_rxns_lst)
+    """
 
     # Dictionaries to map name to inchi
     name_ich_dct = mechanalyzer.parser.spc.name_inchi_dct(inp_mech_spc_dct)
+    ordered_rxns = _ordered_stereo_rxns(inp_mech_rxn_dct, name_ich_dct)
+
+    nprocs = os.cpu_count() if nprocs == 'auto' else nprocs
+    if nprocs == 1:
+        _init_expand_worker(name_ich_dct, enant)
+        for rxn in ordered_rxns:
+            yield rxn, _expand_rxn(rxn)
+        return
+
+    # Largest reactions first for load balancing; sizes are the lengths of
+    # the InChIs, which grow with the number of atoms and stereo centers
+    rxns = sorted(
+        ordered_rxns, reverse=True,
+        key=lambda rxn: sum(len(name_ich_dct.get(rgt) or '')
+                            for rgt in rxn[0] + rxn[1]))
+
+    with ProcessPoolExecutor(max_workers=max(min(nprocs, len(rxns)), 1),
+                             initializer=_init_expand_worker,
+                             initargs=(name_ich_dct, enant)) as pool:
+        futures = {pool.submit(_expand_rxn, rxn): rxn for rxn in rxns}
+        done_dct = {}
+        next_idx = 0
+        for future in as_completed(futures):
+            done_dct[futures[future]] = future.result()
+            while (next_idx < len(ordered_rxns) and
+                   ordered_rxns[next_idx] in done_dct):
+                rxn = ordered_rxns[next_idx]
+                yield rxn, done_dct.pop(rxn)
+                next_idx += 1
+
+
+def _ordered_stereo_rxns(inp_mech_rxn_dct, name_ich_dct):
+    """ Get the reactions in the order of the PESs (same stoichiometry) and
+        the connected channel sets within each PES
+    """
 
-    # Generate all stereo reactons from the initial set
     rxns = tuple(inp_mech_rxn_dct.keys())
-    args = (name_ich_dct,)
     pes_noste_rxns_dct = _rxns_noste_pes_dct(rxns, name_ich_dct)
-    all_ste_rxns = ()
 
-    # Loop over the PES (stoich similar)
-    forms = list(pes_noste_rxns_dct.keys())
-    # ste_rxn_cnt = 0
-    for formula in forms:
-        noste_rxns_dct = pes_noste_rxns_dct[formula]
+    ordered_rxns = ()
+    for formula, noste_rxns_dct in pes_noste_rxns_dct.items():
         print('PES: {} has {:g} reactions'.format(
             formula, len(noste_rxns_dct.keys())))
-        pes_gra, ccs_dct = _pes_gra(noste_rxns_dct)
+        _, ccs_dct = _pes_gra(noste_rxns_dct)
         # Loop over ccs (connected channels)
-        for _, rxns in ccs_dct.items():
-            args = (name_ich_dct,)
-            ste_rxns = [
-                key for key, val in noste_rxns_dct.items() if val in rxns]
-            # expand each reaction to all valid stoich versions
-            ste_rxns = execute_function_in_parallel(
-                _expand, ste_rxns, args, nprocs=nprocs)
-            for rxn_lst in ste_rxns:
-                all_ste_rxns += rxn_lst
-    return all_ste_rxns
+        for _, ccs_rxns in ccs_dct.items():
+            ordered_rxns += tuple(
+                key for key, val in noste_rxns_dct.items() if val in ccs_rxns)
+
+    return ordered_rxns
+
+
+# Worker state for expand_mech_stereo_iter; set once per process
+_WORKER_NAME_ICH_DCT = {}
+_WORKER_ENANT = True
+
+
+def _init_expand_worker(name_ich_dct, enant):
+    """ Store the name-to-InChI map and options in a worker process
+    """
+    global _WORKER_NAME_ICH_DCT, _WORKER_ENANT
+    _WORKER_NAME_ICH_DCT = name_ich_dct
+    _WORKER_ENANT = enant
+
+
+def _expand_rxn(rxn):
+    """ Expand one reaction to all of its stereochemical versions
+    """
+
+    log1 = f'\nExpanding Stereo for Reaction: {format_rxn_name(rxn)}\n'
+    print(log1)
+
+    # Reformat reaction to use InChI instead of mechanism name
+    # Split thrdbdy off, not needed for stereo code, add back later
+    rxn_ich = _rxn_name_to_ich(rxn, _WORKER_NAME_ICH_DCT)
+    _rxn_ich = (rxn_ich[0], rxn_ich[1])
+    thrdbdy = rxn_ich[2]
+
+    # Build list of all stereochemically allowed versions of reaction
+    ste_rxns_lst, log2 = _ste_rxn_lsts(_rxn_ich, enant=_WORKER_ENANT)
+    print(log2)
+    print(f'Processor {os.getpid()} finished {format_rxn_name(rxn)}')
+
+    # Appropriately format the reactions with third body
+    return _add_third(ste_rxns_lst, thrdbdy)
 
 
 def expand_mech_stereo_debug(inp_mech_rxn_dct, inp_mech_spc_dct, enant=True):
@@ -236,9 +304,11 @@ def _missed_rxn(rxn, rxn_lst, ignore_rxns):
     return i_is_conn or j_is_conn
 
 
+@functools.lru_cache(maxsize=4096)
 def _enant_rxn(rxn_i):
-    """ Returns the enantiomer of a reaction,
-        uses None if there is no enantiomer
+    """ Returns the enantiomer of a reaction as a tuple,
+        uses None if there is no enantiomer; memoized, since the
+        combo searches check the same reactions many times
     """
     check_ent = [
         tuple(map(automol.chi.reflect, ichs)) for ichs in rxn_i[:-1]]
@@ -247,57 +317,100 @@ def _enant_rxn(rxn_i):
     if check_ent[1] == rxn_i[1]:
         check_ent[1] = None
     check_ent.append(rxn_i[-1])
-    return check_ent
+    return tuple(check_ent)
+
+
+def _get_best_combo(exp_rxns_lst, maxcombo=None, time_budget=None):
+    """ Find the largest combos of stereo reactions with no enantiomeric
+        conflicts, by backtracking over the reactions in order and
+        pruning a partial combo as soon as one of its reactions fails
+
+        :param maxcombo: max number of stereo reactions in a combo
+        :type maxcombo: int
+        :param time_budget: max time (s) for the search; the best combos
+            found so far are used after that
+        :type time_budget: float
+        :return: the best combos, each with the non-stereo reactions added
+        :rtype: generator of tuples
+    """
+    nonste_rxns_lst = ()
+    ste_rxns_lst = ()
+    for rxn in exp_rxns_lst:
+        enantiomer = False
+        for ich in rxn[0] + rxn[1]:
+            if automol.inchi.is_enantiomer(ich):
+                enantiomer = True
+        if enantiomer:
+            ste_rxns_lst += (rxn,)
+        else:
+            nonste_rxns_lst += (rxn,)
+    nrxns = len(ste_rxns_lst)
+    if maxcombo is None:
+        maxcombo = nrxns
+    print('setting r max', maxcombo)
+
+    # Pairwise enantiomer conflicts, checked once per pair of reactions;
+    # _is_ste_conn on a combo is true iff it is true for one of its rxns
+    enant_rxns = [_enant_rxn(rxn_i) for rxn_i in ste_rxns_lst]
+    conflicts = [
+        [_is_ste_conn(enant_rxns[i], (ste_rxns_lst[j],), []) or
+         _is_ste_conn(enant_rxns[j], (ste_rxns_lst[i],), [])
+         for j in range(nrxns)]
+        for i in range(nrxns)]
+
+    start_time = time.time()
+    best_combos = []
+    best_size = 0
+    combo_idxs = []
+
+    def _search(cand_idxs):
+        """ Extend the partial combo with the candidate reactions, which
+            are those later in the list that conflict with none in it
+        """
+        nonlocal best_combos, best_size
+        if (time_budget is not None and
+                time.time() - start_time > time_budget):
+            return
+        size = len(combo_idxs)
+        if size > best_size:
+            best_combos, best_size = [], size
+        if size == best_size and size > 0:
+            best_combos.append(tuple(ste_rxns_lst[i] for i in combo_idxs))
+        # Stop if the combo is full or can no longer reach the best size
+        if size == maxcombo or size + len(cand_idxs) < max(best_size, 1):
+            return
+        for pos, idx in enumerate(cand_idxs):
+            if size + len(cand_idxs) - pos < best_size:
+                break
+            combo = tuple(ste_rxns_lst[i] for i in combo_idxs + [idx])
+            if _missed_rxn(ste_rxns_lst[idx], ste_rxns_lst, combo):
+                continue
+            combo_idxs.append(idx)
+            _search([jdx for jdx in cand_idxs[pos+1:]
+                     if not conflicts[idx][jdx]])
+            combo_idxs.pop()
+
+    _search([idx for idx in range(nrxns) if not conflicts[idx][idx]])
+    if (time_budget is not None and
+            time.time() - start_time > time_budget):
+        print(f'Stereo combo search hit the {time_budget} s time budget;'
+              f' keeping the best {len(best_combos)} combos of size'
+              f' {best_size}')
+    if not best_combos:
+        best_combos = [()]
+
+    return (combo + nonste_rxns_lst for combo in best_combos)
 
 
-def _split_ste_ccs(ccs_rxn_gra):
+def _split_ste_ccs(ccs_rxn_gra, time_budget=None):
     """ seperates a ccs into a dictionary of sccs
         where a numeric index is a key and a
         list of stereo-reactions (in ichs) is val
-    """
-    def _get_best_combo(exp_rxns_lst, maxcombo=None):
-        nonste_rxns_lst = ()
-        ste_rxns_lst = ()
-        for rxn in exp_rxns_lst:
-            enantiomer = False
-            for ich in rxn[0] + rxn[1]:
-                if automol.inchi.is_enantiomer(ich):
-                    enantiomer = True
-            if enantiomer:
-                ste_rxns_lst += (rxn,)
-            else:
-                nonste_rxns_lst += (rxn,)
-        rxn_combos = (0)
-        if maxcombo is None:
-            maxcombo = len(ste_rxns_lst)
-        if maxcombo > 10 and maxcombo < 15:
-            maxcombo = 12
-        elif maxcombo > 14:
-            maxcombo = 5
-        print('setting r max', maxcombo)
-        #for r in range(1, maxcombo+1, 1):# if len(ste_rxns_lst) % 6 == 0 else 2):
-        for r in range(1, maxcombo, 1):# if  len(ste_rxns_lst) % 6 == 0 or len(ste_rxns_lst)==16 else 2):
-            if rxn_combos == ():
-                break
-            print('combining r=', r)
-            last_combo = deepcopy(rxn_combos)
-            rxn_combos = ()
-            for rxn_combo in it.combinations(ste_rxns_lst, r):
-                good_combo = True
-                for rxn_i in rxn_combo:
-                    check_ent = _enant_rxn(rxn_i)
-                    if _is_ste_conn(check_ent, rxn_combo, []):
-                        good_combo = False
-                        break
-                    if _missed_rxn(rxn_i, ste_rxns_lst, rxn_combo):
-                        good_combo = False
-                        break
-                if good_combo:
-                    rxn_combos += (rxn_combo,)
-        if rxn_combos != () and r < 4:
-            last_combo = deepcopy(rxn_combos)
-        return (combo + nonste_rxns_lst for combo in last_combo)
 
+        :param time_budget: max time (s) for each search for the best
+            stereo combos; the best combos found so far are used after that
+        :type time_budget: float
+    """
     def _recursive_step(
             noste_rxn, ccs_rxn_gra, old_sccs_rxn_gra,
             considered_rxns, prev_rxn_lst):
@@ -312,7 +425,8 @@ def _split_ste_ccs(ccs_rxn_gra):
         sccs_rxn_gra = {}
 
         maxcombo=None
-        best_combos = _get_best_combo(exp_rxns_lst, maxcombo=maxcombo)
+        best_combos = _get_best_combo(exp_rxns_lst, maxcombo=maxcombo,
+                                      time_budget=time_budget)
         print("WHAT")
         for rxn_set in  best_combos:
             print('rxn set', rxn_set)
@@ -447,7 +561,8 @@ def _split_ste_ccs(ccs_rxn_gra):
         print(erxn)
     considered_rxns.append(start_key)
     sccs_rxn_gra = {}
-    for idx, rxn_set in enumerate(_get_best_combo(exp_rxns_lst)):#, maxcombo=3)):
+    for idx, rxn_set in enumerate(_get_best_combo(
+            exp_rxns_lst, time_budget=time_budget)):#, maxcombo=3)):
         sccs_rxn_gra[idx] = rxn_set
 
     print('resulting in the following set of sccss')
@@ -1,12 +1,16 @@
 """ Check mechanisms for various flaws/inconsistencies
 """
 
-from collections import Counter as counter
+import numpy
+import pandas
 from chemkin_io.writer._util import format_rxn_name
+from mechanalyzer import xarray_wrappers
+
+KTP_CHECKS = ('large', 'negative', 'nonfinite', 'nonmonotonic')
 
 
 def run_all_checks(rxn_param_dct, rxn_ktp_dct, k_thresholds,
-                   rxn_num_threshold):
+                   rxn_num_threshold, mech_ktp=None, ktp_checks=None):
     """ Run all mechanism checks and output a string describing the results.
 
         :param rxn_param_dct: rate constant parameters for a mechanism
@@ -20,6 +24,13 @@ def run_all_checks(rxn_param_dct, rxn_ktp_dct, k_thresholds,
         :param rxn_num_threshold: # of reactions at and below
             which a species is considered "lone"
         :type rxn_num_threshold: int
+        :param mech_ktp: k(T,P)s for the whole mechanism on a single grid,
+            as from xarray_wrappers.from_rxn_param_dct; if given, the k(T,P)
+            checks are done on this array instead of on rxn_ktp_dct
+        :type mech_ktp: xarray.DataArray with dims (rxn, pres, temp)
+        :param ktp_checks: flags for mech_ktp, from get_ktp_checks; they are
+            computed here if not given
+        :type ktp_checks: dct {check: numpy.ndarray}
         :return total_str: description of all the checks performed
         :rtype: str
     """
@@ -30,16 +41,25 @@ def run_all_checks(rxn_param_dct, rxn_ktp_dct, k_thresholds,
         return '\n' + '+' * 100 + '\n'
 
     total_str = separator()
+    mech_idx = get_mech_idx(rxn_param_dct)
+
+    if mech_ktp is not None:
+        # Large, negative, non-finite, and non-monotonic rate constants
+        if ktp_checks is None:
+            ktp_checks = get_ktp_checks(mech_ktp, k_thresholds,
+                                        mech_idx=mech_idx)
+        total_str += write_ktp_checks(mech_ktp, ktp_checks, k_thresholds,
+                                      sep_str=separator())
+    else:
+        # Large rate constants
+        large_rxn_ktp_dcts = get_large_kts(rxn_ktp_dct, k_thresholds)
+        total_str += write_large_kts(large_rxn_ktp_dcts, k_thresholds)
+        total_str += separator()
 
-    # Large rate constants
-    large_rxn_ktp_dcts = get_large_kts(rxn_ktp_dct, k_thresholds)
-    total_str += write_large_kts(large_rxn_ktp_dcts, k_thresholds)
-    total_str += separator()
-
-    # Negative rate constants
-    negative_rxn_ktp_dct = get_negative_kts(rxn_ktp_dct)
-    total_str += write_negative_kts(negative_rxn_ktp_dct)
-    total_str += separator()
+        # Negative rate constants
+        negative_rxn_ktp_dct = get_negative_kts(rxn_ktp_dct)
+        total_str += write_negative_kts(negative_rxn_ktp_dct)
+        total_str += separator()
 
     # These two currently don't work due to new RxnParams class
     # Duplicate (more than 2) reactions
@@ -53,19 +73,85 @@ def run_all_checks(rxn_param_dct, rxn_ktp_dct, k_thresholds,
     #total_str += separator()
 
     # Lone species
-    lone_spcs = get_lone_spcs(rxn_param_dct, rxn_num_threshold)
+    lone_spcs = get_lone_spcs(rxn_param_dct, rxn_num_threshold,
+                              mech_idx=mech_idx)
     total_str += write_lone_spcs(lone_spcs, rxn_num_threshold)
     total_str += separator()
 
     # Sources and sinks
-    source_spcs, sink_spcs = get_sources_and_sinks(rxn_param_dct)
+    source_spcs, sink_spcs = get_sources_and_sinks(rxn_param_dct,
+                                                   mech_idx=mech_idx)
     total_str += write_sources_and_sinks(source_spcs, sink_spcs)
     total_str += separator()
 
     return total_str
 
 
-def get_sources_and_sinks(rxn_param_dct):
+def get_mech_idx(rxn_param_dct):
+    """ Index a mechanism in a single pass over its reactions, so that the
+        species-based checks do not have to re-scan the reactions
+
+        :param rxn_param_dct: rate constant parameters for a mechanism, or
+            a stream of (rxn, params) records as from ckin_.iter_rxn_params
+        :type rxn_param_dct: dct
+            {rxn1: (param_tuple1, param_tuple2, ...), rxn2: ...}
+        :return mech_idx: the mechanism index, with keys
+            'rct_rxns', 'prd_rxns', 'spc_rxns': rxns in which each species
+                is a reactant, a product, or either {spc: [rxn1, ...]};
+            'thrd_rxns': rxns with each third body {thrd_bod: [rxn1, ...]};
+            'spc_counts': number of appearances of each species as a
+                reactant or product {spc: count};
+            'molecularity': molecularity of each rxn {rxn: int};
+            'form_counts': number of rxns with each functional form, for
+                RxnParams objects {form: count}
+        :rtype: dct
+    """
+
+    rct_rxns, prd_rxns, spc_rxns, thrd_rxns = {}, {}, {}, {}
+    rct_counts, prd_counts = {}, {}
+    molecularity, form_counts = {}, {}
+    rxn_params = (rxn_param_dct.items() if isinstance(rxn_param_dct, dict)
+                  else rxn_param_dct)
+    for rxn, params in rxn_params:
+        rcts, prds, thrd_bods = rxn
+        for spc in rcts:
+            rct_counts[spc] = rct_counts.get(spc, 0) + 1
+        for spc in prds:
+            prd_counts[spc] = prd_counts.get(spc, 0) + 1
+        # Each rxn is only listed once per species
+        for spc in dict.fromkeys(rcts):
+            rct_rxns.setdefault(spc, []).append(rxn)
+        for spc in dict.fromkeys(prds):
+            prd_rxns.setdefault(spc, []).append(rxn)
+        for spc in dict.fromkeys(rcts + prds):
+            spc_rxns.setdefault(spc, []).append(rxn)
+        for thrd_bod in thrd_bods:
+            if thrd_bod:
+                thrd_rxns.setdefault(thrd_bod, []).append(rxn)
+        molecularity[rxn] = get_molecularity(rxn)
+        if hasattr(params, 'get_existing_forms'):
+            for form in params.get_existing_forms():
+                form_counts[form] = form_counts.get(form, 0) + 1
+
+    # Reactants first, then products, as in counter(all_rcts + all_prds)
+    spc_counts = dict(rct_counts)
+    for spc, count in prd_counts.items():
+        spc_counts[spc] = spc_counts.get(spc, 0) + count
+
+    mech_idx = {
+        'rct_rxns': rct_rxns,
+        'prd_rxns': prd_rxns,
+        'spc_rxns': spc_rxns,
+        'thrd_rxns': thrd_rxns,
+        'spc_counts': spc_counts,
+        'molecularity': molecularity,
+        'form_counts': form_counts,
+    }
+
+    return mech_idx
+
+
+def get_sources_and_sinks(rxn_param_dct, mech_idx=None):
     """ Get species that only appear as reactants (sources) or
         only appear as products (sinks). Output sources and sinks and
         the reaction keys for all reactions in which each species
@@ -74,6 +160,8 @@ def get_sources_and_sinks(rxn_param_dct):
         :param rxn_param_dct: rate constant parameters for a mechanism
         :type rxn_param_dct: dct
             {rxn1: (param_tuple1, param_tuple2, ...), rxn2: ...}
+        :param mech_idx: index of the mechanism; built if not given
+        :type mech_idx: dct, from get_mech_idx
         :return source_species: species that only appear
             as reactants and associated reactions
         :rtype: dct {spc1: [rxn1, rxn2, ...], spc2: ...}
@@ -82,23 +170,16 @@ def get_sources_and_sinks(rxn_param_dct):
         :rtype: dct {spc1: [rxn1, rxn2, ...], spc2: ...}
     """
 
-    # Get lists of source and sink species
+    if mech_idx is None:
+        mech_idx = get_mech_idx(rxn_param_dct)
+    rct_rxns, prd_rxns = mech_idx['rct_rxns'], mech_idx['prd_rxns']
+
+    # Get the source and sink species and the reaction name(s) for each
     # Sorted to make the writer test succeed
-    all_rcts, all_prds = _get_rcts_prds(rxn_param_dct)
-    sources = sorted(list(set(all_rcts) - set(all_prds)))
-    sinks = sorted(list(set(all_prds) - set(all_rcts)))
-
-    # Store the reaction name(s) for each source or sink species
-    source_spcs = {spc: [] for spc in sources}
-    sink_spcs = {spc: [] for spc in sinks}
-    for spc in sources:
-        for rxn in rxn_param_dct.keys():
-            if spc in rxn[0]:
-                source_spcs[spc].append(rxn)
-    for spc in sinks:
-        for rxn in rxn_param_dct.keys():
-            if spc in rxn[1]:
-                sink_spcs[spc].append(rxn)
+    source_spcs = {spc: list(rct_rxns[spc]) for spc in sorted(rct_rxns)
+                   if spc not in prd_rxns}
+    sink_spcs = {spc: list(prd_rxns[spc]) for spc in sorted(prd_rxns)
+                 if spc not in rct_rxns}
 
     return source_spcs, sink_spcs
 
@@ -127,11 +208,12 @@ def get_large_kts(rxn_ktp_dct, thresholds):
         bimolec_ktp_dct = {}
         termolec_ktp_dct = {}
         for pressure, (temps, kts) in ktp_dct.items():
-            if max(kts) > thresholds[0] and molecularity == 1:
+            max_kt = numpy.max(kts)
+            if max_kt > thresholds[0] and molecularity == 1:
                 unimolec_ktp_dct[pressure] = (temps, kts)
-            if max(kts) > thresholds[1] and molecularity == 2:
+            if max_kt > thresholds[1] and molecularity == 2:
                 bimolec_ktp_dct[pressure] = (temps, kts)
-            if max(kts) > thresholds[2] and molecularity == 3:
+            if max_kt > thresholds[2] and molecularity == 3:
                 termolec_ktp_dct[pressure] = (temps, kts)
         # Store the dictionaries if they contain anything
         if unimolec_ktp_dct != {}:
@@ -163,7 +245,7 @@ def get_negative_kts(rxn_ktp_dct):
     for rxn, ktp_dct in rxn_ktp_dct.items():
         negative_ktp_dct = {}
         for pressure, (temps, kts) in ktp_dct.items():
-            if min(kts) < 0:
+            if numpy.min(kts) < 0:
                 negative_ktp_dct[pressure] = (temps, kts)
         # Store the ktp_dct if it contains anything
         if negative_ktp_dct != {}:
@@ -172,7 +254,86 @@ def get_negative_kts(rxn_ktp_dct):
     return negative_rxn_ktp_dct
 
 
-def get_lone_spcs(rxn_param_dct, threshold):
+def get_ktp_checks(mech_ktp, thresholds, mech_idx=None):
+    """ Flag the k(T,P)s of a whole mechanism that are larger than the
+        molecularity-specific thresholds, negative, non-finite, or not
+        monotonic in pressure. Each check is done on all rxns at once.
+
+        NaN rows (pressures at which a rxn has no value) are never flagged.
+        A pressure is non-monotonic if, at any temperature, k(P) turns
+        around there; the pressures are taken in increasing order, with
+        'high' last.
+
+        :param mech_ktp: k(T,P)s for all rxns
+        :type mech_ktp: xarray.DataArray with dims (rxn, pres, temp)
+        :param thresholds: rate constant thresholds for
+            uni-, bi-, and ter-molecular reactions
+        :type thresholds: list [float, float, float]
+        :param mech_idx: index of the mechanism, for the molecularities
+        :type mech_idx: dct, from get_mech_idx
+        :return ktp_checks: flags for each check, keyed by KTP_CHECKS
+        :rtype: dct {check: numpy.ndarray of shape (num_rxns, num_pressures)}
+    """
+
+    rxns = xarray_wrappers.get_rxns(mech_ktp)
+    ktps = xarray_wrappers.get_values(mech_ktp)
+    molec_dct = mech_idx['molecularity'] if mech_idx is not None else {}
+    molecs = [molec_dct[rxn] if rxn in molec_dct else get_molecularity(rxn)
+              for rxn in rxns]
+
+    # Threshold for each rxn; rxns of other molecularities are not checked
+    thresh_arr = numpy.append(numpy.asarray(thresholds, dtype=float),
+                              numpy.inf)
+    molec_idxs = numpy.array([molec - 1 if 1 <= molec <= 3 else 3
+                              for molec in molecs], dtype=int)
+    rxn_thresholds = thresh_arr[molec_idxs]
+
+    has_vals = ~numpy.all(numpy.isnan(ktps), axis=2)
+    with numpy.errstate(invalid='ignore'):
+        large = numpy.any(ktps > rxn_thresholds[:, None, None], axis=2)
+        negative = numpy.any(ktps < 0, axis=2)
+    nonfinite = has_vals & ~numpy.all(numpy.isfinite(ktps), axis=2)
+
+    ktp_checks = {
+        'large': large,
+        'negative': negative,
+        'nonfinite': nonfinite,
+        'nonmonotonic': _nonmonotonic_ktps(
+            ktps, xarray_wrappers.get_pressures(mech_ktp)),
+    }
+
+    return ktp_checks
+
+
+def get_ktp_check_table(mech_ktp, ktp_checks):
+    """ Collect the flagged k(T,P)s into a table with one row per
+        rxn, pressure, and failed check
+
+        :param mech_ktp: k(T,P)s for all rxns
+        :type mech_ktp: xarray.DataArray with dims (rxn, pres, temp)
+        :param ktp_checks: flags for each check, from get_ktp_checks
+        :type ktp_checks: dct {check: numpy.ndarray}
+        :return check_table: flagged k(T,P)s, with the columns
+            'rxn', 'pressure', 'check', 'kmin', and 'kmax'
+        :rtype: pandas.DataFrame
+    """
+
+    rxns = xarray_wrappers.get_rxns(mech_ktp)
+    ktps = xarray_wrappers.get_values(mech_ktp)
+    pressures = xarray_wrappers.get_pressure_keys(mech_ktp)
+    rows = []
+    for check, flags in ktp_checks.items():
+        for ridx, pidx in zip(*numpy.nonzero(flags)):
+            rows.append((format_rxn_name(rxns[ridx]), pressures[pidx], check,
+                         numpy.nanmin(ktps[ridx, pidx]),
+                         numpy.nanmax(ktps[ridx, pidx])))
+    check_table = pandas.DataFrame(
+        rows, columns=['rxn', 'pressure', 'check', 'kmin', 'kmax'])
+
+    return check_table
+
+
+def get_lone_spcs(rxn_param_dct, threshold, mech_idx=None):
     """ Get species that are considered "lone" species based on only
         being included in a small number of reactions
         (the cutoff for which is set by threshold).
@@ -186,27 +347,23 @@ def get_lone_spcs(rxn_param_dct, threshold):
         :param threshold: number of reactions at and below which
             a species is considered "lone"
         :type threshold: int
+        :param mech_idx: index of the mechanism; built if not given
+        :type mech_idx: dct, from get_mech_idx
         :return lone_spcs: dictionary containing
             each lone species and its reactions
         :rtype: dct {lone_spc1: [rxn1, rxn2, ...], lone_spc2: ...}
 
     """
 
-    # Get the number of reactions that each species participates in
-    all_rcts, all_prds = _get_rcts_prds(rxn_param_dct)
-    spc_counts = dict(counter(all_rcts + all_prds))
+    if mech_idx is None:
+        mech_idx = get_mech_idx(rxn_param_dct)
 
-    # Filter by the threshold
+    # Filter the species by the number of reactions they participate in and
+    # store the reaction name(s) for each lone species
     lone_spcs = {}
-    for spc, count in spc_counts.items():
+    for spc, count in mech_idx['spc_counts'].items():
         if count <= threshold:
-            lone_spcs[spc] = []
-
-    # Store the reaction name(s) for each lone species
-    for spc, dct in lone_spcs.items():
-        for rxn in rxn_param_dct.keys():
-            if spc in rxn[0] or spc in rxn[1]:  # whether spc in prds or rcts
-                dct.append(rxn)
+            lone_spcs[spc] = list(mech_idx['spc_rxns'][spc])
 
     return lone_spcs
 
@@ -275,7 +432,7 @@ def get_mismatches(rxn_param_dct):
     return mismatched_rxns
 
 
-def get_missing_spcs(rxn_param_dct, spc_dct):
+def get_missing_spcs(rxn_param_dct, spc_dct, mech_idx=None):
     """ Compares a rxn_param_dct and a spc_dct to find missing species
 
         :param rxn_param_dct: rate constant parameters for a mechanism
@@ -283,6 +440,8 @@ def get_missing_spcs(rxn_param_dct, spc_dct):
             {rxn1: (param_tuple1, param_tuple2, ...), rxn2: ...}
         :param spc_dct: info on species
         :type spc_dct: dct {spc1: info_dct1, spc2: ...}
+        :param mech_idx: index of the mechanism; built if not given
+        :type mech_idx: dct, from get_mech_idx
         :return missing_from_csv: list of species missing from the spc_csv
         :rtype: list [spc1, spc2, ...]
         :return missing_from_mech: list of species missing from the mechanism
@@ -305,21 +464,15 @@ def get_missing_spcs(rxn_param_dct, spc_dct):
 
         return stripped_thrd_bod
 
-    # Get the mechanism species
-    mech_spcs = []
-    for rxn in rxn_param_dct.keys():
-        rcts, prds, thrd_bods = rxn
-        for spc in rcts:
-            mech_spcs.append(spc)
-        for spc in prds:
-            mech_spcs.append(spc)
-        for thrd_bod in thrd_bods:
-            if thrd_bod:  # if it's not None, try to read it
-                stripped_thrd_bod = strip_thrd_bod(thrd_bod, rxn)
-                if stripped_thrd_bod:  # will be None for '+M' or '(+M)'
-                    mech_spcs.append(stripped_thrd_bod)
+    if mech_idx is None:
+        mech_idx = get_mech_idx(rxn_param_dct)
 
-    mech_spcs = set(mech_spcs)
+    # Get the mechanism species; each distinct third body is read once
+    mech_spcs = set(mech_idx['spc_rxns'])
+    for thrd_bod, rxns in mech_idx['thrd_rxns'].items():
+        stripped_thrd_bod = strip_thrd_bod(thrd_bod, rxns[0])
+        if stripped_thrd_bod:  # will be None for '+M' or '(+M)'
+            mech_spcs.add(stripped_thrd_bod)
 
     # Get the spc_dct spcs
     csv_spcs = set(spc_dct.keys())
@@ -464,6 +617,93 @@ def write_negative_kts(negative_rxn_ktp_dct):
     return negative_kts_str
 
 
+def write_ktp_checks(mech_ktp, ktp_checks, thresholds, sep_str='\n'):
+    """ Write the flagged k(T,P)s from get_ktp_checks to a string using the
+        writers for each check
+
+        :param mech_ktp: k(T,P)s for all rxns
+        :type mech_ktp: xarray.DataArray with dims (rxn, pres, temp)
+        :param ktp_checks: flags for each check, from get_ktp_checks
+        :type ktp_checks: dct {check: numpy.ndarray}
+        :param thresholds: rate constant thresholds for
+            uni-, bi-, and ter-molecular reactions
+        :type thresholds: list [float, float, float]
+        :param sep_str: string written after each section
+        :type sep_str: str
+        :return ktp_checks_str: string describing the flagged k(T,P)s
+        :rtype: str
+    """
+
+    def _flagged(flags):
+        """ Get the rxn_ktp_dct of the flagged pressures
+        """
+        return _masked_rxn_ktp_dct(mech_ktp, flags)
+
+    # Split the large rate constants by molecularity for write_large_kts
+    molecs = numpy.array([get_molecularity(rxn)
+                          for rxn in xarray_wrappers.get_rxns(mech_ktp)])
+    large_rxn_ktp_dcts = [
+        _flagged(ktp_checks['large'] & (molecs == molec)[:, None])
+        for molec in (1, 2, 3)]
+
+    ktp_checks_str = write_large_kts(large_rxn_ktp_dcts, thresholds)
+    ktp_checks_str += sep_str
+    ktp_checks_str += write_negative_kts(_flagged(ktp_checks['negative']))
+    ktp_checks_str += sep_str
+    ktp_checks_str += write_nonfinite_kts(_flagged(ktp_checks['nonfinite']))
+    ktp_checks_str += sep_str
+    ktp_checks_str += write_nonmonotonic_kts(
+        _flagged(ktp_checks['nonmonotonic']))
+    ktp_checks_str += sep_str
+
+    return ktp_checks_str
+
+
+def write_nonfinite_kts(nonfinite_rxn_ktp_dct):
+    """ Write the rxn_ktp_dct containing non-finite rate constants to a string
+
+    :param nonfinite_rxn_ktp_dct: a dictionary containing
+        any ktp_dcts with NaN or infinite values
+    :type nonfinite_rxn_ktp_dct: dct {rxn1: ktp_dct1, rxn2: ...}
+    :return nonfinite_kts_str: string describing the nonfinite_rxn_ktp_dct
+    :rtype: str
+    """
+
+    nonfinite_kts_str = '\nNON-FINITE RATE CONSTANTS\n\n'
+    if nonfinite_rxn_ktp_dct == {}:
+        nonfinite_kts_str += 'No reactions have non-finite rate constants\n\n\n'
+    else:
+        nonfinite_kts_str += _write_rxn_ktp_dct(nonfinite_rxn_ktp_dct)
+
+    return nonfinite_kts_str
+
+
+def write_nonmonotonic_kts(nonmonotonic_rxn_ktp_dct):
+    """ Write the rxn_ktp_dct containing rate constants that are not
+        monotonic in pressure to a string
+
+    :param nonmonotonic_rxn_ktp_dct: a dictionary containing the ktp_dcts
+        at the pressures where k(P) turns around
+    :type nonmonotonic_rxn_ktp_dct: dct {rxn1: ktp_dct1, rxn2: ...}
+    :return nonmonotonic_kts_str: string describing the
+        nonmonotonic_rxn_ktp_dct
+    :rtype: str
+    """
+
+    nonmonotonic_kts_str = '\nNON-MONOTONIC RATE CONSTANTS IN PRESSURE\n\n'
+    if nonmonotonic_rxn_ktp_dct == {}:
+        nonmonotonic_kts_str += (
+            'No reactions have rate constants that are non-monotonic in '
+            'pressure\n\n\n')
+    else:
+        nonmonotonic_kts_str += (
+            'These reactions have rate constants that turn around at the '
+            'given pressures\n\n')
+        nonmonotonic_kts_str += _write_rxn_ktp_dct(nonmonotonic_rxn_ktp_dct)
+
+    return nonmonotonic_kts_str
+
+
 def write_lone_spcs(lone_spcs, threshold):
     """ Write lone species and reactions in which they participate to a string.
 
@@ -600,27 +840,53 @@ def _write_rxn_ktp_dct(rxn_ktp_dct):
     return output_str
 
 
-def _get_rcts_prds(rxn_param_dct):
-    """ Gets lists of all reactants and products in a mechanism
-        (both lists may contain duplicates)
-
-    :param rxn_param_dct: rate constant parameters for a mechanism
-    :return all_rcts: all reactants in the mechanism
-    :rtype: list [rct1, rct2, ...]
-    :return all_prds: all products in the mechanism
-    :rtype: list [prd1, prd2, ...]
+def _masked_rxn_ktp_dct(mech_ktp, flags):
+    """ Get the rxn_ktp_dct of the flagged rxns and pressures of a
+        mechanism KTP DataArray
     """
 
-    all_rcts = []
-    all_prds = []
-    for rxn in rxn_param_dct.keys():
-        rcts, prds, _ = rxn
-        for rct in rcts:
-            all_rcts.append(rct)
-        for prd in prds:
-            all_prds.append(prd)
+    rxns = xarray_wrappers.get_rxns(mech_ktp)
+    ktps = xarray_wrappers.get_values(mech_ktp)
+    temps = xarray_wrappers.get_temperatures(mech_ktp)
+    pressures = xarray_wrappers.get_pressure_keys(mech_ktp)
+    rxn_ktp_dct = {}
+    for ridx, pidx in zip(*numpy.nonzero(flags)):
+        rxn_ktp_dct.setdefault(rxns[ridx], {})[pressures[pidx]] = (
+            temps, ktps[ridx, pidx])
+
+    return rxn_ktp_dct
+
+
+def _nonmonotonic_ktps(ktps, pressures, log_tol=1e-6):
+    """ Flag the pressures at which k(P) turns around, at any temperature.
+        Rxns with the same pressures defined are checked together, and
+        changes in log10 k below log_tol are treated as flat.
+    """
 
-    return all_rcts, all_prds
+    order = numpy.argsort(pressures, kind='stable')
+    has_vals = ~numpy.all(numpy.isnan(ktps), axis=2)
+
+    nonmonotonic = numpy.zeros(has_vals.shape, dtype=bool)
+    patterns, pattern_idxs = numpy.unique(has_vals[:, order], axis=0,
+                                          return_inverse=True)
+    for pattern_idx, pattern in enumerate(patterns):
+        pidxs = numpy.array(order)[pattern]
+        if len(pidxs) < 3:
+            continue
+        ridxs = numpy.flatnonzero(pattern_idxs.ravel() == pattern_idx)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            dlogk = numpy.diff(numpy.log10(ktps[numpy.ix_(ridxs, pidxs)]),
+                               axis=1)
+        signs = numpy.where(numpy.abs(dlogk) > log_tol, numpy.sign(dlogk), 0)
+        # Carry the last nonzero slope over flat stretches
+        slopes = signs.copy()
+        for idx in range(1, slopes.shape[1]):
+            slopes[:, idx] = numpy.where(slopes[:, idx] == 0,
+                                         slopes[:, idx-1], slopes[:, idx])
+        turns = (signs[:, 1:] * slopes[:, :-1]) < 0
+        nonmonotonic[numpy.ix_(ridxs, pidxs[1:-1])] = numpy.any(turns, axis=2)
+
+    return nonmonotonic
 
 
 def get_molecularity(rxn):
@@ -10,6 +10,7 @@ from mechanalyzer.builder._stereo import _ste_rxn_lsts
 from mechanalyzer.builder._stereo import _remove_enantiomer_reactions
 from mechanalyzer.builder._stereo import _stereo_results
 from chemkin_io.writer._util import format_rxn_name
+from mechanalyzer.calculator import ich_cache
 
 
 # MAIN CALLABLE FUNCTIONS FOR GENERATING REACTION LISTS
@@ -177,7 +178,7 @@ def _radicals(ich_lst, name_lst):
     """
     rad_ichs, rad_names = (), ()
     for ich, name in zip(ich_lst, name_lst):
-        if automol.graph.is_radical_species(automol.chi.graph(ich)):
+        if automol.graph.is_radical_species(ich_cache.graph(ich)):
             rad_ichs += (ich,)
             rad_names += (name,)
 
@@ -188,7 +189,7 @@ def _rct_gras(rct_ichs):
     """ Get reactant graphs from smiles
     """
 
-    rct_gras = list(map(automol.amchi.graph, rct_ichs))
+    rct_gras = list(map(ich_cache.amchi_graph, rct_ichs))
     rct_gras = list(map(automol.graph.without_stereo, rct_gras))
     rct_gras = list(map(automol.graph.explicit, rct_gras))
     rct_gras, _ = automol.graph.standard_keys_for_sequence(rct_gras)
@@ -5,10 +5,10 @@
 
 import sys
 import numpy
-import pandas as pd
 import automol
 from mechanalyzer.parser._util import get_mult
 from mechanalyzer.calculator import formulas
+from mechanalyzer.calculator import ich_cache
 
 # list of formulas for products/reactants identified for the sublcasses
 FMLS_SET = numpy.array(['H1', 'O1', 'H1O1', 'O2', 'H1O2', 'C1H3'])
@@ -265,82 +265,165 @@ def classify_graph(spc_dct, rct_names, prd_names):
     :param rct_names: reactant names (r1, r2, )
     :param prd_names: product names (p1, p2, )
 
-    :returns: reaction class (first of the possible identified classes)
+    :returns: reaction class (all the identified classes, joined by '/')
     :rtype: str
     """
 
-    # ID reaction
-    rct_fmls = tuple(spc_dct[rct]['fml'] for rct in rct_names)
-    prd_fmls = tuple(spc_dct[prd]['fml'] for prd in prd_names)
-
-    rct_ichs = tuple(spc_dct[spc]['inchi'] for spc in rct_names)
-    prd_ichs = tuple(spc_dct[spc]['inchi'] for spc in prd_names)
-
-    if automol.form.reac.is_valid_reaction(rct_fmls, prd_fmls):
-        try:
-            rxn_objs = automol.reac.from_chis(
-                rct_ichs, prd_ichs, stereo = False)
-            rxn_classes = tuple(automol.reac.class_(obj) for obj in rxn_objs)
-        except AssertionError:
-            rxn_classes = ('AssertionError', )
-        except TypeError:
-            print('geoms of rxn classifier fail for rxn: '
-                    f'{rct_ichs} = {prd_ichs}')
-            rxn_classes = ('TypeError', )
-
-        if rxn_classes:
-            # save only the first possible reaction type
-            # rclass = rxn_classes[0]
-            rclass = '/'.join(set(rxn_classes))
-        else:
-            rclass = 'unclassified'
+    return classify_graph_batch(spc_dct, [(rct_names, prd_names)])[0]
 
+
+def classify_graph_batch(spc_dct, rxn_names_lst, nprocs=1):
+    """ calls the graph classifier for many reactions at once; the reactions
+        are classified on a process pool, and the classes are kept in the
+        calculator.ich_cache memo under the reactant and product InChIs
+
+    :param spc_dct: species dictionary
+    :param rxn_names_lst: reactant and product names of each reaction
+        [((r1, r2, ), (p1, p2, )), ...]
+    :param nprocs: number of processes, or 'auto' for all CPUs
+    :type nprocs: int or str
+
+    :returns: reaction class of each reaction, in the order of rxn_names_lst
+    :rtype: list(str)
+    """
+
+    # ID reactions: only those with a valid stoichiometry go to the graphs
+    rclasses = ['unclassified - Wrong Stoichiometry'] * len(rxn_names_lst)
+    valid_idxs = []
+    ichs_lst = []
+    for idx, (rct_names, prd_names) in enumerate(rxn_names_lst):
+        rct_fmls = tuple(spc_dct[rct]['fml'] for rct in rct_names)
+        prd_fmls = tuple(spc_dct[prd]['fml'] for prd in prd_names)
+        if automol.form.reac.is_valid_reaction(rct_fmls, prd_fmls):
+            valid_idxs.append(idx)
+            ichs_lst.append((
+                tuple(spc_dct[spc]['inchi'] for spc in rct_names),
+                tuple(spc_dct[spc]['inchi'] for spc in prd_names)))
+
+    valid_rclasses = ich_cache.map_memoized(
+        _classify_ichs, ichs_lst, nprocs=nprocs)
+    for idx, rclass in zip(valid_idxs, valid_rclasses):
+        rclasses[idx] = rclass
+
+    return rclasses
+
+
+@ich_cache.memoize
+def _classify_ichs(rct_ichs, prd_ichs):
+    """ calls the graph classifier for a reaction given by InChIs
+    """
+
+    try:
+        rxn_objs = ich_cache.reactions_from_chis(
+            rct_ichs, prd_ichs, stereo=False)
+        rxn_classes = tuple(automol.reac.class_(obj) for obj in rxn_objs)
+    except AssertionError:
+        rxn_classes = ('AssertionError', )
+    except TypeError:
+        print('geoms of rxn classifier fail for rxn: '
+              f'{rct_ichs} = {prd_ichs}')
+        rxn_classes = ('TypeError', )
+
+    if rxn_classes:
+        # keep all the possible reaction types, in the order found, so that
+        # the class is the same in every process
+        rclass = '/'.join(dict.fromkeys(rxn_classes))
     else:
-        rclass = 'unclassified - Wrong Stoichiometry'
+        rclass = 'unclassified'
 
     return rclass
 
 
-def classify_ws(subpes_df, elem_reac_df, species_subpes, rxn):
+def encode_classes(rclasses):
+    """ assigns integer codes to reaction classes; code 0 is the empty
+        class '', used for couples of species with no reaction
+
+    :param rclasses: reaction classes
+    :type rclasses: list(str)
+
+    :returns: classes of all codes, code of each of rclasses
+    :rtype: (numpy.ndarray(str), numpy.ndarray(int))
+    """
+    # '' sorts before any other class
+    class_lst, codes = numpy.unique(
+        numpy.array([''] + list(rclasses), dtype=str), return_inverse=True)
+
+    return class_lst, codes[1:]
+
+
+def elem_reac_matrix(species_subpes, rct_names_lst, prd_names_lst, codes):
+    """ builds the elementary reactivity matrix of a subpes: the code of the
+        class of the reaction between each couple of species, in both
+        directions; if a couple appears in more rxns, the last one is kept
+
+    :param species_subpes: list of subpes species
+    :param rct_names_lst: reactant names of each rxn of the subpes
+    :param prd_names_lst: product names of each rxn of the subpes
+    :param codes: class code of each rxn of the subpes (see encode_classes)
+
+    :returns: elementary reactivity matrix
+    :rtype: numpy.ndarray(int) of shape (N species, N species)
+    """
+    spc_idx_dct = {spc: idx for idx, spc in enumerate(species_subpes)}
+    rct_idxs = numpy.array(
+        [spc_idx_dct[rct_names] for rct_names in rct_names_lst], dtype=int)
+    prd_idxs = numpy.array(
+        [spc_idx_dct[prd_names] for prd_names in prd_names_lst], dtype=int)
+
+    # interleave the two directions so that later writes win, rxn by rxn
+    elem_reac_mat = numpy.zeros(
+        (len(species_subpes), len(species_subpes)), dtype=int)
+    elem_reac_mat[numpy.column_stack((prd_idxs, rct_idxs)).ravel(),
+                  numpy.column_stack((rct_idxs, prd_idxs)).ravel()] = (
+        numpy.repeat(numpy.asarray(codes, dtype=int), 2))
+
+    return elem_reac_mat
+
+
+def classify_ws(elem_reac_mat, class_lst, species_subpes,
+                rct_names_lst, prd_names_lst):
     """ classifies well skipping channels of a given subpes
         WARNING: STILL UNDER CONSTRUCTION - SOME TEMPORARY FEATURES
 
-    :param subpes_df: dataframe with subpes info
-    :param elem_reac_df: dataframe with elementary reaction channels of subpes
+    :param elem_reac_mat: elementary reactivity matrix of the subpes
+        (see elem_reac_matrix)
+    :param class_lst: classes of all codes (see encode_classes)
     :param species_subpes: list of subpes species
-    :param rxn: string with rxn belonging to the subpes
+    :param rct_names_lst: reactant names of each WS channel to classify
+    :param prd_names_lst: product names of each WS channel to classify
 
-    :returns: reaction class of the WS channel considered
-    :rtype: str
+    :returns: reaction class of each WS channel; None if not found
+    :rtype: list(str)
     """
     # derive unimolecular species list
-    mult_species_subpes = pd.Series(
-        list(map(len, species_subpes)), index=species_subpes)
-    unimol_species = mult_species_subpes[mult_species_subpes == 1].index
+    spc_idx_dct = {spc: idx for idx, spc in enumerate(species_subpes)}
+    unimol_idxs = numpy.array(
+        [idx for idx, spc in enumerate(species_subpes) if len(spc) == 1],
+        dtype=int)
+    if unimol_idxs.size == 0 or not rct_names_lst:
+        return [None] * len(rct_names_lst)
+    skip_codes = numpy.flatnonzero(numpy.isin(class_lst, ('', 'unclassified')))
+
+    def _first_rxn_types(names_lst):
+        """ code of the first classified rxn between each species and the
+            unimolecular species; -1 if there is none
+        """
+        spc_idxs = numpy.array(
+            [spc_idx_dct[names] for names in names_lst], dtype=int)
+        codes = elem_reac_mat[numpy.ix_(unimol_idxs, spc_idxs)]
+        classified = ~numpy.isin(codes, skip_codes)
+        first_codes = codes[classified.argmax(axis=0),
+                            numpy.arange(len(spc_idxs))]
+        return numpy.where(classified.any(axis=0), first_codes, -1)
 
-    rct_names = subpes_df['rct_names_lst_ord'][rxn]
-    prd_names = subpes_df['prd_names_lst_ord'][rxn]
     # reactants: if bimolecular, find the label of the elementary reaction
     # going to unimolecular species; if unimol, label is 'isom'
     # isolate A+B->C and C->A+B connections
-    rxn_types = elem_reac_df[rct_names][unimol_species]
-    rxn_types = rxn_types[rxn_types != 'unclassified']
-    rxn_types_1 = rxn_types[rxn_types != '']
-
-    rxn_types = elem_reac_df[prd_names][unimol_species]
-    rxn_types = rxn_types[rxn_types != 'unclassified']
-    rxn_types_2 = rxn_types[rxn_types != '']
-
-    try:
-        # TEMPORARY: SHOULD RECONSTRUCT FULL PATH FROM REACTANTS TO PRODUCTS
-        rxn_type_1 = rxn_types_1.iloc[0] # rxn_types_1[0]
-        # TEMPORARY: SHOULD RECONSTRUCT FULL PATH FROM REACTANTS TO PRODUCTS
-        rxn_type_2 = rxn_types_2.iloc[0] # rxn_types_2[0]
-
-        # WRITE THE REACTION TYPE STRING
-        rxn_type_ws = rxn_type_1 + '-' + rxn_type_2 + ' (WS)'
-        return rxn_type_ws
-
-    except IndexError:
-        return None
-
+    # TEMPORARY: SHOULD RECONSTRUCT FULL PATH FROM REACTANTS TO PRODUCTS
+    rxn_types_1 = _first_rxn_types(rct_names_lst)
+    rxn_types_2 = _first_rxn_types(prd_names_lst)
+
+    # WRITE THE REACTION TYPE STRING
+    return [f'{class_lst[rxn_type_1]}-{class_lst[rxn_type_2]} (WS)'
+            if rxn_type_1 >= 0 and rxn_type_2 >= 0 else None
+            for rxn_type_1, rxn_type_2 in zip(rxn_types_1, rxn_types_2)]
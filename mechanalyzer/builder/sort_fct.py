@@ -19,10 +19,11 @@ from mechanalyzer.builder import submech
 from mechanalyzer.builder import rxnclass
 from mechanalyzer.builder import connect_rxn_df
 from mechanalyzer.builder import add_wellskip
-from mechanalyzer.calculator import rates as calc_rates
+from mechanalyzer.calculator import rates_batch as calc_rates_batch
 from mechanalyzer.calculator import thermo
 from mechanalyzer.calculator.ene_partition import phi_equip_fromdct
 from mechanalyzer.calculator import nonboltz
+from mechanalyzer.calculator import ich_cache
 from mechanalyzer.calculator import ktp_util
 from mechanalyzer.parser import pes
 from mechanalyzer.parser.spc import name_inchi_dct
@@ -36,14 +37,20 @@ from mechanalyzer.parser._util import get_fml
 FUELGROUP = ['FUEL','FUEL_RAD','FUEL_ADD_H','FUEL_ADD_CH3','FUEL_ADD_O','FUEL_ADD_OH','FUEL_ADD_O2','R_CH3','R_O','R_O2','R_O4','R_O3-H']
 SUBMECHGROUP = ['CORE']
 SUPMECHGROUP = ['SUPFUEL','SUBFUEL']
+# grid of the rates used by the rate-based criteria
+SORT_TEMPS = numpy.arange(300, 2010, 10)
+SORT_PRESSURES = [1]
         
-def mech_info(rxn_param_dct, spc_dct):
+def mech_info(rxn_param_dct, spc_dct, eval_rates=True):
     """ Build mech_info object for mech sorting
 
         :param spc_dct: species dictionary
         :type spc_dct: dict[?:?]
         :param rxn_dct: parameter dictionary
         :type rxn_dct: dict[?:?]
+        :param eval_rates: whether to evaluate the rates if rxn_dct has
+            parameters rather than ktp dcts; if not, the param_vals are None
+        :type eval_rates: bool
         :return mech_info: objects with mech info
         :rtype: list
     """
@@ -95,15 +102,12 @@ def mech_info(rxn_param_dct, spc_dct):
         return formula_dct_lst, formula_str_lst, rxn_name_lst
 
     if not all([isinstance(val, dict) or isinstance(val, list) for val in rxn_param_dct.values()]):
-        print(
-            '*ktp dct vals not found - derived for sorting purposes derived at [300:10:2010] K at 1 atm')
-        rxn_ktp_dct = calc_rates.eval_rxn_param_dct(rxn_param_dct, [numpy.arange(300, 2010, 10)],
-                                                    [1])
-        for key, val in rxn_ktp_dct.items():
-            if isinstance(val, dict):
-                rxn_ktp_dct[key] = [val]
+        if eval_rates:
+            param_vals = sort_param_vals(rxn_param_dct)
+        else:
+            param_vals = [None] * len(rxn_param_dct)
     else:
-        rxn_ktp_dct = rxn_param_dct  # it means you already provided a ktp dct as input
+        param_vals = list(rxn_param_dct.values())  # it means you already provided a ktp dct as input
 
     # Extract info from dictionary
     rcts, prds, thrdbdy = zip(*rxn_param_dct.keys())
@@ -119,7 +123,24 @@ def mech_info(rxn_param_dct, spc_dct):
 
     return [spc_dct, formula_dct, formula_str,
             rct_names, prd_names, thrdbdy_lst,
-            rxn_name, list(rxn_ktp_dct.values())]
+            rxn_name, param_vals]
+
+
+def sort_param_vals(rxn_param_dct):
+    """ Evaluates the rates used by the rate-based sorting criteria, at
+        SORT_TEMPS and SORT_PRESSURES
+
+        :param rxn_param_dct: rate parameters of the rxns to evaluate
+        :type rxn_param_dct: dict {rxn: params}
+        :return param_vals: [ktp_dct] for each rxn
+        :rtype: list
+    """
+    print(
+        '*ktp dct vals not found - derived for sorting purposes derived at [300:10:2010] K at 1 atm')
+    rxn_ktp_dct = calc_rates_batch.eval_rxn_ktp_dct(
+        rxn_param_dct, [SORT_TEMPS], SORT_PRESSURES)
+
+    return [[ktp_dct] for ktp_dct in rxn_ktp_dct.values()]
 
 
 def cmts_string(name, label, cltype):
@@ -177,73 +198,101 @@ def conn_chn_df(mech_df): # moved outside of the class - taken for granted: clas
         Generate pes dictionary for each reaction and save for later use
 
     :param self.mech_df: dataframe with mech info (contains all reactions)
-    :param conn_chn_df: empty dataframe df[subpes][rxn]
 
-    :returns: conn_chn_df dataframe[subpes][rxn]
-    :rtype: dataframe[int][tuple]
+    :returns: conn_chn_df dataframe[subpes, chnl, pes_chnl_tuple][rxn]
+    :rtype: dataframe[int, int, tuple][tuple]
     """
-    conn_chn_df = pd.DataFrame(
-            index = mech_df.index, columns=['subpes'])
-    
-    pes_dct_df = pd.DataFrame(
-        index=mech_df.index,
-        columns=['chnl', 'pes_chnl_tuple'],
-        # columns=['pes_dct', 'pes_chnl_tuple', 'pes_chnl'],
-        dtype=object)
+    rct_names_lst = mech_df['rct_names_lst'].values
+    prd_names_lst = mech_df['prd_names_lst'].values
+    rxn_names = mech_df['rxn_names'].values
+
+    subpes = numpy.zeros(len(mech_df), dtype=int)
+    chnl = numpy.zeros(len(mech_df), dtype=int)
+    pes_chnl_tuple = numpy.empty(len(mech_df), dtype=object)
 
-    for _, peslist in mech_df.groupby('pes'):
+    for _, pes_idxs in sorted(mech_df.groupby('pes').indices.items()):
         idx_start = 0
-        # Set the names lists for the rxns and species needed below
-        # print(peslist)
-        peslist = peslist.sort_values(by=['rxn_names'])
-        pes_rct_names_lst = peslist['rct_names_lst'].values
-        pes_prd_names_lst = peslist['prd_names_lst'].values
-        pes_rxn_name_lst = peslist.index
+        # Set the names lists for the rxns and species needed below;
+        # rxns with the same name keep the order that sort_values gives
+        pes_idxs = pes_idxs[rxn_names[pes_idxs].argsort(kind='quicksort')]
         connchnls = pes.find_conn_chnls(
-            pes_rct_names_lst, pes_prd_names_lst, pes_rxn_name_lst)
-        # print(connchnls)
-        # Write subpes in conn_chn_df
+            rct_names_lst[pes_idxs], prd_names_lst[pes_idxs], pes_idxs)
+        # Write subpes
         for key, value in connchnls.items():
-            rxns = peslist.iloc[value].sort_values(
-                by=['rxn_names'], ascending=False).index
-
-            # conn_chn_df['subpes'][rxns] = key+1
-            conn_chn_df.loc[rxns, 'subpes'] = key+1
             # reorder by rxn name before assigning the channel index
+            idxs = pes_idxs[value][::-1]
+            idxs = idxs[rxn_names[idxs].argsort(kind='quicksort')][::-1]
+            subpes[idxs] = key+1
+            chnl[idxs] = numpy.arange(len(idxs))+idx_start+1
+            for chnl_idx, idx in enumerate(idxs):
+                pes_chnl_tuple[idx] = (
+                    chnl_idx+idx_start, (rct_names_lst[idx], prd_names_lst[idx]))
+
+            idx_start += len(idxs)
+
+    return pd.DataFrame(
+        {'subpes': subpes, 'chnl': chnl, 'pes_chnl_tuple': pes_chnl_tuple},
+        index=mech_df.index)
+
+
+def lexsort_idxs(mech_df, columns, ascending):
+    """ Finds the order of the rows of mech_df sorted by the given columns,
+        as mech_df.sort_values would, with one lexsort over integer ids of
+        the values of each column; missing values go last
+
+    :param mech_df: dataframe with mech info
+    :param columns: columns to sort by, most important first
+    :type columns: list(str)
+    :param ascending: sorting direction of each column
+    :type ascending: list(bool)
+
+    :returns: positions of the rows in sorted order
+    :rtype: numpy.ndarray(int)
+    """
+    keys = []
+    for col, asc in zip(columns, ascending):
+        ids, uniques = pd.factorize(mech_df[col].values, sort=True)
+        keys.append(numpy.where(
+            ids == -1, len(uniques), ids if asc else len(uniques) - ids - 1))
 
-            for chnl_idx, rxn in enumerate(rxns):
-                rxn_name = tuple(
-                    (peslist['rct_names_lst'][rxn],
-                        peslist['prd_names_lst'][rxn]))
-                pes_dct_df.at[rxn, 'chnl'] = chnl_idx+idx_start+1
+    # numpy.lexsort sorts by the last key first
+    return numpy.lexsort(keys[::-1])
 
-                pes_dct_df.at[rxn, 'pes_chnl_tuple'] = (
-                    chnl_idx+idx_start, rxn_name)
 
-            idx_start += len(rxns)
-        
-    conn_chn_df = pd.concat([conn_chn_df, pes_dct_df], axis=1)
+def _object_col(vals):
+    """ Object column from a list, keeping tuples and lists as single values
+    """
+    col = numpy.empty(len(vals), dtype=object)
+    for idx, val in enumerate(vals):
+        col[idx] = val
+    return col
 
-    return conn_chn_df
 
 class SortMech:
     """ class of methods to organize the mechanism according to given criteria
     """
 
-    def __init__(self, rxn_param_dct, spc_dct):
+    def __init__(self, rxn_param_dct, spc_dct, nprocs=1, cache_path=None):
         """ Initializes the mechanism dataframe and the species dictionary
 
         :param rxn_param_dct: rxn param dct for info extraction
         :param spc_dct: species dictionary
+        :param nprocs: number of processes for the graph classification,
+            or 'auto' for all CPUs
+        :param cache_path: file of the calculator.ich_cache memo to read
+            before and write after the graph classification; not used if None
 
         :returns: None, updates self.
                     self.mech_df: dataframe with mech info
                     self.spc_dct: species dictionary
         """
 
-        # Extract data from mech info
+        # Extract data from mech info; rates are only evaluated once a
+        # criterion needs them (see add_param_vals)
         [spc_dct, formula_dct_lst, formulas, rct_names_lst,
-            prd_names_lst, thrdbdy_lst, rxn_name_lst, param_vals] = mech_info(rxn_param_dct, spc_dct)
+            prd_names_lst, thrdbdy_lst, rxn_name_lst, param_vals] = mech_info(
+                rxn_param_dct, spc_dct, eval_rates=False)
+        self.rxn_param_dct = rxn_param_dct
 
         rxn_index = list(zip(rxn_name_lst, thrdbdy_lst))
 
@@ -260,34 +309,35 @@ class SortMech:
         prd_names_lst_ordered = order_rct_bystoich(
             prd_names_lst, spc_dct=spc_dct)  # put heavier product first
         rct_1, rct_2 = extract_spc(rct_names_lst_ordered)
-        data = numpy.array(
-            [rct_names_lst, prd_names_lst,
-             rct_names_lst_ordered, prd_names_lst_ordered,
-             rct_1, rct_2, molecularity, n_of_prods, pes_lst, formulas,
-             isthrdbdy, thrdbdy_lst, param_vals, rxn_name_lst],
-            dtype=object).T
+        # one typed column each: numbers as int/float, names and tuples as
+        # objects
         self.mech_df = pd.DataFrame(
-            data, index=rxn_index,
-            columns=['rct_names_lst', 'prd_names_lst', 'rct_names_lst_ord',
-                     'prd_names_lst_ord', 'r1', 'r2', 'molecularity',
-                     'N_of_prods', 'pes_fml', 'formulas', 'isthrdbdy',
-                     'thrdbdy', 'param_vals', 'rxn_names'], dtype=object)
-
-        # reindex pes
-        df_pes = pd.DataFrame(
-            index=self.mech_df.index, columns=['pes'])
-        pes_index = 1
-        for _, pes_fml in self.mech_df.groupby('pes_fml'):
-            rxns = pes_fml.index
-            df_pes.loc[rxns,'pes'] = pes_index
-            pes_index += 1
-        # Concatenate the new portion of dataframe
-        self.mech_df = pd.concat([self.mech_df, df_pes], axis=1)
+            {'rct_names_lst': _object_col(rct_names_lst),
+             'prd_names_lst': _object_col(prd_names_lst),
+             'rct_names_lst_ord': _object_col(rct_names_lst_ordered),
+             'prd_names_lst_ord': _object_col(prd_names_lst_ordered),
+             'r1': _object_col(rct_1),
+             'r2': _object_col(rct_2),
+             'molecularity': molecularity,
+             'N_of_prods': numpy.array(n_of_prods, dtype=int),
+             'pes_fml': numpy.array(pes_lst, dtype=float),
+             'formulas': _object_col(formulas),
+             'isthrdbdy': isthrdbdy,
+             'thrdbdy': _object_col(thrdbdy_lst),
+             'param_vals': _object_col(param_vals),
+             'rxn_names': _object_col(rxn_name_lst)},
+            index=rxn_index)
+
+        # reindex pes: one id per formula, in increasing order
+        self.mech_df['pes'] = pd.factorize(
+            self.mech_df['pes_fml'].values, sort=True)[0] + 1
         # add subpes and chnl once and for all
-        self.mech_df = pd.concat(
-            [self.mech_df, conn_chn_df(self.mech_df)], axis=1)  # add subpes
+        for col, vals in conn_chn_df(self.mech_df).items():
+            self.mech_df[col] = vals
 
         self.spc_dct = spc_dct  # set for later use
+        self.nprocs = nprocs
+        self.cache_path = cache_path
         # empty list for initialization (otherwise pylint warning)
         self.species_subset_df = ()
         self.species_list = ()
@@ -347,7 +397,11 @@ class SortMech:
 
         # now that you fixed it, save it in self
         self.hierarchy = hierarchy
-        
+
+        # the prompt analysis reads rates from the unfiltered mechanism
+        if 'submech_prompt' in hierarchy:
+            self.add_param_vals()
+
         # if species_list is not empty: pre-process the mechanism
         self.preproc_specieslist(species_list)
 
@@ -380,8 +434,9 @@ class SortMech:
                 df_optn = pd.DataFrame(
                     index=self.mech_df.index, columns=[optn])
                 df_optn = fun_name(df_optn)
-                # Concatenate the new portion of dataframe
-                self.mech_df = pd.concat([self.mech_df, df_optn], axis=1)
+                # Write the new columns in place
+                for col, vals in df_optn.items():
+                    self.mech_df[col] = vals
 
         # 0. remove fake rxns added through wellskipping generator
         rxns_fake = self.mech_df[self.mech_df['chnl']
@@ -394,20 +449,18 @@ class SortMech:
         # rxn vals, ratio and names are descending
         asc_val[-3:] = [False, False, False]
         asc_series = pd.Series(asc_val, index=criteria_all + ['rxn_names'])
-        
-            
+
         try:
             # last "standard" criterion: rxn name
             asclst = list(
                 asc_series[self.hierarchy[:-1] + ['rxn_names']].values)
-            self.mech_df = self.mech_df.sort_values(
-                by=self.hierarchy[:-1] + ['rxn_names'],
-                ascending=asclst)
+            self.mech_df = self.mech_df.iloc[lexsort_idxs(
+                self.mech_df, self.hierarchy[:-1] + ['rxn_names'], asclst)]
         except KeyError as err:
             raise KeyError(
                 'Error: Reactions not sorted according ',
                 f'to all criteria: missing {err}, exiting') from err
-                
+
         # 2. assign class headers
         labels = pd.Series(labels_all, index=criteria_all)
         self.class_headers(self.hierarchy, labels)
@@ -705,15 +758,14 @@ class SortMech:
 
         # if species list is not found: do nothing, species entry remain empty
         if len(self.species_list) > 0:
-            for rxn in reac_sp_df.index:
-                rcts = list(self.mech_df['rct_names_lst'][rxn])
-                prds = list(self.mech_df['prd_names_lst'][rxn])
-                # check species hierarchically
-                for sp_i in self.species_list:
-                    if ((any(sp_i == rct for rct in rcts) or
-                         any(sp_i == prd for prd in prds))
-                            and isinstance(reac_sp_df['species'][rxn], float)):
-                        reac_sp_df.at[rxn, 'species'] = sp_i
+            species = []
+            for rcts, prds in zip(self.mech_df['rct_names_lst'].values,
+                                  self.mech_df['prd_names_lst'].values):
+                # check species hierarchically: the first one found is kept
+                species.append(next(
+                    (sp_i for sp_i in self.species_list
+                     if sp_i in rcts or sp_i in prds), numpy.nan))
+            reac_sp_df['species'] = _object_col(species)
         return reac_sp_df
 
     def group_submech(self, submech_df):
@@ -760,10 +812,10 @@ class SortMech:
                 
             return group
             
-        for rxn in submech_df.index:
-            rcts = list(self.mech_df['rct_names_lst'][rxn])
-            prds = list(self.mech_df['prd_names_lst'][rxn])
-            spcs = rcts + prds
+        spcs_grps = []
+        for rcts, prds in zip(self.mech_df['rct_names_lst'].values,
+                              self.mech_df['prd_names_lst'].values):
+            spcs = list(rcts) + list(prds)
             # check if rcts and prds are in species list. if so, check spc type
             species_subset = []
             for spc in spcs:
@@ -772,7 +824,8 @@ class SortMech:
                     
             spcs_grp = assign_group(species_subset)
             # check species hierarchically (hierarchy fixed in species list)
-            submech_df.at[rxn, lbl_col] = spcs_grp
+            spcs_grps.append(spcs_grp)
+        submech_df[lbl_col] = _object_col(spcs_grps)
 
         return submech_df
 
@@ -1162,11 +1215,9 @@ class SortMech:
         :rtype: dataframe[str][tuple]
         """
         # assign multiplicity values to each reactant
-        for rxn in reac_mult_df.index:
-            mult = 1
-            rcts = self.mech_df['rct_names_lst'][rxn]
-            mult = get_mult(rcts, self.spc_dct)
-            reac_mult_df.at[rxn, 'mult'] = str(mult)
+        reac_mult_df['mult'] = [
+            str(get_mult(rcts, self.spc_dct))
+            for rcts in self.mech_df['rct_names_lst'].values]
 
         return reac_mult_df
 
@@ -1182,12 +1233,14 @@ class SortMech:
             dataframe[class][rxn]
         :rtype: dataframe[str][tuple]
         """
-        for rxn in rxncl_broad_df.index:
-            rcts = self.mech_df['rct_names_lst_ord'][rxn]
-            prds = self.mech_df['prd_names_lst_ord'][rxn]
-            _smol = (self.mech_df['molecularity'][rxn] == 1)
-            _tbody = (self.mech_df['molecularity'][rxn] == 2
-                      and self.mech_df['isthrdbdy'][rxn] == 1)
+        rxn_classes_broad = []
+        for rcts, prds, molecularity, isthrdbdy in zip(
+                self.mech_df['rct_names_lst_ord'].values,
+                self.mech_df['prd_names_lst_ord'].values,
+                self.mech_df['molecularity'].values,
+                self.mech_df['isthrdbdy'].values):
+            _smol = (molecularity == 1)
+            _tbody = (molecularity == 2 and isthrdbdy == 1)
 
             if _smol or _tbody:
                 # unimolecular reaction classification
@@ -1197,15 +1250,16 @@ class SortMech:
                 # bimolecular reaction classification
                 rxn_class_broad = rxnclass.classify_bimol(
                     rcts, prds, self.spc_dct)
-            rxncl_broad_df.at[rxn, 'rxn_class_broad'] = rxn_class_broad
-            # (rxncl_broad_df.loc[[rxn], 'rxn_class_broad']) # technicall
+            rxn_classes_broad.append(rxn_class_broad)
+        rxncl_broad_df['rxn_class_broad'] = rxn_classes_broad
 
         return rxncl_broad_df
 
     def rxnclass_graph(self, rxncl_graph_df):
         """ assigns reaction classes using graph approach to all reactions
-            first subdivides the mech into subpeses; then classifies all rxn
-            within the subpes, including wellskipping channels
+            first classifies all the elementary rxns in one batch (see
+            self.nprocs and self.cache_path); then classifies the
+            wellskipping channels within each subpes
 
         :param self.mech_df: dataframe with mech info (contains all reactions)
         :param rxncl_graph_df: empty dataframe
@@ -1220,7 +1274,27 @@ class SortMech:
         # done in __init__ in the updated version
         # self.mech_df = pd.concat([self.mech_df, self.chnl('')], axis=1)
 
-        # 2. Graph classification or each subpes
+        # 2. Graph classification of all the elementary rxns at once
+        # Exclude rxns with more than 2 rcts or prds (not elementary!)
+        rclass_dct = dict.fromkeys(self.mech_df.index, 'unclassified - lumped')
+        elem_rxn_names_dct = {
+            rxn: (rct_names, prd_names) for rxn, rct_names, prd_names in zip(
+                self.mech_df.index, self.mech_df['rct_names_lst'],
+                self.mech_df['prd_names_lst'])
+            if len(rct_names) < 3 and len(prd_names) < 3}
+        if self.cache_path is not None:
+            ich_cache.load_cache(self.cache_path)
+        rclasses = rxnclass.classify_graph_batch(
+            self.spc_dct, list(elem_rxn_names_dct.values()),
+            nprocs=self.nprocs)
+        if self.cache_path is not None:
+            ich_cache.save_cache(self.cache_path)
+        rclass_dct.update(zip(elem_rxn_names_dct, rclasses))
+
+        # 3. Classify the well skipping channels of each subpes with its
+        # elementary reactivity matrix of integer class codes
+        class_lst, class_codes = rxnclass.encode_classes(rclass_dct.values())
+        code_dct = dict(zip(rclass_dct, class_codes))
         for _, subpes_df in self.mech_df.groupby(['pes', 'subpes']):
             # sort by molecularity: analyze first unimolecular isomerizations,
             # unimolecular decompositions, and then bimolecular reactions
@@ -1229,51 +1303,51 @@ class SortMech:
             # REFER TO REORDERED SPECIES NAMES,
             # OTHERWISE YOU MAY HAVE INCONSISTENT SPECIES NAMING
             # subpes species list
-            species_subpes = sorted(list(set(
-                list(subpes_df['rct_names_lst_ord'].values) +
-                list(subpes_df['prd_names_lst_ord'].values))))
-
-            # build dataframe: elementary reactivity matrix
-            _nsubpes = len(species_subpes)
-            elem_reac_df = pd.DataFrame(
-                numpy.zeros((_nsubpes, _nsubpes), dtype='<U32'),
-                index=species_subpes,
-                columns=species_subpes)
-
-            # graph classification
-            for rxn in subpes_df.index:
-                rct_names = subpes_df['rct_names_lst'][rxn]
-                prd_names = subpes_df['prd_names_lst'][rxn]
-                rct_names_ord = subpes_df.at[rxn, 'rct_names_lst_ord']
-                prd_names_ord = subpes_df.at[rxn, 'prd_names_lst_ord']
-                # Exclude rxns with more than 2 rcts or prds (not elementary!)
-                if len(rct_names) < 3 and len(prd_names) < 3:
-
-                    rclass = rxnclass.classify_graph(
-                        self.spc_dct, rct_names, prd_names)
+            rct_names_ord_lst = list(subpes_df['rct_names_lst_ord'])
+            prd_names_ord_lst = list(subpes_df['prd_names_lst_ord'])
+            species_subpes = sorted(set(rct_names_ord_lst + prd_names_ord_lst))
 
-                else:
-                    rclass = 'unclassified - lumped'
-                rxncl_graph_df.at[rxn, 'rxn_class_graph'] = rclass
-
-                # store values in the elementary reactivity matrix
-                # (for now contaminated with isomerizations)
-                elem_reac_df.at[prd_names_ord, rct_names_ord] = rclass
-                elem_reac_df.at[rct_names_ord, prd_names_ord] = rclass
+            # (for now contaminated with isomerizations)
+            elem_reac_mat = rxnclass.elem_reac_matrix(
+                species_subpes, rct_names_ord_lst, prd_names_ord_lst,
+                [code_dct[rxn] for rxn in subpes_df.index])
 
-            # 3. classify well skipping channels
             # reclassify the unclassified reactions A->B+C, B+C->D, B+C->E+F
-            for rxn in subpes_df.index:
-                if rxncl_graph_df['rxn_class_graph'][rxn] == 'unclassified':
+            ws_idxs = [idx for idx, rxn in enumerate(subpes_df.index)
+                       if rclass_dct[rxn] == 'unclassified']
+            rxn_types_ws = rxnclass.classify_ws(
+                elem_reac_mat, class_lst, species_subpes,
+                [rct_names_ord_lst[idx] for idx in ws_idxs],
+                [prd_names_ord_lst[idx] for idx in ws_idxs])
+            for idx, rxn_type_ws in zip(ws_idxs, rxn_types_ws):
+                if rxn_type_ws is not None:
+                    rclass_dct[subpes_df.index[idx]] = rxn_type_ws
+
+        rxncl_graph_df['rxn_class_graph'] = [
+            rclass_dct[rxn] for rxn in rxncl_graph_df.index]
 
-                    # call external function for WS channel classification
+        return rxncl_graph_df
 
-                    rxn_type_ws = rxnclass.classify_ws(
-                        subpes_df, elem_reac_df, species_subpes, rxn)
-                    if rxn_type_ws is not None:
-                        rxncl_graph_df.at[rxn, 'rxn_class_graph'] = rxn_type_ws
+    def add_param_vals(self):
+        """ Evaluates the rates of the reactions in the mechanism that have
+            none yet, and stores them in the 'param_vals' column
 
-        return rxncl_graph_df
+        :param self.mech_df: dataframe with mech info
+        :returns: None. updates self.mech_df['param_vals']
+        """
+        missing = numpy.array(
+            [vals is None for vals in self.mech_df['param_vals']], dtype=bool)
+        if missing.any():
+            rxn_keys = list(zip(
+                self.mech_df['rct_names_lst'].values[missing],
+                self.mech_df['prd_names_lst'].values[missing],
+                self.mech_df['thrdbdy'].values[missing]))
+            param_vals = sort_param_vals(
+                {rxn: self.rxn_param_dct[rxn] for rxn in rxn_keys})
+            vals_col = self.mech_df['param_vals'].values.copy()
+            for idx, vals in zip(numpy.flatnonzero(missing), param_vals):
+                vals_col[idx] = vals
+            self.mech_df['param_vals'] = vals_col
 
     def rxn_max_vals(self, rxn_maxvals_df):
         """ Determines the maximum value of the rates in ktp dictionary.
@@ -1284,11 +1358,12 @@ class SortMech:
         :returns: rxn_maxvals_df dataframe with overall max value of the rate
         :rtype: dataframe[float][tuple]
         """
+        self.add_param_vals()
         # extract maximum value for each ktp dictionary
-        for rxn in rxn_maxvals_df.index:
-            param_vals_dct = self.mech_df['param_vals'][rxn]
-            max_val = ktp_util.get_max_aligned_values(param_vals_dct)
-            rxn_maxvals_df.at[rxn, 'rxn_max_vals'] = max_val
+        rxn_maxvals_df['rxn_max_vals'] = numpy.array(
+            [ktp_util.get_max_aligned_values(param_vals_dct)
+             for param_vals_dct in self.mech_df['param_vals'].values],
+            dtype=float)
 
         return rxn_maxvals_df
 
@@ -1302,14 +1377,15 @@ class SortMech:
         :returns: rxn_max_ratio dataframe with overall max value of the ratio
         :rtype: dataframe[float][tuple]
         """
+        self.add_param_vals()
         # extract maximum ratio for each set ktp dictionary
-        for rxn in rxn_maxratio_df.index:
-            param_vals_dct = self.mech_df['param_vals'][rxn]
+        max_vals = []
+        for param_vals_dct in self.mech_df['param_vals'].values:
             # get the ratio:
             param_ratio_dct = ktp_util.get_aligned_rxn_ratio_dct(
                 param_vals_dct)
-            max_val = ktp_util.get_max_aligned_values(param_ratio_dct)
-            rxn_maxratio_df.at[rxn, 'rxn_max_ratio'] = max_val
+            max_vals.append(ktp_util.get_max_aligned_values(param_ratio_dct))
+        rxn_maxratio_df['rxn_max_ratio'] = numpy.array(max_vals, dtype=float)
 
         return rxn_maxratio_df
 
@@ -1330,16 +1406,11 @@ class SortMech:
                     'cmts_top': comments to write as header for a reaction
                     'cmts_inline': comments to write on same line of reaction
         """
-        # if comments already in mech_df: remove them:
-        if 'cmts_inline' in self.mech_df.columns and 'cmts_top' in self.mech_df.columns:
-            self.mech_df = self.mech_df.drop(
-                ['cmts_inline', 'cmts_top'], axis=1)
-        # df for comments_top and comments_inline
-        ept_df = numpy.zeros((len(self.mech_df.index), 1), dtype=str)
-        df_cmts_top = pd.DataFrame(
-            ept_df, index=self.mech_df.index, columns=['cmts_top'])
-        df_cmts_inline = pd.DataFrame(
-            ept_df, index=self.mech_df.index, columns=['cmts_inline'])
+        # comments_top and comments_inline, written by position
+        cmts_top = numpy.full(len(self.mech_df.index), '', dtype=object)
+        cmts_inline = numpy.full(len(self.mech_df.index), '', dtype=object)
+        crit_df = self.mech_df[hierarchy[:-1]].assign(
+            rxn_pos=numpy.arange(len(self.mech_df.index)))
 
         try:
             n_headers = int(hierarchy[-1])
@@ -1347,32 +1418,31 @@ class SortMech:
             raise ValueError(
                 '*ERROR: Last line of sorting options is the N ',
                 'of criteria to use for class headers') from err
+        top_labels = labels[hierarchy[:n_headers]]
+        inline_labels = labels[hierarchy[n_headers:-1]]
 
         # Write topheader comments
         if n_headers > 0:
-            for name, rdf in self.mech_df.groupby(hierarchy[:n_headers]):
+            for name, rdf in crit_df.groupby(hierarchy[:n_headers]):
                 # Write rxn class as top header comments
-                rxnclass = cmts_string(
-                    name, labels[hierarchy[:n_headers]], 'class_head')
-                idx0 = rdf.index[0]
-                df_cmts_top.at[idx0, 'cmts_top'] = rxnclass
+                rxnclass = cmts_string(name, top_labels, 'class_head')
+                cmts_top[rdf['rxn_pos'].values[0]] = rxnclass
 
                 # Write inline comments if necessary
                 if n_headers < len(hierarchy)-1:
                     for name2, rdf2 in rdf.groupby(hierarchy[n_headers:-1]):
                         rxnclass = cmts_string(
-                            name2, labels[hierarchy[n_headers:-1]], 'subclass')
-                        df_cmts_inline.loc[rdf2.index, 'cmts_inline'] = rxnclass
+                            name2, inline_labels, 'subclass')
+                        cmts_inline[rdf2['rxn_pos'].values] = rxnclass
         else:
             # Write only inline comments
-            for name, rdf in self.mech_df.groupby(hierarchy[n_headers:-1]):
-                rxnclass = cmts_string(
-                    name, labels[hierarchy[n_headers:-1]], 'class')
-                df_cmts_inline.loc[rdf.index, 'cmts_inline'] = rxnclass
+            for name, rdf in crit_df.groupby(hierarchy[n_headers:-1]):
+                rxnclass = cmts_string(name, inline_labels, 'class')
+                cmts_inline[rdf['rxn_pos'].values] = rxnclass
 
-        # Concatenate DFs
-        self.mech_df = pd.concat(
-            [self.mech_df, df_cmts_top, df_cmts_inline], axis=1)
+        # Write the comments in place
+        self.mech_df['cmts_top'] = cmts_top
+        self.mech_df['cmts_inline'] = cmts_inline
 
     # OUTPUT DATAFRAMES and DICTIONARIES #
     def return_mech_df(self):
@@ -1419,7 +1489,7 @@ class SortMech:
             for subpes_idx, pes_dct_df in pes_all_df.groupby('subpes'):
                 # Get the ('fml', n_pes, n_subpes) for dict key
                 pes_dct_df = pes_dct_df.sort_values(by='chnl')
-                pes_dct_key = (fml_str, pes_idx-1, subpes_idx-1)
+                pes_dct_key = (fml_str, int(pes_idx)-1, int(subpes_idx)-1)
                 pes_chnl_tuples = pes_dct_df['pes_chnl_tuple'].values
                 chnl_lst = tuple(pes_chnl_tuples)
                 pes_dct[pes_dct_key] = chnl_lst
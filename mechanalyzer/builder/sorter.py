@@ -29,13 +29,16 @@ def sorted_pes_dct(spc_str, mech_str, isolate_spc, sort_lst):
     return srt_mch.return_pes_dct()
 
 
-def sorted_mech(spc_str, mech_str, isolate_spc, sort_lst, spc_therm_dct=None, dct_flt_grps={}, stereo_optns=False):
-    """ Function that conducts the sorting process for all of the above tests
+def sorted_mech(spc_str, mech_str, isolate_spc, sort_lst, spc_therm_dct=None, dct_flt_grps={}, stereo_optns=False,
+                nprocs=1, cache_path=None):
+    """ Function that conducts the sorting process for all of the above tests;
+        nprocs and cache_path are used for the graph classification
     """
 
     # Build mech information
     srt_mch, rxn_param_dct = _sort_objs(
-        spc_str, mech_str, sort_lst, isolate_spc, stereo_optns=stereo_optns)
+        spc_str, mech_str, sort_lst, isolate_spc, stereo_optns=stereo_optns,
+        nprocs=nprocs, cache_path=cache_path)
 
     pes_groups = None
     rxns_filter = None
@@ -66,7 +69,8 @@ def sorted_mech(spc_str, mech_str, isolate_spc, sort_lst, spc_therm_dct=None, dc
     return rxn_param_dct_sort, spc_dct_ord, cmts_dct, pes_groups, rxns_filter
 
 
-def _sort_objs(spc_str, mech_str, sort_lst, isolate_spc, stereo_optns=False):
+def _sort_objs(spc_str, mech_str, sort_lst, isolate_spc, stereo_optns=False,
+               nprocs=1, cache_path=None):
     """ Build the sort-mech object
     """
 
@@ -79,14 +83,16 @@ def _sort_objs(spc_str, mech_str, sort_lst, isolate_spc, stereo_optns=False):
         mech_str, MECH_TYPE)
 
     # Build the sorted mechanism and species objects
-    srt_mch = sorting(rxn_param_dct, spc_dct, sort_lst, isolate_spc)
+    srt_mch = sorting(rxn_param_dct, spc_dct, sort_lst, isolate_spc,
+                      nprocs=nprocs, cache_path=cache_path)
     # spc_dct_ord = sparser.reorder_by_atomcount(spc_dct)
 
     return srt_mch, rxn_param_dct
 
 
 # Functions that perform the individual sorting process
-def sorting(rxn_param_dct, spc_dct, sort_lst, isolate_species):
+def sorting(rxn_param_dct, spc_dct, sort_lst, isolate_species, nprocs=1,
+            cache_path=None):
     """ Uses the SortMech class to sort mechanism info and
         returns the sorted indices and the corresponding comments.
 
@@ -95,12 +101,18 @@ def sorting(rxn_param_dct, spc_dct, sort_lst, isolate_species):
     :param sort_lst: list with sorting criteria
     :param isolate_species: species you want to isolate in the final mechanism
     :type isolate_species: list()
+    :param nprocs: number of processes for the graph classification
+    :type nprocs: int or str
+    :param cache_path: file of the calculator.ich_cache memo to read and
+        write for the graph classification; not used if None
+    :type cache_path: str
 
     calls sorting functions in mechanalyzer/pes
     returns the rxn indices associated with the comments about sorting
     """
 
-    srt_mch = sort_fct.SortMech(rxn_param_dct, spc_dct)
+    srt_mch = sort_fct.SortMech(
+        rxn_param_dct, spc_dct, nprocs=nprocs, cache_path=cache_path)
     srt_mch.sort(sort_lst, isolate_species)
 
     return srt_mch
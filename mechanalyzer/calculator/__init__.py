@@ -3,9 +3,12 @@ calculates derived quantities from the strings of the species
 """
 
 from mechanalyzer.calculator import rates
+from mechanalyzer.calculator import rates_batch
+from mechanalyzer.calculator import rates_cache
 from mechanalyzer.calculator import thermo
 from mechanalyzer.calculator import combine
 from mechanalyzer.calculator import compare
+from mechanalyzer.calculator import ich_cache
 from mechanalyzer.calculator import ene_partition
 from mechanalyzer.calculator import ene_util
 from mechanalyzer.calculator import ktp_util
@@ -16,9 +19,12 @@ from mechanalyzer.calculator import spinfo_frommess
 
 __all__ = [
     'rates',
+    'rates_batch',
+    'rates_cache',
     'thermo',
     'combine',
     'compare',
+    'ich_cache',
     'ene_partition',
     'ene_util',
     'ktp_util',
@@ -8,8 +8,8 @@ import numpy
 from phydat import phycon
 from chemkin_io.writer import _util as writer_util
 import ratefit
-from automol.chi import without_stereo
 from ioformat import pathtools
+from mechanalyzer.calculator.ich_cache import without_stereo
 from mechanalyzer.parser import spc as spc_parser
 
 RC_CAL = phycon.RC_CAL  # universal gas constant in cal/mol-K
@@ -260,7 +260,12 @@ def get_rename_instr(mech_spc_dct1, mech_spc_dct2, strip_ste=True):
 
     rename_instr = {}
     rename_str = '-zz'
-    already_done = []
+    already_done = set()
+
+    # Index mech2 by identity so each spc1 only looks at its matches; the
+    # positions are used to process matches in the order of mech_spc_dct2
+    spc_idx_dct = get_spc_idx_dct(mech_spc_dct2, strip_ste=strip_ste)
+    spc2_pos_dct = {spc2: pos for pos, spc2 in enumerate(mech_spc_dct2)}
 
     # Loop through each species in mech1
     for spc1, spc_dct1 in mech_spc_dct1.items():
@@ -268,19 +273,22 @@ def get_rename_instr(mech_spc_dct1, mech_spc_dct2, strip_ste=True):
         # Strip stereo layer(s) if indicated
         if strip_ste:
             ich1 = without_stereo(ich1)
-        # Loop over each spc in mech_spc_dct2
-        for spc2, spc_dct2 in mech_spc_dct2.items():
+        # Get the candidates in mech2: same identity or same name
+        spc2s = set(spc_idx_dct.get((ich1, mlt1, chg1, exc1), ()))
+        if spc1 in spc2_pos_dct:
+            spc2s.add(spc1)
+        for spc2 in sorted(spc2s, key=spc2_pos_dct.__getitem__):
             # First, check if the species has already been done
             if spc2 in already_done:
                 continue  # skip everything below and go to next spc2
             # Check if species are identical
-            spc_same = are_spc_same(ich1, mlt1, chg1, exc1, fml1, spc_dct2, 
-                                    strip_ste=strip_ste)
+            spc_same = are_spc_same(ich1, mlt1, chg1, exc1, fml1,
+                                    mech_spc_dct2[spc2], strip_ste=strip_ste)
             # If species are identical
             if spc_same:
                 if spc1 != spc2:  # if spc names different, add to rename_instr
                     rename_instr[spc2] = spc1
-                    already_done.append(spc2)
+                    already_done.add(spc2)
             # If species are different but have same name
             elif spc1 == spc2:
                 rename_instr[spc2] = spc2 + rename_str
@@ -289,6 +297,30 @@ def get_rename_instr(mech_spc_dct1, mech_spc_dct2, strip_ste=True):
     return rename_instr
 
 
+def get_spc_idx_dct(mech_spc_dct, strip_ste=True, canon_ent=False):
+    """ Index the species of a mech_spc_dct by their identity, which is
+        (InChI, multiplicity, charge, excitation flag)
+
+        :param mech_spc_dct: the mech_spc_dct to index
+        :type mech_spc_dct: dct {spc1: ident_array1, spc2: ...}
+        :param strip_ste: whether to strip stereo layer(s) from the InChIs
+        :type strip_ste: Bool
+        :param canon_ent: whether to use the canonical enantiomer InChIs
+        :type canon_ent: Bool
+        :return spc_idx_dct: the spc names with each identity, in order
+        :rtype: dct {(ich, mlt, chg, exc): [spc1, spc2, ...]}
+    """
+
+    spc_idx_dct = {}
+    for spc, spc_dct in mech_spc_dct.items():
+        ich, mlt, chg, exc, _ = _read_spc_dct(spc_dct, canon_ent=canon_ent)
+        if strip_ste:
+            ich = without_stereo(ich)
+        spc_idx_dct.setdefault((ich, mlt, chg, exc), []).append(spc)
+
+    return spc_idx_dct
+
+
 def are_spc_same(ich1, mlt1, chg1, exc1, fml1, spc_dct2, strip_ste=False, 
                  canon_ent=False):
     """ Compares two species dictionaries to see if they are the same
@@ -0,0 +1,224 @@
+"""
+Process-wide memo of pure InChI operations
+
+The same automol conversions (stereo stripping, connectivity strings,
+graphs, instability products, canonical enantiomers) are run over and over
+on identical strings by the builder and parser. Each memoized operation
+keeps a least recently used store of its results, bounded in size, with hit
+and miss counters. The stores can be saved to and loaded from disk, so that
+repeated builds of the same species set skip the graph work. A saved file
+is only read back if it was written with the same cache version and the
+same version of automol.
+
+The results are shared, so they must not be modified by callers.
+"""
+
+import os
+import pickle
+import importlib
+import functools
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import automol
+
+CACHE_VERSION = 1  # bump when a memoized function changes its results
+DEFAULT_MAX_SIZE = 100000  # results kept per operation
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser('~'), '.cache', 'mechanalyzer', 'ich_cache.pkl')
+
+# {operation name: OrderedDict {key: result}}, {operation name: [hits, misses]}
+_STORES = {}
+_COUNTS = {}
+_MAX_SIZES = {}
+_FXNS = {}
+
+
+def memoize(fxn, max_size=DEFAULT_MAX_SIZE):
+    """ Memoize a pure function of hashable arguments in the shared stores
+
+        :param fxn: function to memoize
+        :type fxn: callable
+        :param max_size: max number of results kept
+        :type max_size: int
+        :return: memoized function
+        :rtype: callable
+    """
+
+    name = f'{fxn.__module__}.{fxn.__qualname__}'
+    store = _STORES.setdefault(name, OrderedDict())
+    counts = _COUNTS.setdefault(name, [0, 0])
+    _MAX_SIZES[name] = max_size
+    _FXNS[name] = fxn
+
+    @functools.wraps(fxn)
+    def _memoized(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        try:
+            result = store[key]
+        except KeyError:
+            counts[1] += 1
+            result = fxn(*args, **kwargs)
+            store[key] = result
+            if len(store) > max_size:
+                store.popitem(last=False)
+        else:
+            counts[0] += 1
+            store.move_to_end(key)
+        return result
+
+    _memoized.cache_name = name
+    return _memoized
+
+
+def map_memoized(memo_fxn, args_lst, nprocs=1, chunksize=16):
+    """ Evaluate a memoized function for many sets of positional arguments;
+        the results that are not stored yet are found on a process pool and
+        then added to the memo
+
+        :param memo_fxn: function returned by memoize
+        :type memo_fxn: callable
+        :param args_lst: positional arguments of each call
+        :type args_lst: list [tuple1, tuple2, ...]
+        :param nprocs: number of worker processes, or 'auto' for all CPUs
+        :type nprocs: int or str
+        :param chunksize: number of calls sent to a worker at once
+        :type chunksize: int
+        :return results: result of each call, in the order of args_lst
+        :rtype: list
+    """
+
+    name = memo_fxn.cache_name
+    store = _STORES[name]
+    counts = _COUNTS[name]
+    keys = [(tuple(args), ()) for args in args_lst]
+
+    # Find the unique calls that have to be made
+    new_keys = [key for key in dict.fromkeys(keys) if key not in store]
+    counts[0] += len(keys) - len(new_keys)
+    counts[1] += len(new_keys)
+    nprocs = os.cpu_count() if nprocs == 'auto' else nprocs
+    nprocs = max(min(nprocs, len(new_keys)), 1)
+    if nprocs == 1:
+        new_results = [_FXNS[name](*args) for args, _ in new_keys]
+    else:
+        module = _FXNS[name].__module__
+        with ProcessPoolExecutor(max_workers=nprocs) as pool:
+            new_results = list(pool.map(
+                _call_stored_fxn, [name] * len(new_keys),
+                [module] * len(new_keys), [args for args, _ in new_keys],
+                chunksize=chunksize))
+    new_key_result_dct = dict(zip(new_keys, new_results))
+
+    # Add the new results to the memo and collect all results
+    results = []
+    for key in keys:
+        if key in new_key_result_dct:
+            results.append(new_key_result_dct[key])
+        else:
+            results.append(store[key])
+            store.move_to_end(key)
+    for key, result in new_key_result_dct.items():
+        store[key] = result
+        if len(store) > _MAX_SIZES[name]:
+            store.popitem(last=False)
+
+    return results
+
+
+def cache_info():
+    """ Get the hits, misses, and number of stored results of each
+        memoized operation
+
+        :rtype: dict {name: {'hits': int, 'misses': int, 'size': int}}
+    """
+    return {name: {'hits': _COUNTS[name][0], 'misses': _COUNTS[name][1],
+                   'size': len(store)}
+            for name, store in _STORES.items()}
+
+
+def clear_cache():
+    """ Remove all stored results and reset the counters
+    """
+    for name, store in _STORES.items():
+        store.clear()
+        _COUNTS[name][:] = [0, 0]
+
+
+def save_cache(path=DEFAULT_CACHE_PATH):
+    """ Write the stored results to disk
+
+        :param path: path of the cache file
+        :type path: str
+    """
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as cache_file:
+        pickle.dump(_cache_header(), cache_file, protocol=4)
+        pickle.dump({name: dict(store) for name, store in _STORES.items()},
+                    cache_file, protocol=4)
+    os.replace(tmp_path, path)
+
+
+def load_cache(path=DEFAULT_CACHE_PATH):
+    """ Add stored results from disk to the memo; a missing or unreadable
+        file is skipped, and a file written with another cache version or
+        automol version is deleted
+
+        :param path: path of the cache file
+        :type path: str
+        :return: whether the file was read
+        :rtype: Bool
+    """
+
+    try:
+        with open(path, 'rb') as cache_file:
+            header = pickle.load(cache_file)
+            if header != _cache_header():
+                name_store_dct = None
+            else:
+                name_store_dct = pickle.load(cache_file)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+        return False
+
+    if name_store_dct is None:  # stale results
+        try:
+            os.remove(path)
+        except FileNotFoundError:  # removed by another process
+            pass
+        return False
+
+    for name, saved_store in name_store_dct.items():
+        if name in _STORES:  # skip operations that no longer exist
+            store = _STORES[name]
+            for key, result in saved_store.items():
+                if len(store) >= _MAX_SIZES[name]:
+                    break
+                store.setdefault(key, result)
+
+    return True
+
+
+def _cache_header():
+    """ The versions that saved results are only valid for
+    """
+    return {'cache_version': CACHE_VERSION,
+            'automol_version': getattr(automol, '__version__', None)}
+
+
+def _call_stored_fxn(name, module, args):
+    """ Call the unmemoized version of a function in a worker process
+    """
+    if name not in _FXNS:  # the memoize call happens on import of module
+        importlib.import_module(module)
+    return _FXNS[name](*args)
+
+
+# Memoized operations
+without_stereo = memoize(automol.chi.without_stereo)
+connectivity = memoize(automol.chi.connectivity)
+graph = memoize(automol.chi.graph)
+amchi_graph = memoize(automol.amchi.graph)
+instability_product_inchis = memoize(automol.reac.instability_product_inchis)
+reactions_from_chis = memoize(automol.reac.from_chis)
+canonical_enantiomer = memoize(automol.chi.canonical_enantiomer)
@@ -7,7 +7,7 @@ import copy
 import numpy
 import pandas
 from phydat import phycon
-from scipy.special import eval_chebyt
+from numpy.polynomial.chebyshev import chebvander
 from mechanalyzer.calculator import thermo
 
 RC = phycon.RC_CAL  # gas constant in cal/(mol.K)
@@ -193,6 +193,40 @@ def arr(arr_tuples, temps, tref, rval=RC):
     return kts
 
 
+def arr_stack(arr_tuples_lst, temps, tref, rval=RC):
+    """ Calculates T-dependent rate constants [k(T)]s for several sets of
+        Arrhenius parameters, where each set can have any number of terms.
+        All terms are evaluated in one pass and then summed within their set.
+
+        :param arr_tuples_lst: Arrhenius fit parameters for each set
+        :type arr_tuples_lst: list [((A1, n1, Ea1), (A2, n2, Ea2), ...), ...]
+        :param temps: temperature array used to get k(T)s (K)
+        :type temps: numpy.ndarray
+        :param tref: reference temperature used for modified Arrhenius (K)
+        :type tref: float
+        :return kts: k(T)s for each set
+        :rtype: numpy.ndarray of shape (num_sets, num_temps)
+    """
+
+    owners, terms = [], []
+    for idx, arr_tuples in enumerate(arr_tuples_lst):
+        for arr_tuple in arr_tuples:
+            assert len(arr_tuple) == 3, (
+                f'Length of Arrhenius tuple should be 3, not {len(arr_tuple)}')
+            owners.append(idx)
+            terms.append(arr_tuple)
+    terms = numpy.array(terms, dtype=float).reshape(-1, 3)
+
+    a_pars, n_pars, ea_pars = (terms[:, [idx]] for idx in range(3))
+    term_kts = (a_pars * (temps / tref)**n_pars *
+                numpy.exp(-ea_pars / (rval * temps)))
+
+    kts = numpy.zeros((len(arr_tuples_lst), len(temps)))
+    numpy.add.at(kts, owners, term_kts)
+
+    return kts
+
+
 def plog(plog_dct, temps_lst, pressures, tref=1.0):
     """ Calculates T,P-dependent rate constants [k(T,P)]s using
         a PLOG functional expression.
@@ -209,77 +243,82 @@ def plog(plog_dct, temps_lst, pressures, tref=1.0):
         :rtype: dict {pressure: (temps, kts)}
     """
 
-    def plog_one_p(plog_dct, temps, pressure, tref=1.0):
-        """ Calculates T,P-dependent rate constants [k(T,P)]s using
-            a PLOG functional expression, at a single pressure,
-            across several temperatures.
-        """
-
-        # Check if pressure in plog dct; use plog pressure for numerical stab
-        pressure_defined = False
-        plog_pressures = list(plog_dct.keys())
-        for plog_pressure in plog_pressures:
-            if numpy.isclose(pressure, plog_pressure, rtol=1.0e-2):
-                pressure_defined = True
-                plog_params = plog_dct[plog_pressure]
-
-        # If pressure equals value use, arrhenius expression
-        if pressure_defined:
-            kts = arr(plog_params, temps, tref=tref)
-        else:
-            # Calculate pressure term for PLOG expression
-            # Use two PLOG pressures our pressure of interest sits between
-            for i, _ in enumerate(plog_pressures):
-                if i != len(plog_pressures)-1:
-                    if plog_pressures[i] < pressure < plog_pressures[i+1]:
-                        plow = plog_pressures[i]
-                        phigh = plog_pressures[i+1]
-                        plow_params = plog_dct[plow]
-                        phigh_params = plog_dct[phigh]
-                        break
-            # Note: log10 instead of ln; no difference
-            pres_term = ((numpy.log10(pressure) - numpy.log10(plow)) /
-                         (numpy.log10(phigh) - numpy.log10(plow)))
-
-            # Calculate k(T)s at high-P and low-P with Arrhenius expressions
-            kts_low = arr(plow_params, temps, tref=tref)
-            kts_high = arr(phigh_params, temps, tref=tref)
-
-            # Calculate K(T,P)s with PLOG expression
-            log_kts = (
-                numpy.log10(kts_low) +
-                ((numpy.log10(kts_high)-numpy.log10(kts_low)) * pres_term)
-            )
-            kts = 10**(log_kts)
-
-        return kts
-
     # Remove 'high' from pressures and the corresponding temperature array
     temps_lst, pressures = remove_high(temps_lst, pressures)
-
-    # Set the plog pressures to see if pressure is in range
-    max_plog = max(list(plog_dct.keys()))
-    min_plog = min(list(plog_dct.keys()))
-
-    # Build the ktp_dct
+    if not pressures:
+        return {}
+
+    # Sort the PLOG pressures and bracket all pressures at once
+    plog_pressures = sorted(plog_dct.keys())
+    arr_tuples_lst = [plog_dct[plog_pressure] for plog_pressure in
+                      plog_pressures]
+    lo_idx, hi_idx, weight, is_exact = plog_brackets(
+        numpy.array(plog_pressures, dtype=float),
+        numpy.array(pressures, dtype=float))
+
+    # Get k(T)s at each PLOG pressure and interpolate log k across the grid;
+    # if the temps differ by pressure, only the brackets are evaluated
+    if all(numpy.array_equal(temps, temps_lst[0]) for temps in temps_lst):
+        plog_kts = arr_stack(arr_tuples_lst, temps_lst[0], tref)
+        lo_kts, hi_kts = plog_kts[lo_idx], plog_kts[hi_idx]
+    else:
+        lo_kts, hi_kts = zip(*(
+            arr_stack([arr_tuples_lst[lidx], arr_tuples_lst[hidx]], temps,
+                      tref)
+            for lidx, hidx, temps in zip(lo_idx, hi_idx, temps_lst)))
     ktp_dct = {}
     for pidx, pressure in enumerate(pressures):
-        temps = temps_lst[pidx]
-        # If input pressure falls between min and max pressures
-        if min_plog <= pressure <= max_plog:
-            kts = plog_one_p(plog_dct, temps, pressure, tref=tref)
-            ktp_dct[pressure] = (temps, kts)
-        # If input pressure falls below min pressure, use min pressure
-        elif pressure < min_plog:
-            kts = plog_one_p(plog_dct, temps, min_plog, tref=tref)
-        # If input pressure falls above max pressure, use max pressure
-        elif pressure > max_plog:
-            kts = plog_one_p(plog_dct, temps, max_plog, tref=tref)
-        ktp_dct[pressure] = (temps, kts)
+        kts = _plog_interp(lo_kts[pidx], hi_kts[pidx], weight[pidx],
+                           is_exact[pidx])
+        ktp_dct[pressure] = (temps_lst[pidx], kts)
 
     return ktp_dct
 
 
+def plog_brackets(plog_pressures, pressures):
+    """ Finds the PLOG pressures that bracket each pressure, along with the
+        weights for interpolating in log P. Pressures outside the PLOG range
+        are set to the nearest PLOG pressure, and pressures within 1% of a
+        PLOG pressure use that pressure exactly.
+
+        :param plog_pressures: sorted PLOG pressures (atm)
+        :type plog_pressures: numpy.ndarray
+        :param pressures: pressures at which to get k(T,P)s (atm)
+        :type pressures: numpy.ndarray
+        :return lo_idx: index of the lower bracketing PLOG pressure
+        :rtype: numpy.ndarray of ints
+        :return hi_idx: index of the upper bracketing PLOG pressure
+        :rtype: numpy.ndarray of ints
+        :return weight: log P interpolation weight, from 0 (low) to 1 (high)
+        :rtype: numpy.ndarray
+        :return is_exact: whether each pressure matches a PLOG pressure
+        :rtype: numpy.ndarray of Bools
+    """
+
+    pressures = numpy.clip(pressures, plog_pressures[0], plog_pressures[-1])
+    close = numpy.isclose(pressures[:, numpy.newaxis],
+                          plog_pressures[numpy.newaxis, :], rtol=1.0e-2)
+    is_exact = numpy.any(close, axis=1)
+    # Use the last matching PLOG pressure if there are several
+    match_idx = len(plog_pressures) - 1 - numpy.argmax(close[:, ::-1], axis=1)
+
+    hi_idx = numpy.clip(numpy.searchsorted(plog_pressures, pressures),
+                        1, max(len(plog_pressures) - 1, 1))
+    hi_idx = numpy.minimum(hi_idx, len(plog_pressures) - 1)
+    lo_idx = numpy.maximum(hi_idx - 1, 0)
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        weight = (
+            (numpy.log10(pressures) - numpy.log10(plog_pressures[lo_idx])) /
+            (numpy.log10(plog_pressures[hi_idx]) -
+             numpy.log10(plog_pressures[lo_idx])))
+
+    lo_idx = numpy.where(is_exact, match_idx, lo_idx)
+    hi_idx = numpy.where(is_exact, match_idx, hi_idx)
+    weight = numpy.where(is_exact, 0.0, weight)
+
+    return lo_idx, hi_idx, weight, is_exact
+
+
 def cheb(alpha, tlim, plim, temps_lst, pressures):
     """ Calculates T,P-dependent rate constants [k(T,P)]s using
         a Chebyshev functional expression.
@@ -298,56 +337,62 @@ def cheb(alpha, tlim, plim, temps_lst, pressures):
         :rtype: dict {pressure: (temps, kts)}
     """
 
-    def cheb_one_p(alpha, tlim, plim, temps, pressure):
-        """ Calculates T,P-dependent rate constants [k(T,P)]s using
-            a Chebyshev functional expression, at a single pressure,
-            across several temperatures.
-
-            :param temps: temperature array used to get k(T)s (K)
-            :type temps: numpy.ndarray
-            :return kts: k(T)s at the given pressure
-            :rtype: numpy.ndarray
-            (other inputs unchanged from parent function)
-        """
-
-        tmin, tmax = tlim
-        pmin, pmax = plim
-        logp = numpy.log10(pressure)
-        logpmin = numpy.log10(pmin)
-        logpmax = numpy.log10(pmax)
-        alpha_nrows, alpha_ncols = alpha.shape
-
-        kts = numpy.zeros(len(temps))
-        for i, temp in enumerate(temps):
-            ctemp = (
-                (2.0 * temp**(-1) - tmin**(-1) - tmax**(-1)) /
-                (tmax**(-1) - tmin**(-1)))
-            cpress = (
-                (2.0 * logp - logpmin - logpmax) /
-                (logpmax - logpmin))
-
-            log_kt = 0.0
-            for j in range(alpha_nrows):
-                for k in range(alpha_ncols):
-                    log_kt += (alpha[j][k] * eval_chebyt(j, ctemp) *
-                               eval_chebyt(k, cpress))
-
-            kts[i] = 10**(log_kt)
-
-        return kts
-
     # Remove 'high' from pressures and the corresponding temperature array
     temps_lst, pressures = remove_high(temps_lst, pressures)
 
+    # If all pressures share one temp array (the usual case), get the whole
+    # grid from a single matrix product; otherwise, go pressure by pressure
     ktp_dct = {}
-    for pidx, pressure in enumerate(pressures):
-        temps = temps_lst[pidx]
-        kts = cheb_one_p(alpha, tlim, plim, temps, pressure)
-        ktp_dct[pressure] = (temps, kts)
+    if pressures and all(numpy.array_equal(temps, temps_lst[0])
+                         for temps in temps_lst[1:]):
+        log_ktps = cheb_log_ktps(alpha, tlim, plim, temps_lst[0], pressures)
+        for pidx, pressure in enumerate(pressures):
+            ktp_dct[pressure] = (temps_lst[pidx], 10**log_ktps[pidx])
+    else:
+        for pidx, pressure in enumerate(pressures):
+            temps = temps_lst[pidx]
+            log_ktps = cheb_log_ktps(alpha, tlim, plim, temps, [pressure])
+            ktp_dct[pressure] = (temps, 10**log_ktps[0])
 
     return ktp_dct
 
 
+def cheb_log_ktps(alpha, tlim, plim, temps, pressures):
+    """ Calculates log10 k(T,P)s on a grid of temperatures and pressures
+        using a Chebyshev functional expression. The T and P basis matrices
+        are built once and contracted with the alpha matrix.
+
+        :param alpha: Chebyshev coefficient matrix
+        :type alpha: numpy.ndarray
+        :param tlim: minimum and maximum temperatures of the Chebyshev model
+        :type tlim: tuple (tmin, tmax)
+        :param plim: minimum and maximum pressures of the Chebyshev model
+        :type plim: tuple (pmin, pmax)
+        :param temps: temperature array used to get k(T,P)s (K)
+        :type temps: numpy.ndarray
+        :param pressures: pressures used to get k(T,P)s (atm); no 'high'
+        :type pressures: list
+        :return log_ktps: log10 k(T,P)s
+        :rtype: numpy.ndarray of shape (num_pressures, num_temps)
+    """
+
+    alpha = numpy.asarray(alpha, dtype=float)
+    tdeg, pdeg = alpha.shape
+    tmin, tmax = tlim
+    pmin, pmax = plim
+
+    # Chebyshev polynomials in reduced inverse T and reduced log P
+    tbasis = _cheb_basis(1.0 / numpy.asarray(temps, dtype=float),
+                         1.0 / tmin, 1.0 / tmax, tdeg)
+    pbasis = _cheb_basis(numpy.log10(numpy.asarray(pressures, dtype=float)),
+                         numpy.log10(pmin), numpy.log10(pmax), pdeg)
+
+    # log k[p, t] = sum_jk pbasis[p, k] alpha[j, k] tbasis[t, j]
+    log_ktps = pbasis @ alpha.T @ tbasis.T
+
+    return log_ktps
+
+
 def troe(highp_arr, lowp_arr, troe_params, temps_lst, pressures,
          collid_factor=1.0, tref=1.0):
     """ Calculates T,P-dependent rate constants [k(T,P)]s using
@@ -372,78 +417,9 @@ def troe(highp_arr, lowp_arr, troe_params, temps_lst, pressures,
         :rtype: dict {pressure: (temps, kts)}
     """
 
-    def troe_one_p(highp_arr, lowp_arr, troe_params, temps, pressure,
-                   collid_factor=1.0, tref=1.0):
-        """ Calculates T,P-dependent rate constants [k(T,P)]s using
-            a Troe functional expression, at a single pressure,
-            across several temperatures.
-
-            :param temps: temperature array used to get k(T)s (K)
-            :type temps: numpy.ndarray
-            :return kts: k(T)s at the given pressure
-            :rtype: numpy.ndarray
-            (other inputs unchanged from parent function)
-        """
-
-        def _f_broadening_term(pr_term, troe_params, temps):
-            """ Calculates the F broadening factor term
-
-                :param pr_term: reduced pressure terms at all temps
-                :type pr_term: numpy.ndarray
-                :return f_cent: F broadening term
-                :rtype: float
-                (other inputs unchanged from parent function)
-            """
-
-            if len(troe_params) == 3:
-                alpha, ts3, ts1 = troe_params
-                ts2 = numpy.nan  # prevents annoying Pylint warning
-            else:
-                alpha, ts3, ts1, ts2 = troe_params
-
-            # Calculate Fcent term
-            f_cent = ((1.0 - alpha) * numpy.exp(-temps / ts3) +
-                      alpha * numpy.exp(-temps / ts1))
-            if ts2 is not None and ts2 is not numpy.nan:  # catches nan & None
-                f_cent += numpy.exp(-ts2 / temps)
-
-            # Calculate the Log F term
-            c_val = -0.4 - 0.67 * numpy.log10(f_cent)
-            n_val = 0.75 - 1.27 * numpy.log10(f_cent)
-            d_val = 0.14
-            val = ((numpy.log10(pr_term) + c_val) /
-                   (n_val - d_val * (numpy.log10(pr_term) + c_val)))**2
-            logf = (1.0 + val)**(-1) * numpy.log10(f_cent)
-
-            # Calculate F broadening term
-            f_term = 10**(logf)
-
-            return f_term
-
-        # Calculate the high- and low-P rate constants
-        highp_kts = arr(highp_arr, temps, tref=tref)
-        lowp_kts = arr(lowp_arr, temps, tref=tref)
-
-        # If the pressure is 'high', just use the high-P kts
-        if pressure == 'high':
-            kts = highp_kts
-        # Otherwise, calculate the pressure-dependent kts
-        else:
-            # Calculate the pr term and broadening factor
-            pr_term = _pr_term(highp_kts, lowp_kts, temps, pressure, collid_factor)
-            f_term = _f_broadening_term(pr_term, troe_params, temps)
-
-            # Calculate Troe rate constants
-            kts = highp_kts * (pr_term / (1.0 + pr_term)) * f_term
-
-        return kts
-
-    ktp_dct = {}
-    for pidx, pressure in enumerate(pressures):
-        temps = temps_lst[pidx]
-        kts = troe_one_p(highp_arr, lowp_arr, troe_params, temps, pressure,
-                         collid_factor=collid_factor, tref=tref)
-        ktp_dct[pressure] = (temps, kts)
+    ktp_dct = _falloff_ktp_dct(highp_arr, lowp_arr, troe_params, temps_lst,
+                               pressures, collid_factor=collid_factor,
+                               tref=tref)
 
     return ktp_dct
 
@@ -469,44 +445,78 @@ def lind(highp_arr, lowp_arr, temps_lst, pressures, collid_factor=1.0,
         :rtype: dict {pressure: (temps, kts)}
     """
 
-    def lind_one_p(highp_arr, lowp_arr, temps, pressure, collid_factor=1.0,
-                   tref=1.0):
-        """ Calculates T,P-dependent rate constants [k(T,P)]s using
-            a Lindemann functional expression, at a single pressure,
-            across several temperatures.
-
-            :param temps: temperature array used to get k(T)s (K)
-            :type temps: numpy.ndarray
-            :return kts: k(T)s at the given pressure
-            :rtype: numpy.ndarray
-            (other inputs unchanged from parent function)
-        """
-
-        # Calculate the high- and low-P rate constants
-        highp_kts = arr(highp_arr, temps, tref=tref)
-        lowp_kts = arr(lowp_arr, temps, tref=tref)
-
-        # If the pressure is 'high', just use the high-P kts
-        if pressure == 'high':
-            kts = highp_kts
-        # Otherwise, calculate the pressure-dependent kts
-        else:
-            # Calculate the pr term
-            pr_term = _pr_term(highp_kts, lowp_kts, temps, pressure, collid_factor)
+    ktp_dct = _falloff_ktp_dct(highp_arr, lowp_arr, None, temps_lst,
+                               pressures, collid_factor=collid_factor,
+                               tref=tref)
 
-            # Calculate Lindemann rate constants
-            kts = highp_kts * (pr_term / (1.0 + pr_term))
+    return ktp_dct
 
-        return kts
 
-    ktp_dct = {}
-    for pidx, pressure in enumerate(pressures):
-        temps = temps_lst[pidx]
-        kts = lind_one_p(highp_arr, lowp_arr, temps, pressure,
-                         collid_factor=collid_factor, tref=tref)
-        ktp_dct[pressure] = (temps, kts)
+def falloff_ktps(highp_arrs, lowp_arrs, temps, pressures, troe_params_lst=None,
+                 collid_factors=1.0, tref=1.0):
+    """ Calculates T,P-dependent rate constants [k(T,P)]s for several
+        Lindemann or (if Troe parameters are given) Troe expressions at once.
+        The high- and low-P k(T)s and the Troe F_cent are computed once per
+        expression and broadcast over all pressures.
 
-    return ktp_dct
+        :param highp_arrs: high-P limit Arrhenius parameters of each fit
+        :type highp_arrs: list [[[A1, n1, Ea1], ...], ...]
+        :param lowp_arrs: low-P limit Arrhenius parameters of each fit
+        :type lowp_arrs: list [[[A1, n1, Ea1], ...], ...]
+        :param temps: temperature array used to get k(T,P)s (K)
+        :type temps: numpy.ndarray
+        :param pressures: pressures used to get k(T,P)s (atm); can have 'high'
+        :type pressures: list
+        :param troe_params_lst: 3 or 4 Troe fitting coefficients of each fit:
+            alpha, T***, T*, and T** (T** is optional and can be None)
+        :type troe_params_lst: list [[alpha, T***, T*, (T**)], ...]
+        :param collid_factors: collider efficiency factor(s)
+        :type collid_factors: float or numpy.ndarray of shape (num_fits,)
+        :param tref: reference temperature used for modified Arrhenius (K)
+        :type tref: float
+        :return ktps: k(T,P)s for each fit
+        :rtype: numpy.ndarray of shape (num_fits, num_pressures, num_temps)
+    """
+
+    temps = numpy.asarray(temps, dtype=float)
+    highp_kts = arr_stack(highp_arrs, temps, tref)
+    lowp_kts = arr_stack(lowp_arrs, temps, tref)
+
+    pidxs = [pidx for pidx, pressure in enumerate(pressures)
+             if pressure != 'high']
+    press = numpy.array([pressures[pidx] for pidx in pidxs], dtype=float)
+    collid_factors = numpy.reshape(collid_factors, (-1, 1, 1))
+
+    # Reduced pressure and Lindemann k(T,P)s; shape (nfit, npress, ntemp)
+    pr_term = (
+        (lowp_kts / highp_kts)[:, numpy.newaxis, :] *
+        p_to_m(press[:, numpy.newaxis], temps) * collid_factors)
+    lind_ktps = highp_kts[:, numpy.newaxis, :] * (pr_term / (1.0 + pr_term))
+
+    # Troe broadening; a missing T** is NaN, which drops its F_cent term
+    if troe_params_lst is not None:
+        troe_params = numpy.full((len(troe_params_lst), 4), numpy.nan)
+        for idx, params in enumerate(troe_params_lst):
+            troe_params[idx, :len(params)] = [
+                numpy.nan if param is None else param for param in params]
+        alpha, ts3, ts1, ts2 = (troe_params[:, [idx]] for idx in range(4))
+        f_cent = ((1.0 - alpha) * numpy.exp(-temps / ts3) +
+                  alpha * numpy.exp(-temps / ts1))
+        f_cent += numpy.where(numpy.isnan(ts2), 0.0, numpy.exp(-ts2 / temps))
+        log_fcent = numpy.log10(f_cent)[:, numpy.newaxis, :]
+        c_val = -0.4 - 0.67 * log_fcent
+        n_val = 0.75 - 1.27 * log_fcent
+        d_val = 0.14
+        val = ((numpy.log10(pr_term) + c_val) /
+               (n_val - d_val * (numpy.log10(pr_term) + c_val)))**2
+        lind_ktps *= 10**(log_fcent / (1.0 + val))
+
+    ktps = numpy.zeros((len(highp_arrs), len(pressures), len(temps)))
+    ktps[:, pidxs] = lind_ktps
+    if 'high' in pressures:
+        ktps[:, pressures.index('high')] = highp_kts
+
+    return ktps
 
 
 def merge_rxn_ktp_dcts(full_rxn_ktp_dct, rxn_ktp_dct):
@@ -718,27 +728,61 @@ def p_to_m(pressure, temps, rval=RC2):
     return pressure / (rval * temps)
 
 
-def _pr_term(highp_kts, lowp_kts, temps, pressure, collid_factor=1.0, rval=RC2):
-    """ Calculates the reduced pressure term for a single pressure
-        used for Lindemann and Troe P-dependent functional expressions.
+def _falloff_ktp_dct(highp_arr, lowp_arr, troe_params, temps_lst, pressures,
+                     collid_factor=1.0, tref=1.0):
+    """ Builds the ktp_dct of one Lindemann or Troe expression; if the temps
+        differ by pressure, each pressure is done separately
+    """
 
-        :param highp_kts: k(T)s determined at the high-pressure limit
-        :type highp_kts: numpy.ndarray
-        :param lowp_kts: k(T)s determined at the low-pressure limit
-        :type lowp_kts: numpy.ndarray
-        :param temps: temps used to calculate high- and low-k(T)s
-        :type temps: numpy.ndarray
-        :param pressure: pressure used to calculate reduced pressure
-        :type pressure: float
-        :rtype: numpy.ndarray
+    troe_params_lst = None if troe_params is None else [troe_params]
+    if all(numpy.array_equal(temps, temps_lst[0]) for temps in temps_lst):
+        ktps = falloff_ktps([highp_arr], [lowp_arr], temps_lst[0], pressures,
+                            troe_params_lst=troe_params_lst,
+                            collid_factors=collid_factor, tref=tref)[0]
+    else:
+        ktps = [falloff_ktps([highp_arr], [lowp_arr], temps, [pressure],
+                             troe_params_lst=troe_params_lst,
+                             collid_factors=collid_factor, tref=tref)[0, 0]
+                for temps, pressure in zip(temps_lst, pressures)]
+    ktp_dct = {pressure: (temps, kts) for pressure, temps, kts
+               in zip(pressures, temps_lst, ktps)}
+
+    return ktp_dct
+
+
+def _plog_interp(lo_kts, hi_kts, weight, is_exact):
+    """ Interpolates log k between the k(T)s at two PLOG pressures; the
+        lower k(T)s are used as-is for exact matches
     """
 
-    pr_term = (
-        (lowp_kts / highp_kts) *
-        p_to_m(pressure, temps, rval=rval) *
-        collid_factor)
+    with numpy.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        log_lo, log_hi = numpy.log10(lo_kts), numpy.log10(hi_kts)
+        interp_kts = 10**(log_lo + (log_hi - log_lo) *
+                          numpy.asarray(weight)[..., numpy.newaxis])
+
+    return numpy.where(numpy.asarray(is_exact)[..., numpy.newaxis],
+                       lo_kts, interp_kts)
+
+
+def _cheb_basis(vals, vmin, vmax, num_coeffs):
+    """ Evaluates the first num_coeffs Chebyshev polynomials at a set of
+        values after mapping [vmin, vmax] onto [-1, 1]
+
+        :param vals: values at which to evaluate the polynomials
+        :type vals: numpy.ndarray
+        :param vmin: value mapped to -1
+        :type vmin: float
+        :param vmax: value mapped to 1
+        :type vmax: float
+        :param num_coeffs: number of polynomials (i.e., max degree + 1)
+        :type num_coeffs: int
+        :return basis: polynomial values, basis[i, j] = T_j(vals[i])
+        :rtype: numpy.ndarray of shape (len(vals), num_coeffs)
+    """
+
+    red_vals = (2.0 * vals - vmin - vmax) / (vmax - vmin)
 
-    return pr_term
+    return chebvander(red_vals, num_coeffs - 1)
 
 
 def read_rxn_ktp_dct(rxn_ktp_dct, rxn, pressure, val):
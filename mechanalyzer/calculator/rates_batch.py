@@ -0,0 +1,272 @@
+"""
+Calculate rates for a whole mechanism at once on a shared T,P grid
+
+Reactions are grouped by functional form, the parameters of each form are
+packed into arrays, and every reaction of a form is evaluated in a single
+vectorized pass. Results are stored in a dense array of shape
+(num_rxns, num_pressures, num_temps).
+"""
+
+import numpy
+from numpy.polynomial.chebyshev import chebvander
+from mechanalyzer.calculator import rates
+
+FORMS = ('arr', 'plog', 'cheb', 'troe', 'lind')
+
+
+def eval_rxn_param_dct(rxn_param_dct, temps, pressures, tref=1.0):
+    """ Evaluates k(T,P) for all rxns in a rxn_param_dct on a single grid of
+        temperatures and pressures
+
+        The values match those of rates.eval_rxn_param_dct. Pressures at
+        which a rxn has no value (e.g., 'high' for a PLOG) are set to NaN.
+
+        :param rxn_param_dct: rate parameters for all rxns in a mech
+        :type rxn_param_dct: dict {rxn: params}
+        :param temps: temperatures used to get k(T,P)s (K)
+        :type temps: numpy.ndarray
+        :param pressures: pressures used to get k(T,P)s (atm); can have 'high'
+        :type pressures: list
+        :param tref: reference temperature used for modified Arrhenius (K)
+        :type tref: float
+        :return rxns: rxn keys, in the order of the first axis of ktps
+        :rtype: tuple
+        :return ktps: k(T,P)s for all rxns
+        :rtype: numpy.ndarray of shape (num_rxns, num_pressures, num_temps)
+    """
+
+    temps = numpy.asarray(temps, dtype=float)
+    pressures = list(pressures)
+    rxns = tuple(rxn_param_dct.keys())
+
+    # Sort every fit of every rxn by form, including the unusual duplicates
+    form_entries = {form: [] for form in FORMS}
+    for ridx, params in enumerate(rxn_param_dct.values()):
+        forms = params.get_existing_forms()
+        assert forms != (), f'The params object for {rxns[ridx]} is empty'
+        for form in forms:
+            form_entries[form].append((ridx, getattr(params, form)))
+        _, dup_counts = params.check_for_dups()
+        for form, dup_count in dup_counts.items():
+            # Arrhenius duplicates are already summed in params.arr
+            if form != 'arr':
+                dups = getattr(params, f'{form}_dups')
+                for dup_idx in range(dup_count):
+                    form_entries[form].append((ridx, dups[dup_idx]))
+
+    # Evaluate each form in one pass and add the results to the owning rxns
+    ktps = numpy.zeros((len(rxns), len(pressures), len(temps)))
+    defined = numpy.zeros((len(rxns), len(pressures)), dtype=bool)
+    for form, entries in form_entries.items():
+        if entries:
+            ridxs = numpy.array([ridx for ridx, _ in entries])
+            form_dcts = [form_dct for _, form_dct in entries]
+            form_ktps, form_defined = _FORM_EVALUATORS[form](
+                form_dcts, temps, pressures, tref=tref)
+            numpy.add.at(ktps, ridxs, numpy.where(
+                form_defined[:, :, numpy.newaxis], form_ktps, 0.0))
+            numpy.logical_or.at(defined, ridxs, form_defined)
+    ktps[~defined] = numpy.nan
+
+    return rxns, ktps
+
+
+def eval_rxn_ktp_dct(rxn_param_dct, temps_lst, pressures, tref=1.0):
+    """ Batched replacement for rates.eval_rxn_param_dct. Requires that the
+        same temperatures are used at every pressure.
+
+        :param rxn_param_dct: rate parameters for all rxns in a mech
+        :type rxn_param_dct: dict {rxn: params}
+        :param temps_lst: list of temperature arrays used to get k(T,P)s (K)
+        :type temps_lst: list [numpy.ndarray1, numpy.ndarray2, ...]
+        :param pressures: pressures used to get k(T,P)s (atm)
+        :type pressure: list
+        :return rxn_ktp_dct: k(T,Ps) at all temps and pressures for each rxn
+        :rtype: dict {rxn: ktp_dct}
+    """
+
+    temps_lst = rates.check_p_t(temps_lst, pressures)
+    temps = temps_lst[0]
+    assert all(numpy.array_equal(_temps, temps) for _temps in temps_lst), (
+        'Batched rate evaluation requires the same temps at all pressures')
+
+    rxns, ktps = eval_rxn_param_dct(rxn_param_dct, temps, pressures,
+                                    tref=tref)
+
+    return to_rxn_ktp_dct(rxns, ktps, temps, pressures)
+
+
+def to_rxn_ktp_dct(rxns, ktps, temps, pressures):
+    """ Converts a dense array of k(T,P)s to a rxn_ktp_dct. Pressures at
+        which a rxn has only NaN values are left out. The kts arrays are
+        views into ktps.
+
+        :param rxns: rxn keys, in the order of the first axis of ktps
+        :type rxns: tuple
+        :param ktps: k(T,P)s for all rxns
+        :type ktps: numpy.ndarray of shape (num_rxns, num_pressures, num_temps)
+        :param temps: temperatures of the last axis of ktps (K)
+        :type temps: numpy.ndarray
+        :param pressures: pressures of the second axis of ktps (atm)
+        :type pressures: list
+        :return rxn_ktp_dct: k(T,Ps) at all temps and pressures for each rxn
+        :rtype: dict {rxn: ktp_dct}
+    """
+
+    has_vals = ~numpy.all(numpy.isnan(ktps), axis=2)
+
+    rxn_ktp_dct = {}
+    for ridx, rxn in enumerate(rxns):
+        ktp_dct = {}
+        for pidx, pressure in enumerate(pressures):
+            if has_vals[ridx, pidx]:
+                ktp_dct[pressure] = (temps, ktps[ridx, pidx])
+        rxn_ktp_dct[rxn] = ktp_dct
+
+    return rxn_ktp_dct
+
+
+def _arr_ktps(arr_tuples_lst, temps, pressures, tref=1.0):
+    """ Evaluates Arrhenius fits; these are placed at 'high' if it is among
+        the pressures and at the last pressure otherwise
+    """
+
+    kts = rates.arr_stack(arr_tuples_lst, temps, tref)
+
+    pidx = (pressures.index('high') if 'high' in pressures
+            else len(pressures) - 1)
+    ktps = numpy.zeros((len(arr_tuples_lst), len(pressures), len(temps)))
+    defined = numpy.zeros((len(arr_tuples_lst), len(pressures)), dtype=bool)
+    ktps[:, pidx] = kts
+    defined[:, pidx] = True
+
+    return ktps, defined
+
+
+def _plog_ktps(plog_dcts, temps, pressures, tref=1.0):
+    """ Evaluates PLOG fits at all pressures except 'high'
+
+        The Arrhenius expressions at every PLOG pressure of every fit are
+        evaluated together; the interpolation in log P is then done with
+        index arrays over the whole grid.
+    """
+
+    pidxs = [pidx for pidx, pressure in enumerate(pressures)
+             if pressure != 'high']
+    press = numpy.array([pressures[pidx] for pidx in pidxs], dtype=float)
+
+    # Find the bracketing PLOG pressures (as indices into a flat list of
+    # nodes over all fits) and the interpolation weights
+    node_arr_tuples = []
+    lo_nodes = numpy.zeros((len(plog_dcts), len(press)), dtype=int)
+    hi_nodes = numpy.zeros((len(plog_dcts), len(press)), dtype=int)
+    weights = numpy.zeros((len(plog_dcts), len(press)))
+    exact = numpy.zeros((len(plog_dcts), len(press)), dtype=bool)
+    for idx, plog_dct in enumerate(plog_dcts):
+        plog_pressures = numpy.array(sorted(plog_dct.keys()), dtype=float)
+        offset = len(node_arr_tuples)
+        node_arr_tuples.extend(plog_dct[plog_pressure]
+                               for plog_pressure in sorted(plog_dct.keys()))
+
+        lo_idx, hi_idx, weight, is_exact = rates.plog_brackets(
+            plog_pressures, press)
+        lo_nodes[idx] = offset + lo_idx
+        hi_nodes[idx] = offset + hi_idx
+        weights[idx] = weight
+        exact[idx] = is_exact
+
+    node_kts = rates.arr_stack(node_arr_tuples, temps, tref)
+
+    # Interpolate log k between the bracketing pressures
+    with numpy.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        log_node_kts = numpy.log10(node_kts)
+        log_lo = log_node_kts[lo_nodes]
+        log_hi = log_node_kts[hi_nodes]
+        log_ktps = log_lo + (log_hi - log_lo) * weights[:, :, numpy.newaxis]
+        interp_ktps = 10**log_ktps
+
+    ktps = numpy.zeros((len(plog_dcts), len(pressures), len(temps)))
+    defined = numpy.zeros((len(plog_dcts), len(pressures)), dtype=bool)
+    ktps[:, pidxs] = numpy.where(exact[:, :, numpy.newaxis],
+                                 node_kts[lo_nodes], interp_ktps)
+    defined[:, pidxs] = True
+
+    return ktps, defined
+
+
+def _cheb_ktps(cheb_dcts, temps, pressures, tref=1.0):
+    """ Evaluates Chebyshev fits at all pressures except 'high'; fits with
+        the same alpha shape are contracted together
+    """
+
+    _ = tref  # Chebyshev fits have no reference temperature
+    pidxs = [pidx for pidx, pressure in enumerate(pressures)
+             if pressure != 'high']
+    log_press = numpy.log10(
+        numpy.array([pressures[pidx] for pidx in pidxs], dtype=float))
+
+    shape_idxs_dct = {}
+    for idx, cheb_dct in enumerate(cheb_dcts):
+        shape = numpy.shape(cheb_dct['alpha'])
+        shape_idxs_dct.setdefault(shape, []).append(idx)
+
+    ktps = numpy.zeros((len(cheb_dcts), len(pressures), len(temps)))
+    defined = numpy.zeros((len(cheb_dcts), len(pressures)), dtype=bool)
+    for (tdeg, pdeg), idxs in shape_idxs_dct.items():
+        alphas = numpy.array([cheb_dcts[idx]['alpha'] for idx in idxs],
+                             dtype=float)
+        inv_tlims = 1.0 / numpy.array([cheb_dcts[idx]['tlim'] for idx in idxs],
+                                      dtype=float)
+        log_plims = numpy.log10(numpy.array(
+            [cheb_dcts[idx]['plim'] for idx in idxs], dtype=float))
+
+        # Reduced inverse T and log P for every fit; shapes (nfit, ntemp) and
+        # (nfit, npress), and the Chebyshev bases on top of them
+        red_temps = (
+            (2.0 / temps - inv_tlims[:, [0]] - inv_tlims[:, [1]]) /
+            (inv_tlims[:, [1]] - inv_tlims[:, [0]]))
+        red_press = (
+            (2.0 * log_press - log_plims[:, [0]] - log_plims[:, [1]]) /
+            (log_plims[:, [1]] - log_plims[:, [0]]))
+        tbasis = chebvander(red_temps, tdeg - 1)
+        pbasis = chebvander(red_press, pdeg - 1)
+
+        log_ktps = numpy.einsum('fpk,fjk,ftj->fpt', pbasis, alphas, tbasis)
+        ktps[numpy.ix_(idxs, pidxs)] = 10**log_ktps
+        defined[numpy.ix_(idxs, pidxs)] = True
+
+    return ktps, defined
+
+
+def _troe_ktps(troe_dcts, temps, pressures, tref=1.0):
+    """ Evaluates Troe fits at all pressures
+    """
+
+    ktps = rates.falloff_ktps(
+        [dct['highp_arr'] for dct in troe_dcts],
+        [dct['lowp_arr'] for dct in troe_dcts], temps, pressures,
+        troe_params_lst=[dct['troe_params'] for dct in troe_dcts], tref=tref)
+    defined = numpy.ones((len(troe_dcts), len(pressures)), dtype=bool)
+
+    return ktps, defined
+
+
+def _lind_ktps(lind_dcts, temps, pressures, tref=1.0):
+    """ Evaluates Lindemann fits at all pressures
+    """
+
+    ktps = rates.falloff_ktps(
+        [dct['highp_arr'] for dct in lind_dcts],
+        [dct['lowp_arr'] for dct in lind_dcts], temps, pressures, tref=tref)
+    defined = numpy.ones((len(lind_dcts), len(pressures)), dtype=bool)
+
+    return ktps, defined
+
+
+_FORM_EVALUATORS = {
+    'arr': _arr_ktps,
+    'plog': _plog_ktps,
+    'cheb': _cheb_ktps,
+    'troe': _troe_ktps,
+    'lind': _lind_ktps,
+}
@@ -0,0 +1,325 @@
+"""
+Persistent on-disk cache of evaluated k(T,P)s
+
+Each rxn is keyed by a hash of its RxnParams contents, so only rxns whose
+parameters changed get re-evaluated. The rxns evaluated in one call are
+written together as a bundle: an NPZ file holding their keys and a stacked
+array of their k(T,P)s. Bundle filenames start with a hash of the T,P grid,
+so only bundles for the requested grid are searched. The cache directory is
+kept under a size limit by deleting the least recently used bundles.
+"""
+
+import os
+import pickle
+import hashlib
+import tempfile
+import numpy
+from mechanalyzer.calculator import rates
+from mechanalyzer.calculator import rates_batch
+
+CACHE_VERSION = 1  # bump to invalidate entries written by older versions
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.expanduser('~'), '.cache', 'mechanalyzer', 'rates')
+DEFAULT_MAX_SIZE = 500 * 1024 ** 2  # bytes
+
+
+def eval_rxn_param_dct(rxn_param_dct, temps_lst, pressures, tref=1.0,
+                       cache_dir=DEFAULT_CACHE_DIR,
+                       max_size=DEFAULT_MAX_SIZE, batch=False):
+    """ Cached version of rates.eval_rxn_param_dct. Rxns found in the cache
+        are read from disk; the rest are evaluated and then written.
+
+        :param rxn_param_dct: rate parameters for all rxns in a mech
+        :type rxn_param_dct: dict {rxn: params}
+        :param temps_lst: list of temperature arrays (K)
+        :type temps_lst: list [numpy.ndarray1, numpy.ndarray2, ...]
+        :param pressures: pressures at which to do calculations (atm)
+        :type pressures: list
+        :param tref: reference temperature used for modified Arrhenius (K)
+        :type tref: float
+        :param cache_dir: directory holding the cache files
+        :type cache_dir: str
+        :param max_size: max total size of the cache files (bytes)
+        :type max_size: int
+        :param batch: whether to evaluate the uncached rxns with rates_batch
+        :type batch: Bool
+        :return rxn_ktp_dct: k(T,P)s for all rxns
+        :rtype: dict {rxn: ktp_dct}
+    """
+
+    temps_lst = rates.check_p_t(temps_lst, pressures)
+    pressures = list(pressures)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # Read the cached rxns and find the ones that still need evaluating
+    prefix = grid_key(temps_lst, pressures, tref)
+    rxn_keys = {rxn: params_key(params)
+                for rxn, params in rxn_param_dct.items()}
+    key_ktp_dct = read_bundles(cache_dir, prefix, set(rxn_keys.values()),
+                               temps_lst, pressures)
+    miss_rxn_param_dct = {rxn: params for rxn, params in rxn_param_dct.items()
+                          if rxn_keys[rxn] not in key_ktp_dct}
+
+    # Evaluate and store the missing rxns
+    if miss_rxn_param_dct:
+        eval_fxn = (rates_batch.eval_rxn_ktp_dct if batch
+                    else rates.eval_rxn_param_dct)
+        miss_rxn_ktp_dct = eval_fxn(miss_rxn_param_dct, temps_lst, pressures,
+                                    tref=tref)
+        miss_key_ktp_dct = {rxn_keys[rxn]: ktp_dct
+                            for rxn, ktp_dct in miss_rxn_ktp_dct.items()}
+        write_bundle(cache_dir, prefix, miss_key_ktp_dct, temps_lst,
+                     pressures)
+        key_ktp_dct.update(miss_key_ktp_dct)
+        evict(cache_dir, max_size)
+
+    rxn_ktp_dct = {rxn: key_ktp_dct[key] for rxn, key in rxn_keys.items()
+                   if key in key_ktp_dct}
+
+    return rxn_ktp_dct
+
+
+def eval_rxn_param_dct_dense(rxn_param_dct, temps, pressures, tref=1.0,
+                             cache_dir=DEFAULT_CACHE_DIR,
+                             max_size=DEFAULT_MAX_SIZE):
+    """ Cached version of rates_batch.eval_rxn_param_dct. The bundles are
+        shared with eval_rxn_param_dct, so rxns cached by either one are
+        read by both.
+
+        :param rxn_param_dct: rate parameters for all rxns in a mech
+        :type rxn_param_dct: dict {rxn: params}
+        :param temps: temperatures used to get k(T,P)s (K)
+        :type temps: numpy.ndarray
+        :param pressures: pressures used to get k(T,P)s (atm); can have 'high'
+        :type pressures: list
+        :param tref: reference temperature used for modified Arrhenius (K)
+        :type tref: float
+        :param cache_dir: directory holding the cache files
+        :type cache_dir: str
+        :param max_size: max total size of the cache files (bytes)
+        :type max_size: int
+        :return rxns: rxn keys, in the order of the first axis of ktps
+        :rtype: tuple
+        :return ktps: k(T,P)s for all rxns
+        :rtype: numpy.ndarray of shape (num_rxns, num_pressures, num_temps)
+    """
+
+    temps = numpy.asarray(temps, dtype=float)
+    pressures = list(pressures)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # Read the cached rxns and find the ones that still need evaluating
+    prefix = grid_key([temps] * len(pressures), pressures, tref)
+    rxns = tuple(rxn_param_dct.keys())
+    rxn_keys = [params_key(params) for params in rxn_param_dct.values()]
+    key_row_dct = _read_rows(cache_dir, prefix, set(rxn_keys))
+    miss_key_params_dct = {key: params for key, params
+                           in zip(rxn_keys, rxn_param_dct.values())
+                           if key not in key_row_dct}
+
+    # Evaluate and store the missing rxns; the rxn keys are not used
+    if miss_key_params_dct:
+        miss_keys, miss_ktps = rates_batch.eval_rxn_param_dct(
+            miss_key_params_dct, temps, pressures, tref=tref)
+        defined = ~numpy.all(numpy.isnan(miss_ktps), axis=2)
+        pranks = numpy.where(defined, numpy.cumsum(defined, axis=1) - 1, -1)
+        miss_kts = miss_ktps.reshape(len(miss_keys), -1)
+        _write_rows(cache_dir, prefix, miss_keys, pranks, miss_kts)
+        key_row_dct.update(zip(miss_keys, zip(pranks, miss_kts)))
+        evict(cache_dir, max_size)
+
+    ktps = numpy.array([key_row_dct[key][1] for key in rxn_keys],
+                       dtype=float).reshape(len(rxns), len(pressures),
+                                            len(temps))
+
+    return rxns, ktps
+
+
+def params_key(params):
+    """ Gets a content hash of a RxnParams object
+
+        :param params: object describing the functional fits
+        :type params: autochem/autoreact RxnParams object
+        :return key: hex digest
+        :rtype: str
+    """
+
+    _, dup_counts = params.check_for_dups()
+    contents = [CACHE_VERSION]
+    for form in params.get_existing_forms():
+        contents.append((form, getattr(params, form)))
+        if dup_counts.get(form):
+            contents.append(getattr(params, f'{form}_dups', None))
+    key = hashlib.sha1(pickle.dumps(contents, protocol=4)).hexdigest()
+
+    return key
+
+
+def grid_key(temps_lst, pressures, tref=1.0):
+    """ Gets a short hash of the T,P grid and reference temperature, used as
+        the filename prefix of bundles
+
+        :param temps_lst: list of temperature arrays (K)
+        :type temps_lst: list [numpy.ndarray1, numpy.ndarray2, ...]
+        :param pressures: pressures at which to do calculations (atm)
+        :type pressures: list
+        :param tref: reference temperature used for modified Arrhenius (K)
+        :type tref: float
+        :return key: hex digest
+        :rtype: str
+    """
+
+    contents = (CACHE_VERSION,
+                [numpy.asarray(temps, dtype=float) for temps in temps_lst],
+                [pressure if pressure == 'high' else float(pressure)
+                 for pressure in pressures],
+                float(tref))
+    key = hashlib.sha1(pickle.dumps(contents, protocol=4)).hexdigest()[:16]
+
+    return key
+
+
+def read_bundles(cache_dir, prefix, keys, temps_lst, pressures):
+    """ Reads the ktp_dcts for the requested keys from the bundles of a
+        T,P grid and marks the bundles that were used as recently used
+
+        :param cache_dir: directory holding the cache files
+        :type cache_dir: str
+        :param prefix: key of the T,P grid, from grid_key
+        :type prefix: str
+        :param keys: params keys to look for
+        :type keys: set
+        :param temps_lst: list of temperature arrays (K)
+        :type temps_lst: list [numpy.ndarray1, numpy.ndarray2, ...]
+        :param pressures: pressures at which to do calculations (atm)
+        :type pressures: list
+        :return key_ktp_dct: ktp_dcts of the keys found in the cache
+        :rtype: dict {key: ktp_dct}
+    """
+
+    key_ktp_dct = {}
+    bounds = numpy.cumsum([0] + [len(temps) for temps in temps_lst])
+    key_row_dct = _read_rows(cache_dir, prefix, keys)
+    for key, (row_pranks, row_kts) in key_row_dct.items():
+        pidxs = sorted(numpy.flatnonzero(row_pranks >= 0),
+                       key=row_pranks.__getitem__)
+        key_ktp_dct[key] = {
+            pressures[pidx]: (
+                temps_lst[pidx], row_kts[bounds[pidx]:bounds[pidx+1]])
+            for pidx in pidxs}
+
+    return key_ktp_dct
+
+
+def write_bundle(cache_dir, prefix, key_ktp_dct, temps_lst, pressures):
+    """ Writes ktp_dcts to a new bundle. Each row stores the k(T)s at every
+        pressure end to end, plus the order of the pressures in the ktp_dct
+        (-1 for pressures that are absent).
+
+        :param cache_dir: directory holding the cache files
+        :type cache_dir: str
+        :param prefix: key of the T,P grid, from grid_key
+        :type prefix: str
+        :param key_ktp_dct: ktp_dcts to store
+        :type key_ktp_dct: dict {key: ktp_dct}
+        :param temps_lst: list of temperature arrays (K)
+        :type temps_lst: list [numpy.ndarray1, numpy.ndarray2, ...]
+        :param pressures: pressures at which to do calculations (atm)
+        :type pressures: list
+    """
+
+    bounds = numpy.cumsum([0] + [len(temps) for temps in temps_lst])
+    keys = list(key_ktp_dct.keys())
+    pranks = numpy.full((len(keys), len(pressures)), -1, dtype=numpy.int8)
+    kts = numpy.full((len(keys), bounds[-1]), numpy.nan)
+    for row, ktp_dct in enumerate(key_ktp_dct.values()):
+        for rank, (pressure, (_, p_kts)) in enumerate(ktp_dct.items()):
+            pidx = pressures.index(pressure)
+            pranks[row, pidx] = rank
+            kts[row, bounds[pidx]:bounds[pidx+1]] = p_kts
+
+    _write_rows(cache_dir, prefix, keys, pranks, kts)
+
+
+def evict(cache_dir, max_size=DEFAULT_MAX_SIZE):
+    """ Deletes the least recently used bundles until the total size is at
+        or below max_size
+
+        :param cache_dir: directory holding the cache files
+        :type cache_dir: str
+        :param max_size: max total size of the cache files (bytes)
+        :type max_size: int
+    """
+
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith('.npz'):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    tot_size = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if tot_size <= max_size:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:  # removed by another process
+            pass
+        tot_size -= size
+
+
+def _read_rows(cache_dir, prefix, keys):
+    """ Reads the rows of the requested keys from the bundles of a T,P grid
+        and marks the bundles that were used as recently used; each row is
+        a tuple of its pressure ranks and its k(T)s at all pressures
+    """
+
+    key_row_dct = {}
+    remaining = set(keys)
+    for path in _bundle_paths(cache_dir, prefix):
+        if not remaining:
+            break
+        try:
+            with numpy.load(path) as npz:
+                bundle_keys = npz['keys'].astype(str)
+                rows = [row for row, key in enumerate(bundle_keys)
+                        if key in remaining]
+                if not rows:
+                    continue
+                pranks = npz['pranks'][rows]
+                kts = npz['kts'][rows]
+            os.utime(path)  # touching the mtime is what makes eviction LRU
+        except (OSError, KeyError, ValueError):  # evicted or partial file
+            continue
+
+        for key, row_pranks, row_kts in zip(bundle_keys[rows], pranks, kts):
+            key_row_dct[key] = (row_pranks, row_kts)
+            remaining.discard(key)
+
+    return key_row_dct
+
+
+def _write_rows(cache_dir, prefix, keys, pranks, kts):
+    """ Writes rows of pressure ranks and k(T)s to a new bundle
+    """
+
+    keys = numpy.array(keys, dtype='S40')
+    pranks = numpy.asarray(pranks, dtype=numpy.int8)
+
+    # Write to a temporary file first so that readers never see partial files
+    with tempfile.NamedTemporaryFile(dir=cache_dir, prefix=prefix + '-',
+                                     suffix='.tmp', delete=False) as tmp_file:
+        numpy.savez(tmp_file, keys=keys, pranks=pranks, kts=kts)
+    os.replace(tmp_file.name, tmp_file.name[:-len('.tmp')] + '.npz')
+
+
+def _bundle_paths(cache_dir, prefix):
+    """ Gets the paths of the bundles of a T,P grid, most recently used first
+    """
+
+    entries = [entry for entry in os.scandir(cache_dir)
+               if entry.name.startswith(prefix) and
+               entry.name.endswith('.npz')]
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+
+    return [entry.path for entry in entries]
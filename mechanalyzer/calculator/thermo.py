@@ -6,6 +6,8 @@ import pandas
 from phydat import phycon
 
 RC = phycon.RC_CAL  # gas constant in cal/(mol.K)
+H_WEIGHTS = numpy.arange(1.0, 6.0)  # divisors of the T^k terms of h(T)/RT
+S_WEIGHTS = numpy.arange(1.0, 5.0)  # divisors of the T^k (k>0) terms of s/R
 
 
 def create_spc_therm_dct(spc_nasa7_dct, temps, rval=RC):
@@ -23,33 +25,92 @@ def create_spc_therm_dct(spc_nasa7_dct, temps, rval=RC):
         :rtype: dct {spc1: therm_array1, spc2: ...}
     """
 
+    temps = numpy.array(temps, dtype=float)
+
+    # Evaluate all species at all temps at once; arrays are (nspc, ntemp)
+    cfts, cutoff_temps = pack_nasa7_params(spc_nasa7_dct.values())
+    h_t, cp_t, s_t, g_t, lnq_t = eval_nasa7_params(
+        cfts, cutoff_temps, temps, rval=rval)
+
     spc_therm_dct = {}
-    for spc, nasa7_params in spc_nasa7_dct.items():
-        h_t, cp_t, s_t, g_t, lnq_t, = [], [], [], [], []
-        for temp in temps:
-            h_t.append(enthalpy(nasa7_params, temp, rval=rval))
-            cp_t.append(heat_capacity(nasa7_params, temp, rval=rval))
-            s_t.append(entropy(nasa7_params, temp, rval=rval))
-            g_t.append(gibbs(nasa7_params, temp, rval=rval))
-            lnq_t.append(lnpf(nasa7_params, temp, rval=rval))
-
-            if not all((h_t[-1], cp_t[-1], s_t[-1], g_t[-1], lnq_t[-1])):
-                print(f'Failed to calculate thermo at {temp} K for {spc} due '
-                      'to an invalid temp.')
-
-        # Convert to numpy arrays
-        temps = numpy.array(temps, dtype=float)
-        h_t = numpy.array(h_t, dtype=float)
-        cp_t = numpy.array(cp_t, dtype=float)
-        s_t = numpy.array(s_t, dtype=float)
-        g_t = numpy.array(g_t, dtype=float)
-        lnq_t = numpy.array(lnq_t, dtype=float)
-
-        spc_therm_dct[spc] = (temps, h_t, cp_t, s_t, g_t, lnq_t)
+    for sidx, spc in enumerate(spc_nasa7_dct.keys()):
+        for temp in temps[numpy.isnan(h_t[sidx])]:
+            print(f'Failed to calculate thermo at {temp} K for {spc} due '
+                  'to an invalid temp.')
+
+        spc_therm_dct[spc] = (temps, h_t[sidx], cp_t[sidx], s_t[sidx],
+                              g_t[sidx], lnq_t[sidx])
 
     return spc_therm_dct
 
 
+def pack_nasa7_params(nasa7_params_lst):
+    """ Packs the NASA-7 polynomial coefficients of several species into
+        arrays for vectorized evaluation
+
+        :param nasa7_params_lst: values describing the NASA-7 polynomials
+        :type nasa7_params_lst: list [nasa7_params1, nasa7_params2, ...]
+        :return cfts: coefficients; index 0 of the second axis holds the
+            low-T coefficients and index 1 the high-T coefficients
+        :rtype: numpy.ndarray of shape (num_spcs, 2, 7)
+        :return cutoff_temps: low, mid, and high temperatures (K)
+        :rtype: numpy.ndarray of shape (num_spcs, 3)
+    """
+
+    nasa7_params_lst = list(nasa7_params_lst)
+    cfts = numpy.zeros((len(nasa7_params_lst), 2, 7))
+    cutoff_temps = numpy.zeros((len(nasa7_params_lst), 3))
+    for sidx, nasa7_params in enumerate(nasa7_params_lst):
+        low_temp, high_temp, mid_temp = nasa7_params[3]  # odd but correct
+        cutoff_temps[sidx] = (low_temp, mid_temp, high_temp)
+        cfts[sidx, 0] = nasa7_params[4][1]
+        cfts[sidx, 1] = nasa7_params[4][0]
+
+    return cfts, cutoff_temps
+
+
+def eval_nasa7_params(cfts, cutoff_temps, temps, rval=RC):
+    """ Calculates h(T), cp(T), s(T), g(T), and lnq(T) for several species
+        from packed NASA-7 polynomial coefficients. Values at temps outside
+        the valid range of a species are NaN.
+
+        :param cfts: coefficients, low-T then high-T along the second axis
+        :type cfts: numpy.ndarray of shape (num_spcs, 2, 7)
+        :param cutoff_temps: low, mid, and high temperatures (K)
+        :type cutoff_temps: numpy.ndarray of shape (num_spcs, 3)
+        :param temps: temperatures at which to do calculations (K)
+        :type temps: numpy.ndarray
+        :param rval: universal gas constant (units decided by the user)
+        :type rval: float
+        :return h_t, cp_t, s_t, g_t, lnq_t: thermo quantities
+        :rtype: tuple of numpy.ndarrays of shape (num_spcs, num_temps)
+    """
+
+    low_temps, mid_temps, high_temps = (
+        cutoff_temps[:, [idx]] for idx in range(3))
+
+    # Choose the low- or high-T coefficients at each temp
+    use_high = (temps > mid_temps).astype(int)
+    spc_cfts = cfts[numpy.arange(len(cfts))[:, numpy.newaxis], use_high]
+    spc_cfts[(temps < low_temps) | (temps > high_temps)] = numpy.nan
+
+    # Powers T^0 ... T^4 contracted with the weighted coefficients
+    tpows = temps[:, numpy.newaxis]**numpy.arange(5)
+    cp_t = rval * numpy.einsum('stk,tk->st', spc_cfts[..., :5], tpows)
+    h_t = rval * temps * (
+        numpy.einsum('stk,tk->st', spc_cfts[..., :5], tpows / H_WEIGHTS) +
+        spc_cfts[..., 5] / temps)
+    s_t = rval * (
+        spc_cfts[..., 0] * numpy.log(temps) +
+        numpy.einsum('stk,tk->st', spc_cfts[..., 1:5],
+                     tpows[:, 1:] / S_WEIGHTS) +
+        spc_cfts[..., 6])
+    g_t = h_t - s_t * temps
+    lnq_t = -g_t / (rval * temps)
+
+    return h_t, cp_t, s_t, g_t, lnq_t
+
+
 def spc_therm_dct_df(spc_therm_dct):
     """ converts therm dct into a dictionary of dataframes
         {spc: [index=[temps]][columns=[H, CP, S, G, lnQ]]}
@@ -59,6 +59,18 @@ def main():
     show_default=True,
     help="Output PES groups file name",
 )
+@click.option(
+    "-n",
+    "--nprocs",
+    default="1",
+    show_default=True,
+    help="Number of processes for the graph classification, or 'auto'",
+)
+@click.option(
+    "--cache",
+    default=None,
+    help="Cache file of the graph classification, read and updated",
+)
 def sort(
     mech: str = "mechanism.dat",
     spc: str = "species.csv",
@@ -67,6 +79,8 @@ def sort(
     outmech: str = "outmech.dat",
     outspc: str = "outspc.csv",
     outgroups: str = "pes_groups.dat",
+    nprocs: str = "1",
+    cache: str = None,
 ):
     """Sort the reactions in a mechanism"""
     run_sort.main(
@@ -77,6 +91,8 @@ def sort(
         outmech=outmech,
         outspc=outspc,
         outgroups=outgroups,
+        nprocs=nprocs if nprocs == "auto" else int(nprocs),
+        cache=cache,
     )
 
 
@@ -26,6 +26,8 @@ def main(
     outmech: str = "outmech.dat",
     outspc: str = "outspc.csv",
     outgroups: str = "pes_groups.dat",
+    nprocs: int = 1,
+    cache: str = None,
 ):
     """Sort the reactions in a mechanism
 
@@ -36,6 +38,10 @@ def main(
     :param outmech: Output mechanism file name, defaults to "outmech.dat"
     :param outspc: Output species file name, defaults to "outspc.csv"
     :param outgroups: Output PES groups file name, defaults to "pes_groups.dat"
+    :param nprocs: Number of processes for the graph classification, or "auto",
+        defaults to 1
+    :param cache: Cache file of the graph classification, read and updated;
+        not used if None, defaults to None
     """
 
     # Read the input files
@@ -68,6 +74,8 @@ def main(
             sort_lst,
             spc_therm_dct=spc_therm_dct,
             dct_flt_grps=prompt_filter_dct,
+            nprocs=nprocs,
+            cache_path=cache,
         )
     )
     rxn_cmts_dct = chemkin_io.writer.comments.get_rxn_cmts_dct(rxn_sort_dct=cmts_dct)
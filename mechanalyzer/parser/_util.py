@@ -4,7 +4,11 @@ Useful functions for mechanalyzer.parser
 - extract useful info from the mechanism (reactions, formulas..)
 """
 
+import os
 import copy
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from autoparse import find
 from automol.form import element_count as n_el
 from automol.form import atom_count
@@ -200,3 +204,86 @@ def get_fml(rxn_ichs):
     formula_str = string2(formula_dct)
 
     return formula_dct, formula_str
+
+
+def load_files(load_fxn, filenames, args=(), kwargs=None, nprocs=1,
+               label='file'):
+    """ Load several files with the same function, one file per worker
+        process, and return the results in the order of the filenames
+
+        The shared arguments (e.g., the T,P grid) are set in this process
+        before the workers are forked, so the workers inherit them instead
+        of unpickling a copy for each file. Where fork is not available,
+        they are pickled once per worker.
+
+        :param load_fxn: module-level function called as
+            load_fxn(filename, *args, **kwargs)
+        :type load_fxn: callable
+        :param filenames: names of the files to load
+        :type filenames: list [filename1, filename2, ...]
+        :param args: positional arguments shared by all files
+        :type args: tuple
+        :param kwargs: keyword arguments shared by all files
+        :type kwargs: dict
+        :param nprocs: number of worker processes, or 'auto' for one per file
+            up to the number of CPUs; files are loaded in this process if 1
+        :type nprocs: int or str
+        :param label: name of the loaded object, for printing
+        :type label: str
+        :return results: output of load_fxn for each file
+        :rtype: list
+    """
+
+    kwargs = kwargs or {}
+    nprocs = os.cpu_count() if nprocs == 'auto' else nprocs
+    nprocs = max(min(nprocs, len(filenames)), 1)
+
+    for filename in filenames:
+        print(f'Loading {label} for the file {filename}...')
+    _set_load_args(args, kwargs)
+    try:
+        if nprocs == 1:
+            outputs = [_load_file(load_fxn, filename)
+                       for filename in filenames]
+        else:
+            if 'fork' in multiprocessing.get_all_start_methods():
+                pool = ProcessPoolExecutor(
+                    max_workers=nprocs,
+                    mp_context=multiprocessing.get_context('fork'))
+            else:
+                pool = ProcessPoolExecutor(
+                    max_workers=nprocs, initializer=_set_load_args,
+                    initargs=(args, kwargs))
+            with pool:
+                outputs = list(pool.map(
+                    _load_file, [load_fxn] * len(filenames), filenames))
+    finally:
+        _set_load_args((), {})
+
+    results = []
+    for filename, (result, load_time) in zip(filenames, outputs):
+        print(f'Loaded {label} for the file {filename} in {load_time:.2f} s')
+        results.append(result)
+
+    return results
+
+
+# Arguments shared by the files of load_files; set before the workers fork
+_WORKER_ARGS = ()
+_WORKER_KWARGS = {}
+
+
+def _set_load_args(args, kwargs):
+    """ Store the arguments shared by all files of load_files
+    """
+    global _WORKER_ARGS, _WORKER_KWARGS
+    _WORKER_ARGS = args
+    _WORKER_KWARGS = kwargs
+
+
+def _load_file(load_fxn, filename):
+    """ Load one file in a worker process and time it
+    """
+    start = time.time()
+    result = load_fxn(filename, *_WORKER_ARGS, **_WORKER_KWARGS)
+    return result, time.time() - start
@@ -1,15 +1,20 @@
 """ Functions operating on Chemkin input files or strings
 """
+import os
 import ioformat.pathtools as parser
 from chemkin_io.parser import mechanism as parser_mech
 from chemkin_io.parser import reaction as parser_rxn
 from chemkin_io.parser import thermo as parser_thermo
 from chemkin_io.parser import species as parser_spc
 from mechanalyzer.calculator import rates as calc_rates
+from mechanalyzer.calculator import rates_batch as calc_rates_batch
+from mechanalyzer.calculator import rates_cache as calc_rates_cache
 from mechanalyzer.calculator import thermo as calc_thermo
+from mechanalyzer.parser import _util
 
 
-def load_rxn_ktp_dcts(mech_filenames, path, temps_lst, pressures):
+def load_rxn_ktp_dcts(mech_filenames, path, temps_lst, pressures,
+                      batch=False, cache_dir=None, nprocs=1):
     """ Read Chemkin mechanism files and calculate rates at the indicated
         pressures and temperatures. Return a list of rxn_ktp_dcts.
 
@@ -21,20 +26,27 @@ def load_rxn_ktp_dcts(mech_filenames, path, temps_lst, pressures):
         :type temps_lst: list [numpy.ndarray1, numpy.ndarray2, ...]
         :param pressures: pressures at which to do calculations (atm)
         :type pressures: list [float]
+        :param batch: whether to evaluate all rxns of a form at once; needs
+            the same temps at every pressure
+        :type batch: Bool
+        :param cache_dir: directory for caching evaluated k(T,P)s; no caching
+            is done if None
+        :type cache_dir: str
+        :param nprocs: number of processes, one file per process, or 'auto'
+        :type nprocs: int or str
         :return rxn_ktp_dcts: list of rxn_ktp_dcts
         :rtype: list of dcts [rxn_ktp_dct1, rxn_ktp_dct2, ...]
     """
 
-    rxn_ktp_dcts = []
-    for mech_filename in mech_filenames:
-        print(f'Loading rxn_ktp_dct for the file {mech_filename}...')
-        rxn_ktp_dct = load_rxn_ktp_dct(mech_filename, path, temps_lst, pressures)
-        rxn_ktp_dcts.append(rxn_ktp_dct)
+    rxn_ktp_dcts = _util.load_files(
+        load_rxn_ktp_dct, mech_filenames, args=(path, temps_lst, pressures),
+        kwargs={'batch': batch, 'cache_dir': cache_dir}, nprocs=nprocs,
+        label='rxn_ktp_dct')
 
     return rxn_ktp_dcts
 
 
-def load_rxn_param_dcts(mech_filenames, path):
+def load_rxn_param_dcts(mech_filenames, path, nprocs=1):
     """ Read Chemkin-formatted mechanism files and return a list of
         rxn_param_dcts.
 
@@ -42,20 +54,20 @@ def load_rxn_param_dcts(mech_filenames, path):
         :type mech_filenames: list [filename1, filename2, ...]
         :param path: directory with file
         :type path: str
+        :param nprocs: number of processes, one file per process, or 'auto'
+        :type nprocs: int or str
         :return rxn_param_dcts: list of rxn_param_dcts
         :rtype: list of dcts [rxn_param_dct1, rxn_param_dct2, ...]
     """
 
-    rxn_param_dcts = []
-    for mech_filename in mech_filenames:
-        print(f'Loading rxn_param_dct for the file {mech_filename}...')
-        rxn_param_dct = load_rxn_param_dct(mech_filename, path)
-        rxn_param_dcts.append(rxn_param_dct)
+    rxn_param_dcts = _util.load_files(
+        load_rxn_param_dct, mech_filenames, args=(path,), nprocs=nprocs,
+        label='rxn_param_dct')
 
     return rxn_param_dcts
 
 
-def load_spc_therm_dcts(thermo_filenames, path, temps):
+def load_spc_therm_dcts(thermo_filenames, path, temps, nprocs=1):
     """ Reads Chemkin thermo files and calculates thermo at the indicated
         temperatures. Outputs a list of spc_therm_dcts.
 
@@ -65,20 +77,20 @@ def load_spc_therm_dcts(thermo_filenames, path, temps):
         :type path: str
         :param temps: temperatures at which to do calculations (K)
         :type temps: numpy.ndarray
+        :param nprocs: number of processes, one file per process, or 'auto'
+        :type nprocs: int or str
         :return spc_therm_dcts: list of spc_therm_dcts
         :rtype: list of dcts [spc_therm_dct1, spc_therm_dct2, ...]
     """
 
-    spc_therm_dcts = []
-    for thermo_filename in thermo_filenames:
-        print(f'Loading spc_therm_dct for the file {thermo_filename}...')
-        spc_therm_dct = load_spc_therm_dct(thermo_filename, path, temps)
-        spc_therm_dcts.append(spc_therm_dct)
+    spc_therm_dcts = _util.load_files(
+        load_spc_therm_dct, thermo_filenames, args=(path, temps),
+        nprocs=nprocs, label='spc_therm_dct')
 
     return spc_therm_dcts
 
 
-def load_spc_nasa7_dcts(thermo_filenames, path):
+def load_spc_nasa7_dcts(thermo_filenames, path, nprocs=1):
     """ Reads Chemkin thermo files and extracts the NASA-7 polynomial
         information. Outputs a list of spc_nasa7_dcts.
 
@@ -86,20 +98,21 @@ def load_spc_nasa7_dcts(thermo_filenames, path):
         :type thermo_filenames: list [filename1, filename2, ...]
         :param path: directory with file(s) (all must be in same directory)
         :type path: str
+        :param nprocs: number of processes, one file per process, or 'auto'
+        :type nprocs: int or str
         :return spc_nasa7_dcts: list of spc_nasa7_dcts
         :rtype: list of dcts [spc_nasa7_dct1, spc_nasa7_dct2, ...]
     """
 
-    spc_nasa7_dcts = []
-    for thermo_filename in thermo_filenames:
-        print(f'Loading spc_nasa7_dct for the file {thermo_filename}...')
-        spc_nasa7_dct = load_spc_nasa7_dct(thermo_filename, path)
-        spc_nasa7_dcts.append(spc_nasa7_dct)
+    spc_nasa7_dcts = _util.load_files(
+        load_spc_nasa7_dct, thermo_filenames, args=(path,), nprocs=nprocs,
+        label='spc_nasa7_dct')
 
     return spc_nasa7_dcts
 
 
-def load_rxn_ktp_dct(mech_filename, path, temps_lst, pressures):
+def load_rxn_ktp_dct(mech_filename, path, temps_lst, pressures, batch=False,
+                     cache_dir=None):
     """ Read a Chemkin-formatted mechanism file and
         calculate rates at the indicated pressures and temperatures.
         Return a rxn_ktp_dct.
@@ -112,13 +125,19 @@ def load_rxn_ktp_dct(mech_filename, path, temps_lst, pressures):
         :type temps_lst: list [numpy.ndarray1, numpy.ndarray2, ...]
         :param pressures: pressures at which to do calculations (atm)
         :type pressures: list [float]
+        :param batch: whether to evaluate all rxns of a form at once; needs
+            the same temps at every pressure
+        :type batch: Bool
+        :param cache_dir: directory for caching evaluated k(T,P)s; no caching
+            is done if None
+        :type cache_dir: str
         :return rxn_ktp_dct: rxn_ktp_dct object
         :rtype: dct {rxn1: ktp_dct1, rxn2: ...}
     """
 
     rxn_param_dct = load_rxn_param_dct(mech_filename, path)
-    rxn_ktp_dct = calc_rates.eval_rxn_param_dct(rxn_param_dct, temps_lst,
-                                                pressures)
+    rxn_ktp_dct = _eval_rxn_param_dct(rxn_param_dct, temps_lst, pressures,
+                                      batch=batch, cache_dir=cache_dir)
 
     return rxn_ktp_dct
 
@@ -140,6 +159,131 @@ def load_rxn_param_dct(mech_filename, path):
     return rxn_param_dct
 
 
+def load_rxn_params_iter(mech_filename, path, chunk_size=1000):
+    """ Read a Chemkin-formatted mechanism file in chunks and yield the
+        reactions as they are parsed, without holding the whole file or
+        rxn_param_dct in memory. See iter_rxn_params.
+
+        :param mech_filename: Chemkin mechanism filename
+        :type mech_filename: str
+        :param path: directory with file
+        :type path: str
+        :param chunk_size: number of reactions parsed at a time
+        :type chunk_size: int
+        :return: generator of rxns and their parameters
+        :rtype: generator of (rxn, params)
+    """
+
+    with open(os.path.join(path, mech_filename), 'r', encoding='utf-8',
+              errors='replace') as mech_file:
+        yield from iter_rxn_params(mech_file, chunk_size=chunk_size)
+
+
+def iter_rxn_params(mech_file, chunk_size=1000):
+    """ Parses the reaction block of a Chemkin mechanism from an open file
+        (or any iterable of lines) and yields each reaction and its
+        parameters, a chunk of reactions at a time
+
+        Reactions marked DUPLICATE are held back until the end of the
+        reaction block and then parsed together, so that each rxn is
+        yielded once with all of its copies combined, as in
+        parse_rxn_param_dct. The duplicates therefore come after all other
+        reactions.
+
+        :param mech_file: lines of a Chemkin mechanism
+        :type mech_file: file object or iterable of str
+        :param chunk_size: number of reactions parsed at a time
+        :type chunk_size: int
+        :return: generator of rxns and their parameters
+        :rtype: generator of (rxn, params)
+    """
+
+    # Skip ahead to the reaction block and read the units from its header
+    units = None
+    for line in mech_file:
+        if line.split('!')[0].strip().upper().startswith('REAC'):
+            units = parser_mech.reaction_units(line + 'END\n')
+            break
+    if units is None:
+        return
+    ea_units, a_units = units
+
+    # Parse chunk_size reactions at a time, keeping the duplicates aside
+    chunk_lines, dup_lines, num_rxns = [], [], 0
+    for rxn_lines in _iter_rxn_lines(mech_file):
+        if any(line.split()[0].upper().startswith('DUP')
+               for line in rxn_lines[1:]):
+            dup_lines.extend(rxn_lines)
+            continue
+        chunk_lines.extend(rxn_lines)
+        num_rxns += 1
+        if num_rxns == chunk_size:
+            yield from _parse_rxn_chunk(chunk_lines, ea_units, a_units)
+            chunk_lines, num_rxns = [], 0
+    if chunk_lines:
+        yield from _parse_rxn_chunk(chunk_lines, ea_units, a_units)
+    if dup_lines:
+        yield from _parse_rxn_chunk(dup_lines, ea_units, a_units)
+
+
+def collect_rxn_param_dct(rxn_params):
+    """ Builds a rxn_param_dct from (rxn, params) records, such as those
+        from iter_rxn_params, combining the params of repeated rxns
+
+        :param rxn_params: rxns and their parameters
+        :type rxn_params: iterable of (rxn, params)
+        :return rxn_param_dct: rxn_param_dct object
+        :rtype: dct {rxn1: params1, rxn2: ...}
+    """
+
+    rxn_param_dct = {}
+    for rxn, params in rxn_params:
+        if rxn in rxn_param_dct:
+            rxn_param_dct[rxn].combine_objects(params)
+        else:
+            rxn_param_dct[rxn] = params
+
+    return rxn_param_dct
+
+
+def iter_rxn_ktp_dcts(rxn_params, temps_lst, pressures, chunk_size=1000,
+                      batch=False, cache_dir=None):
+    """ Calculates rates for a stream of (rxn, params) records, such as
+        those from iter_rxn_params, a chunk at a time, so that rates are
+        calculated while the rest of the mechanism is still being parsed
+
+        :param rxn_params: rxns and their parameters
+        :type rxn_params: iterable of (rxn, params)
+        :param temps_lst: list of temperature arrays (K)
+        :type temps_lst: list [numpy.ndarray1, numpy.ndarray2, ...]
+        :param pressures: pressures at which to do calculations (atm)
+        :type pressures: list [float]
+        :param chunk_size: number of reactions evaluated at a time
+        :type chunk_size: int
+        :param batch: whether to evaluate all rxns of a form at once; needs
+            the same temps at every pressure
+        :type batch: Bool
+        :param cache_dir: directory for caching evaluated k(T,P)s; no caching
+            is done if None
+        :type cache_dir: str
+        :return: generator of rxns and their k(T,P)s; each rxn should come
+            in one record, as from iter_rxn_params, since repeated rxns are
+            only combined if they are in the same chunk
+        :rtype: generator of (rxn, ktp_dct)
+    """
+
+    chunk = []
+    for record in rxn_params:
+        chunk.append(record)
+        if len(chunk) == chunk_size:
+            yield from _eval_rxn_chunk(chunk, temps_lst, pressures,
+                                       batch=batch, cache_dir=cache_dir)
+            chunk = []
+    if chunk:
+        yield from _eval_rxn_chunk(chunk, temps_lst, pressures, batch=batch,
+                                   cache_dir=cache_dir)
+
+
 def load_spc_therm_dct(thermo_filename, path, temps):
     """ Reads a Chemkin thermo file and calculates thermo at the indicated
         temperatures. Outputs a spc_therm_dct.
@@ -178,7 +322,8 @@ def load_spc_nasa7_dct(thermo_filename, path):
     return spc_nasa7_dct
 
 
-def parse_rxn_ktp_dct(mech_str, temps_lst, pressures):
+def parse_rxn_ktp_dct(mech_str, temps_lst, pressures, batch=False,
+                      cache_dir=None):
     """ Parses a raw Chemkin mechanism string and yields a rxn_ktp_dct
 
         :param mech_str: raw string from reading a Chemkin file
@@ -187,12 +332,19 @@ def parse_rxn_ktp_dct(mech_str, temps_lst, pressures):
         :type temps_lst: list [numpy.ndarray1, numpy.ndarray2, ...]
         :param pressures: pressures at which to do calculations (atm)
         :type pressures: list [float]
+        :param batch: whether to evaluate all rxns of a form at once; needs
+            the same temps at every pressure
+        :type batch: Bool
+        :param cache_dir: directory for caching evaluated k(T,P)s; no caching
+            is done if None
+        :type cache_dir: str
         :return rxn_ktp_dct: rxn_ktp_dct object
         :rtype: dct {rxn1: ktp_dct1, rxn2: ...}
     """
 
     rxn_param_dct = parse_rxn_param_dct(mech_str)
-    rxn_ktp_dct = calc_rates.eval_rxn_param_dct(rxn_param_dct, temps_lst, pressures)
+    rxn_ktp_dct = _eval_rxn_param_dct(rxn_param_dct, temps_lst, pressures,
+                                      batch=batch, cache_dir=cache_dir)
 
     return rxn_ktp_dct
 
@@ -278,3 +430,63 @@ def parse_elem_tuple(mech_str):
     elem_tuple = parser_spc.names(el_block)
 
     return elem_tuple
+
+
+def _iter_rxn_lines(mech_file):
+    """ Yields the lines of each reaction in the rest of a reaction block,
+        with comments and blank lines removed; a new rxn starts at each line
+        with an equation (i.e., with an '=')
+    """
+
+    rxn_lines = []
+    for line in mech_file:
+        line = line.split('!')[0].rstrip()
+        if line.strip().upper() == 'END':
+            break
+        if '=' in line and rxn_lines:
+            yield rxn_lines
+            rxn_lines = []
+        if line.strip():
+            rxn_lines.append(line)
+    if rxn_lines:
+        yield rxn_lines
+
+
+def _parse_rxn_chunk(chunk_lines, ea_units, a_units):
+    """ Parses the lines of a chunk of the reaction block
+    """
+
+    rxn_block_str = '\n'.join(chunk_lines) + '\n'
+    rxn_param_dct = parser_rxn.get_rxn_param_dct(rxn_block_str, ea_units,
+                                                 a_units)
+
+    return rxn_param_dct.items()
+
+
+def _eval_rxn_chunk(chunk, temps_lst, pressures, batch=False,
+                    cache_dir=None):
+    """ Evaluates a chunk of (rxn, params) records
+    """
+
+    rxn_param_dct = collect_rxn_param_dct(chunk)
+    rxn_ktp_dct = _eval_rxn_param_dct(rxn_param_dct, temps_lst, pressures,
+                                      batch=batch, cache_dir=cache_dir)
+
+    return rxn_ktp_dct.items()
+
+
+def _eval_rxn_param_dct(rxn_param_dct, temps_lst, pressures, batch=False,
+                        cache_dir=None):
+    """ Evaluates a rxn_param_dct with the evaluator picked by the options
+    """
+
+    if cache_dir is not None:
+        rxn_ktp_dct = calc_rates_cache.eval_rxn_param_dct(
+            rxn_param_dct, temps_lst, pressures, cache_dir=cache_dir,
+            batch=batch)
+    else:
+        eval_fxn = (calc_rates_batch.eval_rxn_ktp_dct if batch
+                    else calc_rates.eval_rxn_param_dct)
+        rxn_ktp_dct = eval_fxn(rxn_param_dct, temps_lst, pressures)
+
+    return rxn_ktp_dct
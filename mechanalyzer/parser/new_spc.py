@@ -8,10 +8,11 @@ from ioformat import pathtools
 import automol
 from automol.chi import inchi_to_amchi
 from automol.chi import smiles as ich_to_smi
-from automol.chi import canonical_enantiomer
 from automol.chi import formula as ich_to_fml
 from automol.chi import low_spin_multiplicity as _low_spin_mult
 from automol.form import from_string as str_to_fml
+from mechanalyzer.calculator import ich_cache
+from mechanalyzer.parser import _util
 
 ALLOWED_COL_NAMES = (
     'name',
@@ -41,7 +42,8 @@ CMTS = '!'  # character used to define comments
 
 
 def load_mech_spc_dcts(filenames, path, quotechar="'", chk_ste=False,
-                       chk_match=False, verbose=True, canon_ent=True):
+                       chk_match=False, verbose=True, canon_ent=True,
+                       nprocs=1):
     """ Obtains multiple mech_spc_dcts given a list of spc.csv filenames
 
         :param filenames: filenames of the spc.csv files to be read
@@ -54,23 +56,25 @@ def load_mech_spc_dcts(filenames, path, quotechar="'", chk_ste=False,
         :type chk_match: Bool
         :param verbose: whether or not to print lots of warnings
         :type verbose: Bool
+        :param nprocs: number of processes, one file per process, or 'auto'
+        :type nprocs: int or str
         :return mech_spc_dcts: list of mech_spc_dcts
         :rtype: list
     """
 
-    mech_spc_dcts = []
-    for filename in filenames:
-        print(f'Loading mech_spc_dct for the file {filename}...')
-        mech_spc_dct = load_mech_spc_dct(
-            filename, path, quotechar=quotechar, chk_ste=chk_ste,
-            chk_match=chk_match, verbose=verbose, canon_ent=canon_ent)
-        mech_spc_dcts.append(mech_spc_dct)
+    mech_spc_dcts = _util.load_files(
+        load_mech_spc_dct, filenames, args=(path,),
+        kwargs={'quotechar': quotechar, 'chk_ste': chk_ste,
+                'chk_match': chk_match, 'verbose': verbose,
+                'canon_ent': canon_ent},
+        nprocs=nprocs, label='mech_spc_dct')
 
     return mech_spc_dcts
 
 
-def load_mech_spc_dct(filename, path, quotechar="'", chk_ste=False, 
-                      chk_match=False, verbose=True, canon_ent=True):
+def load_mech_spc_dct(filename, path, quotechar="'", chk_ste=False,
+                      chk_match=False, verbose=True, canon_ent=True,
+                      nprocs=1, cache_path=None, write_canon_ent=False):
     """ Obtains a single mech_spc_dct given a spc.csv filename
 
         :param filename: filename of the spc.csv file to be read
@@ -83,6 +87,14 @@ def load_mech_spc_dct(filename, path, quotechar="'", chk_ste=False,
         :type chk_match: Bool
         :param verbose: whether or not to print lots of warnings
         :type verbose: Bool
+        :param nprocs: number of processes used to fill in the species
+        :type nprocs: int or str
+        :param cache_path: file of the calculator.ich_cache memo to read
+            before and write after filling in the species; not used if None
+        :type cache_path: str
+        :param write_canon_ent: whether to add the canonical enantiomers to
+            the spc.csv file if it has no 'canon_enant_ich' column
+        :type write_canon_ent: Bool
         :return mech_spc_dct: identifying information on species in a mech
         :rtype: dct {spc1: spc_dct1, spc2: ...}
     """
@@ -90,13 +102,43 @@ def load_mech_spc_dct(filename, path, quotechar="'", chk_ste=False,
     file_str = pathtools.read_file(path, filename, print_debug=True)
     mech_spc_dct = parse_mech_spc_dct(
         file_str, quotechar=quotechar, chk_ste=chk_ste, chk_match=chk_match,
-        verbose=verbose, canon_ent=canon_ent)
+        verbose=verbose, canon_ent=canon_ent, nprocs=nprocs,
+        cache_path=cache_path)
+
+    if write_canon_ent and canon_ent:
+        raw_mech_spc_dct = parse_raw_mech_spc_dct(
+            file_str, quotechar=quotechar)
+        if any('canon_enant_ich' not in spc_dct
+               for spc_dct in raw_mech_spc_dct.values()):
+            print(f'Writing canonical enantiomers to {filename}...')
+            file_str = add_canon_enant_col(
+                file_str, mech_spc_dct, quotechar=quotechar)
+            pathtools.write_file(file_str, path, filename)
 
     return mech_spc_dct
 
 
+def load_raw_mech_spc_dct(filename, path, quotechar="'"):
+    """ Obtains a single raw mech_spc_dct given a spc.csv filename; no
+        identifiers are checked or filled in
+
+        :param filename: filename of the spc.csv file to be read
+        :type filename: str
+        :param quotechar: character used to optionally ignore commas; " or '
+        :type quotechar: str
+        :return raw_mech_spc_dct: species information as given in the file
+        :rtype: dct {spc1: spc_dct1, spc2: ...}
+    """
+
+    file_str = pathtools.read_file(path, filename, print_debug=True)
+    raw_mech_spc_dct = parse_raw_mech_spc_dct(file_str, quotechar=quotechar)
+
+    return raw_mech_spc_dct
+
+
 def parse_mech_spc_dct(file_str, quotechar="'", chk_ste=False,
-                       chk_match=False, verbose=True, canon_ent=True):
+                       chk_match=False, verbose=True, canon_ent=True,
+                       nprocs=1, cache_path=None):
     """ Obtains a single mech_spc_dct given a string parsed from a spc.csv file
 
         :param file_str: the string that was read directly from the .csv file
@@ -111,10 +153,40 @@ def parse_mech_spc_dct(file_str, quotechar="'", chk_ste=False,
         :type add_ste: Bool
         :param verbose: whether or not to print lots of warnings
         :type verbose: Bool
+        :param nprocs: number of processes used to fill in the species
+        :type nprocs: int or str
+        :param cache_path: file of the calculator.ich_cache memo to read
+            before and write after filling in the species; not used if None
+        :type cache_path: str
         :return mech_spc_dct: identifying information on species in a mech
         :rtype: dct {spc1: spc_dct1, spc2: ...}
     """
 
+    raw_mech_spc_dct = parse_raw_mech_spc_dct(file_str, quotechar=quotechar)
+    mech_spc_dct = fill_mech_spc_dct(
+        raw_mech_spc_dct, chk_ste=chk_ste, chk_match=chk_match,
+        canon_ent=canon_ent, nprocs=nprocs, cache_path=cache_path)
+
+    # Find species with the same chemical identifiers but different names
+    check_for_dups(mech_spc_dct, printwarnings=verbose)
+
+    return mech_spc_dct
+
+
+def parse_raw_mech_spc_dct(file_str, quotechar="'"):
+    """ Obtains a raw mech_spc_dct from the string of a spc.csv file; the
+        columns are only converted to the right types (e.g., fml to a
+        formula dct), and the identifiers are left for fill_mech_spc_dct to
+        check and fill in
+
+        :param file_str: the string that was read directly from the .csv file
+        :type file_str: str
+        :param quotechar: the quotechar used to optionally ignore commas
+        :type quotechar: str
+        :return raw_mech_spc_dct: species information as given in the file
+        :rtype: dct {spc1: spc_dct1, spc2: ...}
+    """
+
     # Remove comment lines
     file_str = pathtools.remove_comment_lines(file_str, CMTS)
 
@@ -138,37 +210,76 @@ def parse_mech_spc_dct(file_str, quotechar="'", chk_ste=False,
     lines = file_str.split('\n')
     if lines[-1] == '':
         del lines[-1]  # gets rid of the annoying last line that gets added
+    if not lines:
+        return {}
+
+    # Build the raw_mech_spc_dct line by line
+    raw_mech_spc_dct = {}
+    headers = parse_first_line(lines[0], quotechar=quotechar)
+    for idx, line in enumerate(lines[1:], start=1):
+        cols = parse_line(line, idx, headers, quotechar=quotechar)
+        if cols is None:
+            print(f'Line {idx + 1} appears to be empty. Skipping...')
+            continue
+        spc, spc_dct = make_spc_dct(cols, headers)
+        # Check that the species name was not already defined
+        assert spc not in raw_mech_spc_dct, (
+            f'The species name {spc} appears in the csv file more than'
+            f' once. The second time is on line {idx + 1}, {line}.')
+        raw_mech_spc_dct[spc] = spc_dct
+
+    return raw_mech_spc_dct
+
+
+def fill_mech_spc_dct(raw_mech_spc_dct, chk_ste=False, chk_match=False,
+                      canon_ent=True, nprocs=1, cache_path=None):
+    """ Checks the identifiers of every species in a raw mech_spc_dct and
+        fills in the missing values
+
+        Filled species and canonical enantiomers are kept in the
+        calculator.ich_cache memo, so that species and InChIs that were
+        already seen are not worked out again.
+
+        :param raw_mech_spc_dct: species information as given in the file
+        :type raw_mech_spc_dct: dct {spc1: spc_dct1, spc2: ...}
+        :param chk_ste: whether or not to check inchis for stereo completeness
+        :type chk_ste: Bool
+        :param chk_match: whether or not to check that inchis and smiles match
+        :type chk_match: Bool
+        :param nprocs: number of processes, or 'auto' for all CPUs
+        :type nprocs: int or str
+        :param cache_path: file of the calculator.ich_cache memo to read
+            before and write after filling in the species; not used if None
+        :type cache_path: str
+        :return mech_spc_dct: identifying information on species in a mech
+        :rtype: dct {spc1: spc_dct1, spc2: ...}
+    """
 
-    # Build the mech_spc_dct line by line
-    mech_spc_dct = {}
+    if cache_path is not None:
+        ich_cache.load_cache(cache_path)
 
-    for idx, line in enumerate(lines):
-        if idx == 0:
-            headers = parse_first_line(line, quotechar=quotechar)
-            if canon_ent and 'canon_enant_ich' not in headers:
-                print("Warning: user selected the 'canon_ent' option, but the"
-                      " field 'canon_enant_ich' is not in the CSV file.\n"
-                      "The canonical enantiomer will have to be calculated "
-                      "for every species, which might be slow.")
-        else:
-            cols = parse_line(line, idx, headers, quotechar=quotechar)
-            if cols is not None:
-                spc, spc_dct = make_spc_dct(cols, headers)
-                # Check that the species name was not already defined
-                assert spc not in mech_spc_dct, (
-                    f'The species name {spc} appears in the csv file more than'
-                    f' once. The second time is on line {idx + 1}, {line}.')
-                # Fill in the spc_dct and then add it to the mech_spc_dct
-                spc_dct = fill_spc_dct(
-                    spc_dct, spc, chk_ste=chk_ste,
-                    chk_match=chk_match, canon_ent=canon_ent)
-                mech_spc_dct[spc] = spc_dct
-
-            else:
-                print(f'Line {idx + 1} appears to be empty. Skipping...')
+    if canon_ent and any('canon_enant_ich' not in spc_dct
+                         for spc_dct in raw_mech_spc_dct.values()):
+        print("Warning: user selected the 'canon_ent' option, but the"
+              " field 'canon_enant_ich' is not in the CSV file.\n"
+              "The canonical enantiomer will have to be calculated "
+              "for every species, which might be slow.")
 
-    # Find species with the same chemical identifiers but different names
-    check_for_dups(mech_spc_dct, printwarnings=verbose)
+    args_lst = [(spc, _freeze_spc_dct(spc_dct), chk_ste, chk_match, canon_ent)
+                for spc, spc_dct in raw_mech_spc_dct.items()]
+    spc_dcts = ich_cache.map_memoized(
+        _fill_frozen_spc_dct, args_lst, nprocs=nprocs)
+
+    # The stored spc_dcts are shared, so give back copies
+    mech_spc_dct = dict(zip(raw_mech_spc_dct.keys(),
+                            copy.deepcopy(spc_dcts)))
+
+    # Find the missing canonical enantiomers for all species at once
+    if canon_ent:
+        mech_spc_dct = add_canonical_enantiomer(mech_spc_dct, nprocs=nprocs)
+
+    if cache_path is not None:
+        ich_cache.save_cache(cache_path)
 
     return mech_spc_dct
 
@@ -211,7 +322,8 @@ def make_spc_dct(cols, headers):
     return spc, spc_dct
 
 
-def fill_spc_dct(spc_dct, spc, chk_ste=True, chk_match=True, canon_ent=True):
+def fill_spc_dct(spc_dct, spc, chk_ste=True, chk_match=True, canon_ent=True,
+                 fill_enant=True):
     """ Fills in missing values in a spc_dct
 
         :param spc_dct: identifying information for a single species
@@ -222,6 +334,9 @@ def fill_spc_dct(spc_dct, spc, chk_ste=True, chk_match=True, canon_ent=True):
         :type chk_ste: Bool
         :param chk_match: whether or not to check that inchis and smiles match
         :type chk_match: Bool
+        :param fill_enant: whether to find a missing canonical enantiomer here;
+            otherwise, it is left for add_canonical_enantiomer
+        :type fill_enant: Bool
         :return full_spc_dct: beefed-up spc_dct
         :rtype: dct
     """
@@ -255,9 +370,10 @@ def fill_spc_dct(spc_dct, spc, chk_ste=True, chk_match=True, canon_ent=True):
     # add AMChI
     full_spc_dct = mech_inchi_to_amchi({spc: full_spc_dct}, convert=canon_ent)[spc]
 
-    if canon_ent and 'canon_enant_ich' not in full_spc_dct:
-        full_spc_dct = add_canonical_enantiomer(
-            {spc: full_spc_dct})[spc]
+    if canon_ent:
+        if fill_enant and 'canon_enant_ich' not in full_spc_dct:
+            full_spc_dct = add_canonical_enantiomer(
+                {spc: full_spc_dct})[spc]
     else:
         full_spc_dct['canon_enant_ich'] = full_spc_dct['inchi']
 
@@ -438,34 +554,24 @@ def check_for_dups(mech_spc_dct, printwarnings=True):
     """ Checks a mech_spc_dct for species that are identical except in name
     """
 
-    def are_spcs_same(spc_dct1, spc_dct2):
-        """ Checks if two species are chemically identical
-        """
-
-        ich1 = spc_dct1['inchi']
-        mlt1 = spc_dct1['mult']
-        chg1 = spc_dct1['charge']
-        exc1 = spc_dct1['exc_flag']
-
-        ich2 = spc_dct2['inchi']
-        mlt2 = spc_dct2['mult']
-        chg2 = spc_dct2['charge']
-        exc2 = spc_dct2['exc_flag']
-
-        same = all([ich1 == ich2, mlt1 == mlt2, chg1 == chg2, exc1 == exc2])
-
-        return same
-
-    spcs = tuple(mech_spc_dct.keys())  # convert to tuple for indexing
-    spc_dcts = tuple(mech_spc_dct.values())
-    for outer_idx, outer_spc in enumerate(spcs):
-        outer_dct = spc_dcts[outer_idx]
-        for inner_idx in range(outer_idx + 1, len(spcs)):
-            inner_spc = spcs[inner_idx]
-            inner_dct = spc_dcts[inner_idx]
-            if are_spcs_same(outer_dct, inner_dct) and printwarnings:
+    # Group the species by their chemical identifiers
+    key_spcs_dct = {}
+    for spc, spc_dct in mech_spc_dct.items():
+        key = (spc_dct['inchi'], spc_dct['mult'], spc_dct['charge'],
+               spc_dct['exc_flag'])
+        key_spcs_dct.setdefault(key, []).append(spc)
+
+    # Report each pair within a group, in the order of the mech_spc_dct
+    if printwarnings:
+        twins_dct = {}
+        for spcs in key_spcs_dct.values():
+            for idx, spc in enumerate(spcs):
+                twins_dct[spc] = spcs[idx + 1:]
+        for outer_spc in mech_spc_dct:
+            for inner_spc in twins_dct[outer_spc]:
                 print(f'{outer_spc} and {inner_spc} are chemical twins!')
 
+
 def mech_inchi_to_amchi(mech_spc_dct, convert = True):
     """ convert inchi to amchi where needed """
     for spc_dct in mech_spc_dct.values():
@@ -473,14 +579,79 @@ def mech_inchi_to_amchi(mech_spc_dct, convert = True):
 
     return mech_spc_dct
 
-def add_canonical_enantiomer(mech_spc_dct, dummy=False):
+def add_canonical_enantiomer(mech_spc_dct, dummy=False, nprocs=1):
     """ add canonical enantiomer to species dictionaries
+
+        The canonical enantiomers are kept in the calculator.ich_cache memo
+        by InChI, and the new ones are found on a process pool.
+
+        :param nprocs: number of processes, or 'auto' for all CPUs
+        :type nprocs: int or str
     """
-    for spc_dct in mech_spc_dct.values():
-        if 'canon_enant_ich' not in spc_dct:
-            if not dummy:
-                spc_dct['canon_enant_ich'] = canonical_enantiomer(
-                    spc_dct['inchi'])
-            else:
-                spc_dct['canon_enant_ich'] = spc_dct['inchi']
+    spc_dcts = [spc_dct for spc_dct in mech_spc_dct.values()
+                if 'canon_enant_ich' not in spc_dct]
+    if not dummy:
+        canon_ichs = ich_cache.map_memoized(
+            ich_cache.canonical_enantiomer,
+            [(spc_dct['inchi'],) for spc_dct in spc_dcts], nprocs=nprocs)
+    else:
+        canon_ichs = [spc_dct['inchi'] for spc_dct in spc_dcts]
+    for spc_dct, canon_ich in zip(spc_dcts, canon_ichs):
+        spc_dct['canon_enant_ich'] = canon_ich
     return mech_spc_dct
+
+
+def add_canon_enant_col(file_str, mech_spc_dct, quotechar="'"):
+    """ Adds a 'canon_enant_ich' column to the string of a spc.csv file;
+        comment and empty lines, inline comments, and line endings are kept
+        as they are
+
+        :param file_str: the string that was read directly from the .csv file
+        :type file_str: str
+        :param mech_spc_dct: identifying information on species in the file
+        :type mech_spc_dct: dct {spc1: spc_dct1, spc2: ...}
+        :param quotechar: the quotechar used to optionally ignore commas
+        :type quotechar: str
+        :return file_str: the string with the added column
+        :rtype: str
+    """
+
+    canon_ichs = iter(spc_dct['canon_enant_ich']
+                      for spc_dct in mech_spc_dct.values())
+    header = f'{quotechar}canon_enant_ich{quotechar}'
+    lines = file_str.splitlines(keepends=True)
+    for idx, line in enumerate(lines):
+        # Split off the line ending and any inline comment, which are kept
+        text = line.rstrip('\r\n')
+        eol = line[len(text):]
+        data, cmt_char, cmt = text.partition(CMTS)
+        if data.strip() == '':
+            continue
+        if header is not None:
+            col = header
+            header = None
+        else:
+            col = f'{quotechar}{next(canon_ichs)}{quotechar}'
+        end = len(data.rstrip())
+        lines[idx] = f'{data[:end]},{col}{data[end:]}{cmt_char}{cmt}{eol}'
+    assert next(canon_ichs, None) is None, (
+        'The species in mech_spc_dct do not match the lines of the csv file')
+
+    return ''.join(lines)
+
+
+def _freeze_spc_dct(spc_dct):
+    """ Converts a raw spc_dct to a hashable tuple of items
+    """
+    return tuple((key, tuple(sorted(val.items())) if key == 'fml' else val)
+                 for key, val in spc_dct.items())
+
+
+@ich_cache.memoize
+def _fill_frozen_spc_dct(spc, spc_items, chk_ste, chk_match, canon_ent):
+    """ Fills in a spc_dct given as a tuple of items
+    """
+    spc_dct = {key: dict(val) if key == 'fml' else val
+               for key, val in spc_items}
+    return fill_spc_dct(spc_dct, spc, chk_ste=chk_ste, chk_match=chk_match,
+                        canon_ent=canon_ent, fill_enant=False)
@@ -2,8 +2,6 @@
 Extract PES and SUBPESs from a given mechanism
 """
 
-import pandas as pd
-import numpy
 from mechanalyzer.parser._util import order_rct_bystoich
 import automol.chi
 import automol.form
@@ -97,63 +95,60 @@ def find_conn_chnls(pes_rct_lst, pes_prd_lst, pes_rxn_name_lst):
     pes_rct_lst = order_rct_bystoich(pes_rct_lst)
     pes_prd_lst = order_rct_bystoich(pes_prd_lst)
 
-    # put everything in a dataframe. indices are the numbers given by enumerate
-    len_rct_prd = numpy.array(list(map(len, pes_rct_lst))) + \
-        numpy.array(list(map(len, pes_prd_lst)))
-    pes_df = pd.DataFrame(
-        numpy.array([pes_rct_lst, pes_prd_lst, len_rct_prd], dtype=object).T,
-        index=numpy.arange(0, len(pes_rxn_name_lst)),
-        columns=['rcts', 'prds', 'N_rcts_prds'])
     # order by total number of species (N of reactants + N of products)
-    pes_df = pes_df.sort_values(by=['N_rcts_prds', 'rcts', 'prds'])
-    # Split up channels into a connected sub-pes within a formula
-    subpes_idx = 0
-    conndct = {}
+    chnl_idxs = sorted(
+        range(len(pes_rxn_name_lst)),
+        key=lambda idx: (len(pes_rct_lst[idx]) + len(pes_prd_lst[idx]),
+                         pes_rct_lst[idx], pes_prd_lst[idx]))
+
+    # Split up channels into connected sub-pes with a disjoint-set forest;
+    # a sub-pes keeps the index of the first sub-pes that went into it
+    parent = {}
     connchnls = {}
-
-    for chnl_idx in pes_df.index:
-        connected_to = []
-        chnl_species = [list(pes_df['rcts'][chnl_idx]),
-                        list(pes_df['prds'][chnl_idx])]
-
-        for conn_chnls_idx, spc_lst in conndct.items():
-            for spc_pair in chnl_species:
-                if len(spc_pair) == 1 and spc_pair in spc_lst:
-                    # This works for unimol species
-                    # Need also to verify bimol wellskipping channels
-                    if conn_chnls_idx not in connected_to:
-                        connected_to.append(conn_chnls_idx)
-                elif (len(spc_pair) == 1 and
-                      spc_pair[::-1] in spc_lst):
-                    if conn_chnls_idx not in connected_to:
-                        connected_to.append(conn_chnls_idx)
-
-            if len(chnl_species[0]) == 2 and len(chnl_species[1]) == 2:
-                # bimol bimol reactions
-                if ((chnl_species[0] in spc_lst) and
-                        (chnl_species[1] in spc_lst) and
-                        (conn_chnls_idx not in connected_to)):
-                    connected_to.append(conn_chnls_idx)
+    well_subpes = {}  # unimol species: the sub-pes it is in
+    bimol_subpess = {}  # bimol species pair: all sub-pes it is in
+
+    def _find(subpes_idx):
+        root = subpes_idx
+        while parent[root] != root:
+            root = parent[root]
+        while parent[subpes_idx] != root:
+            parent[subpes_idx], subpes_idx = root, parent[subpes_idx]
+        return root
+
+    for chnl_idx in chnl_idxs:
+        chnl_species = (tuple(pes_rct_lst[chnl_idx]),
+                        tuple(pes_prd_lst[chnl_idx]))
+
+        # This works for unimol species
+        connected_to = set()
+        for spc_pair in chnl_species:
+            if len(spc_pair) == 1 and spc_pair in well_subpes:
+                connected_to.add(_find(well_subpes[spc_pair]))
+        # bimol bimol reactions: both pairs must be in the same sub-pes
+        if (len(chnl_species[0]) == 2 and len(chnl_species[1]) == 2 and
+                all(spc_pair in bimol_subpess for spc_pair in chnl_species)):
+            rct_roots, prd_roots = (
+                {_find(idx) for idx in bimol_subpess[spc_pair]}
+                for spc_pair in chnl_species)
+            connected_to |= rct_roots & prd_roots
 
         if not connected_to:
-            conndct[subpes_idx] = chnl_species
+            subpes_idx = len(parent)
+            parent[subpes_idx] = subpes_idx
             connchnls[subpes_idx] = [chnl_idx]
-            subpes_idx += 1
         else:
-            conndct[connected_to[0]].extend(chnl_species)
-            connchnls[connected_to[0]].append(chnl_idx)
-            if len(connected_to) > 1:
-                for cidx, cval in enumerate(connected_to):
-                    if cidx > 0:
-                        conn_specs = conndct.pop(cval, None)
-                        conn_chnls = connchnls.pop(cval, None)
-                        conndct[connected_to[0]].extend(conn_specs)
-                        connchnls[connected_to[0]].extend(conn_chnls)
-            for cidx, spc_lst in conndct.items():
-                lst = sorted(spc_lst)
-                lst = [lst[i] for i in range(len(lst))
-                       if i == 0 or lst[i] != lst[i-1]]
-                conndct[cidx] = lst
+            subpes_idx, *other_idxs = sorted(connected_to)
+            connchnls[subpes_idx].append(chnl_idx)
+            for other_idx in other_idxs:
+                parent[other_idx] = subpes_idx
+                connchnls[subpes_idx].extend(connchnls.pop(other_idx))
+
+        for spc_pair in chnl_species:
+            if len(spc_pair) == 1:
+                well_subpes[spc_pair] = subpes_idx
+            elif len(spc_pair) == 2:
+                bimol_subpess.setdefault(spc_pair, set()).add(subpes_idx)
 
     return connchnls
 
@@ -16,6 +16,7 @@ from autorun import timeout, execute_function_in_parallel
 import ioformat.pathtools as text_parser
 import thermfit
 from mechanalyzer.parser.csv_ import csv_dct
+from mechanalyzer.calculator import ich_cache
 
 
 # LIST SETTING THE STANDARD ORDER OF HEADERS
@@ -222,7 +223,7 @@ def add_instability_products(mech_spc_dct, nprocs='auto', stereo=True):
     all_instab_ichs = ()
     for name, dct in mech_spc_dct.items():
         ich = dct['inchi']
-        instab_ichs = automol.reac.instability_product_inchis(
+        instab_ichs = ich_cache.instability_product_inchis(
             ich, stereo=stereo)
         if instab_ichs is not None:
             print(f'Found instability for {name} = {ich}')
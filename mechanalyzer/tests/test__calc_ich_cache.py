@@ -0,0 +1,98 @@
+"""
+Test the mechanalyzer.calculator.ich_cache functions
+"""
+
+import os
+import tempfile
+from mechanalyzer.calculator import ich_cache
+
+
+ICH = 'InChI=1S/C4H8O/c1-3-4(2)5/h3H2,1-2H3/b4-3+'
+TMP_DIR = tempfile.mkdtemp()
+CALLS = []
+
+
+def _count_atoms(ich, heavy_only=False):
+    """ Stand-in for an expensive operation that records its calls
+    """
+    CALLS.append(ich)
+    return len(ich) if heavy_only else 2 * len(ich)
+
+
+def test_memoize():
+    """ Test that results are reused, counted, and bounded in number
+    """
+
+    count_atoms = ich_cache.memoize(_count_atoms, max_size=2)
+    name = f'{__name__}._count_atoms'
+    assert count_atoms('A') == count_atoms('A') == 2
+    assert count_atoms('A', heavy_only=True) == 1
+    assert CALLS == ['A', 'A']
+    assert ich_cache.cache_info()[name] == {
+        'hits': 1, 'misses': 2, 'size': 2}
+
+    # The least recently used result is dropped
+    count_atoms('A')
+    count_atoms('B')
+    assert ich_cache.cache_info()[name]['size'] == 2
+    count_atoms('A')
+    assert CALLS == ['A', 'A', 'B']
+    count_atoms('A', heavy_only=True)
+    assert CALLS == ['A', 'A', 'B', 'A']
+
+
+def _double(ich):
+    """ Stand-in for an expensive operation run over many InChIs
+    """
+    return 2 * ich
+
+
+def test_map_memoized():
+    """ Test that batches reuse stored results and store the new ones
+    """
+
+    double = ich_cache.memoize(_double)
+    name = f'{__name__}._double'
+    assert double('A') == 'AA'
+    for nprocs in (1, 2):
+        assert ich_cache.map_memoized(
+            double, [('B',), ('A',), ('B',)], nprocs=nprocs) == [
+                'BB', 'AA', 'BB']
+    assert ich_cache.cache_info()[name] == {
+        'hits': 5, 'misses': 2, 'size': 2}
+
+
+def test_save_load():
+    """ Test that stored results survive a round trip through the disk
+    """
+
+    path = os.path.join(TMP_DIR, 'ich_cache.pkl')
+    ref_ich = ich_cache.without_stereo(ICH)
+    ich_cache.save_cache(path)
+    ich_cache.clear_cache()
+    name = [name for name in ich_cache.cache_info()
+            if name.endswith('without_stereo')][0]
+    assert ich_cache.cache_info()[name]['size'] == 0
+
+    assert ich_cache.load_cache(path)
+    assert ich_cache.without_stereo(ICH) == ref_ich
+    assert ich_cache.cache_info()[name] == {'hits': 1, 'misses': 0, 'size': 1}
+    assert not ich_cache.load_cache(os.path.join(TMP_DIR, 'missing.pkl'))
+
+    # Files from another cache version are deleted instead of read
+    ich_cache.save_cache(path)
+    ich_cache.clear_cache()
+    cache_version = ich_cache.CACHE_VERSION
+    ich_cache.CACHE_VERSION = cache_version + 1
+    try:
+        assert not ich_cache.load_cache(path)
+    finally:
+        ich_cache.CACHE_VERSION = cache_version
+    assert ich_cache.cache_info()[name]['size'] == 0
+    assert not os.path.exists(path)
+
+
+if __name__ == '__main__':
+    test_memoize()
+    test_map_memoized()
+    test_save_load()
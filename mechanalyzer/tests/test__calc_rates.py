@@ -101,6 +101,18 @@ def test_plog():
     assert np.allclose(calc_rates, PLOG_0_3ATM_KTS, rtol=1e-3)
 
 
+def test_plog_brackets():
+    """ Test the PLOG pressure bracketing
+    """
+    plog_pressures = np.array([0.1, 1.0, 10.0])
+    lo_idx, hi_idx, weight, is_exact = rates.plog_brackets(
+        plog_pressures, np.array([0.01, 0.316, 1.005, 100.0]))
+    assert np.array_equal(lo_idx, [0, 0, 1, 2])
+    assert np.array_equal(hi_idx, [0, 1, 1, 2])
+    assert np.allclose(weight, [0.0, np.log10(3.16), 0.0, 0.0])
+    assert np.array_equal(is_exact, [True, False, True, True])
+
+
 def test_cheb():
     """ Test the Chebyshev calculator
     """
@@ -110,6 +122,19 @@ def test_cheb():
     assert np.allclose(calc_rates, CHEB_100ATM_KTS, rtol=1e-3)
 
 
+def test_cheb_temps_lst():
+    """ Test the Chebyshev calculator when the temps differ by pressure
+    """
+    temps_lst = [TEMPS2[0], TEMPS2[0][:2], TEMPS2[0], TEMPS2[0][1:],
+                 TEMPS2[0]]
+    ktp_dct = rates.cheb(CHEB_DCT['alpha'], CHEB_DCT['tlim'],
+                         CHEB_DCT['plim'], temps_lst, PRESSURES)
+    assert 'high' not in ktp_dct
+    temps, calc_rates = ktp_dct[100.0]
+    assert np.allclose(temps, TEMPS2[0][1:])
+    assert np.allclose(calc_rates, CHEB_100ATM_KTS[1:], rtol=1e-3)
+
+
 def test_troe():
     """ Test the Troe calculator
     """
@@ -128,6 +153,22 @@ def test_lind():
     assert np.allclose(calc_rates, LIND_10ATM_KTS, rtol=1e-3)
 
 
+def test_falloff_ktps():
+    """ Test the stacked Troe/Lindemann kernel
+    """
+    ktps = rates.falloff_ktps(
+        [HIGH_P_PARAMS, HIGH_P_PARAMS], [LOW_P_PARAMS, LOW_P_PARAMS],
+        TEMPS[0], PRESSURES,
+        troe_params_lst=[TROE_COEFFS, TROE_COEFFS + [None]])
+    assert ktps.shape == (2, len(PRESSURES), len(TEMPS[0]))
+    assert np.allclose(ktps[:, 2], TROE_10ATM_KTS, rtol=1e-3)
+    assert np.allclose(ktps[:, -1], rates.arr(HIGH_P_PARAMS, TEMPS[0], 1.0))
+
+    ktps = rates.falloff_ktps(
+        [HIGH_P_PARAMS], [LOW_P_PARAMS], TEMPS[0], PRESSURES)
+    assert np.allclose(ktps[0, 2], LIND_10ATM_KTS, rtol=1e-3)
+
+
 def test_dup_arrhenius():
     """ Test the Arrhenius calculator for a duplicate reaction
     """
@@ -203,9 +244,12 @@ def test_remove_high():
 if __name__ == '__main__':
     test_arr()
     test_plog()
+    test_plog_brackets()
     test_cheb()
+    test_cheb_temps_lst()
     test_troe()
     test_lind()
+    test_falloff_ktps()
     test_dup_arrhenius()
     test_dup_plog()
     test_check_p_t()
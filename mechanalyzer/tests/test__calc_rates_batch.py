@@ -0,0 +1,84 @@
+"""
+Test the mechanalyzer.calculator.rates_batch functions
+"""
+
+import numpy as np
+from autoreact.params import RxnParams
+from mechanalyzer.calculator import rates
+from mechanalyzer.calculator import rates_batch
+
+
+PRESSURES = [0.05, 0.316, 1.0, 10.0, 100.0, 'high']
+TEMPS = np.array([300.0, 500.0, 1000.0, 1500.0, 2000.0])
+LOW_P_PARAMS = [[1.04E+15, 0, 59810]]
+HIGH_P_PARAMS = [[1.26E+12, 0, 62620]]
+PLOG_DCT = {
+    0.1: [[1.04E+15, 0, 59810]],
+    1: [[1.04E+16, 0, 59810]],
+    10: [[1.04E+17, 0, 59810]],
+    100: [[1.04E+18, 0, 59810]]}
+CHEB_DCT = {
+    'tlim': [300.0, 2500.0],
+    'plim': [1.0, 100.0],
+    'alpha': np.array([
+        [1.0216E+01, -1.1083E+00, -1.9807E-01],
+        [7.8325E-01, 1.1609E+00, 1.1762E-01],
+        [-9.5707E-02, 1.0928E-01, 1.1551E-01]]),
+    'one_atm_arr': [[1, 0, 0]]}
+DUP_PLOG_PARAMS = RxnParams(plog_dct=PLOG_DCT)
+DUP_PLOG_PARAMS.combine_objects(DUP_PLOG_PARAMS)
+RXN_PARAM_DCT = {
+    (('A',), ('B',), (None,)): RxnParams(
+        arr_dct={'arr_tuples': [[1.04E+15, 0, 59810], [1.0E+13, 0.5, 1000]]}),
+    (('C',), ('D',), (None,)): RxnParams(plog_dct=PLOG_DCT),
+    (('E',), ('F',), (None,)): RxnParams(cheb_dct=CHEB_DCT),
+    (('G',), ('H',), ('(+M)',)): RxnParams(troe_dct={
+        'highp_arr': HIGH_P_PARAMS, 'lowp_arr': LOW_P_PARAMS,
+        'troe_params': [1.18, 1E-30, 7900]}),
+    (('I',), ('J',), ('(+M)',)): RxnParams(troe_dct={
+        'highp_arr': HIGH_P_PARAMS, 'lowp_arr': LOW_P_PARAMS,
+        'troe_params': [0.6, 100.0, 2000.0, 5000.0]}),
+    (('K',), ('L',), ('(+M)',)): RxnParams(lind_dct={
+        'highp_arr': HIGH_P_PARAMS, 'lowp_arr': LOW_P_PARAMS}),
+    (('M',), ('N',), (None,)): DUP_PLOG_PARAMS,
+}
+
+
+def test_eval_rxn_param_dct():
+    """ Test that the batched evaluator matches the per-rxn evaluator
+    """
+
+    rxns, ktps = rates_batch.eval_rxn_param_dct(
+        RXN_PARAM_DCT, TEMPS, PRESSURES)
+    assert rxns == tuple(RXN_PARAM_DCT.keys())
+    assert ktps.shape == (len(rxns), len(PRESSURES), len(TEMPS))
+
+    ref_rxn_ktp_dct = rates.eval_rxn_param_dct(
+        RXN_PARAM_DCT, [TEMPS], PRESSURES)
+    rxn_ktp_dct = rates_batch.to_rxn_ktp_dct(rxns, ktps, TEMPS, PRESSURES)
+    for rxn, ref_ktp_dct in ref_rxn_ktp_dct.items():
+        assert set(rxn_ktp_dct[rxn].keys()) == set(ref_ktp_dct.keys())
+        for pressure, (ref_temps, ref_kts) in ref_ktp_dct.items():
+            temps, kts = rxn_ktp_dct[rxn][pressure]
+            assert np.allclose(temps, ref_temps)
+            assert np.allclose(kts, ref_kts, rtol=1e-8)
+
+
+def test_eval_rxn_ktp_dct():
+    """ Test the batched drop-in for rates.eval_rxn_param_dct
+    """
+
+    rxn_ktp_dct = rates_batch.eval_rxn_ktp_dct(
+        RXN_PARAM_DCT, [TEMPS], PRESSURES)
+    arr_rxn = (('A',), ('B',), (None,))
+    assert list(rxn_ktp_dct[arr_rxn].keys()) == ['high']
+
+    # Arrhenius rates go at the last pressure if 'high' is absent
+    rxn_ktp_dct = rates_batch.eval_rxn_ktp_dct(
+        RXN_PARAM_DCT, [TEMPS], PRESSURES[:-1])
+    assert list(rxn_ktp_dct[arr_rxn].keys()) == [100.0]
+
+
+if __name__ == '__main__':
+    test_eval_rxn_param_dct()
+    test_eval_rxn_ktp_dct()
@@ -0,0 +1,107 @@
+"""
+Test the mechanalyzer.calculator.rates_cache functions
+"""
+
+import os
+import tempfile
+import numpy as np
+from autoreact.params import RxnParams
+from mechanalyzer.calculator import rates
+from mechanalyzer.calculator import rates_batch
+from mechanalyzer.calculator import rates_cache
+
+
+PRESSURES = [1.0, 10.0, 'high']
+TEMPS_LST = [np.array([300.0, 500.0, 1000.0, 1500.0, 2000.0])]
+PLOG_DCT = {
+    0.1: [[1.04E+15, 0, 59810]],
+    1: [[1.04E+16, 0, 59810]],
+    10: [[1.04E+17, 0, 59810]]}
+RXN_PARAM_DCT = {
+    (('A',), ('B',), (None,)): RxnParams(
+        arr_dct={'arr_tuples': [[1.04E+15, 0, 59810]]}),
+    (('C',), ('D',), (None,)): RxnParams(plog_dct=PLOG_DCT),
+    (('G',), ('H',), ('(+M)',)): RxnParams(troe_dct={
+        'highp_arr': [[1.26E+12, 0, 62620]],
+        'lowp_arr': [[1.04E+15, 0, 59810]],
+        'troe_params': [0.6, 100.0, 2000.0, 5000.0]}),
+}
+TMP_DIR = tempfile.mkdtemp()
+
+
+def test_eval_rxn_param_dct():
+    """ Test that cached rates match uncached ones and are reused
+    """
+
+    cache_dir = os.path.join(TMP_DIR, 'eval')
+    ref_rxn_ktp_dct = rates.eval_rxn_param_dct(
+        RXN_PARAM_DCT, TEMPS_LST, PRESSURES)
+
+    # First call fills the cache; second call reads from it
+    for _ in range(2):
+        rxn_ktp_dct = rates_cache.eval_rxn_param_dct(
+            RXN_PARAM_DCT, TEMPS_LST, PRESSURES, cache_dir=cache_dir)
+        assert list(rxn_ktp_dct.keys()) == list(ref_rxn_ktp_dct.keys())
+        for rxn, ref_ktp_dct in ref_rxn_ktp_dct.items():
+            assert list(rxn_ktp_dct[rxn].keys()) == list(ref_ktp_dct.keys())
+            for pressure, (_, ref_kts) in ref_ktp_dct.items():
+                assert np.allclose(rxn_ktp_dct[rxn][pressure][1], ref_kts)
+    assert len(os.listdir(cache_dir)) == 1
+
+    # Changing one rxn or the grid gives new bundles
+    new_rxn_param_dct = dict(RXN_PARAM_DCT)
+    new_rxn_param_dct[(('A',), ('B',), (None,))] = RxnParams(
+        arr_dct={'arr_tuples': [[2.08E+15, 0, 59810]]})
+    rxn_ktp_dct = rates_cache.eval_rxn_param_dct(
+        new_rxn_param_dct, TEMPS_LST, PRESSURES, cache_dir=cache_dir)
+    assert np.allclose(rxn_ktp_dct[(('A',), ('B',), (None,))]['high'][1],
+                       2 * ref_rxn_ktp_dct[(('A',), ('B',), (None,))]['high'][1])
+    assert len(os.listdir(cache_dir)) == 2
+    rates_cache.eval_rxn_param_dct(
+        RXN_PARAM_DCT, TEMPS_LST, PRESSURES[:-1], cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 3
+
+
+def test_eval_rxn_param_dct_dense():
+    """ Test that the cached dense rates match rates_batch and share the
+        bundles of the rxn_ktp_dct version
+    """
+
+    cache_dir = os.path.join(TMP_DIR, 'dense')
+    ref_rxns, ref_ktps = rates_batch.eval_rxn_param_dct(
+        RXN_PARAM_DCT, TEMPS_LST[0], PRESSURES)
+
+    for _ in range(2):
+        rxns, ktps = rates_cache.eval_rxn_param_dct_dense(
+            RXN_PARAM_DCT, TEMPS_LST[0], PRESSURES, cache_dir=cache_dir)
+        assert rxns == ref_rxns
+        assert np.allclose(ktps, ref_ktps, equal_nan=True)
+    assert len(os.listdir(cache_dir)) == 1
+
+    # Rxns cached by one version are read by the other
+    rates_cache.eval_rxn_param_dct(
+        RXN_PARAM_DCT, TEMPS_LST, PRESSURES, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+
+
+def test_evict():
+    """ Test that eviction removes the least recently used bundles
+    """
+
+    cache_dir = os.path.join(TMP_DIR, 'evict')
+    for rxn, params in RXN_PARAM_DCT.items():
+        rates_cache.eval_rxn_param_dct(
+            {rxn: params}, TEMPS_LST, PRESSURES, cache_dir=cache_dir)
+    paths = [os.path.join(cache_dir, fname)
+             for fname in os.listdir(cache_dir)]
+    for idx, path in enumerate(paths):
+        os.utime(path, (idx, idx))
+    size = os.path.getsize(paths[-1])
+    rates_cache.evict(cache_dir, max_size=size)
+    assert os.listdir(cache_dir) == [os.path.basename(paths[-1])]
+
+
+if __name__ == '__main__':
+    test_eval_rxn_param_dct()
+    test_eval_rxn_param_dct_dense()
+    test_evict()
@@ -54,6 +54,24 @@ def test__invalid_temps():
     assert np.isnan(calc_g[2])
 
 
+def test__eval_nasa7_params():
+    """ Test the vectorized thermo calculator on packed NASA-7 coefficients
+    """
+    cfts, cutoff_temps = thermo.pack_nasa7_params(
+        [SPC_NASA7_DCT['N2O'], SPC_NASA7_DCT['N2O']])
+    assert cfts.shape == (2, 2, 7)
+    assert np.allclose(cutoff_temps, [[200.0, 1000.0, 6000.0]] * 2)
+
+    h_t, cp_t, s_t, g_t, _ = thermo.eval_nasa7_params(
+        cfts, cutoff_temps, BAD_TEMPS)
+    for calc, corr in ((h_t, CORR_H), (cp_t, CORR_CP), (s_t, CORR_S),
+                       (g_t, CORR_G)):
+        assert calc.shape == (2, 3)
+        assert np.allclose(calc[:, :2], corr[:2], rtol=1e-3)
+        assert np.all(np.isnan(calc[:, 2]))
+
+
 if __name__ == '__main__':
     test__valid_temps()
     test__invalid_temps()
+    test__eval_nasa7_params()
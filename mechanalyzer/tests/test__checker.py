@@ -2,6 +2,7 @@
 """
 
 import numpy as np
+from mechanalyzer import xarray_wrappers
 from mechanalyzer.builder import checker
 
 
@@ -161,6 +162,29 @@ def test__all_checks():
                                rxn_num_threshold)
 
 
+def test__mech_idx():
+    """ Test the get_mech_idx function
+    """
+    mech_idx = checker.get_mech_idx(RXN_PARAM_DCT1)
+    assert mech_idx['rct_rxns']['O2'] == [
+        (('H', 'O2'), ('OH', 'O'), (None,)),
+        (('H2', 'O2'), ('HO2', 'H'), (None,))]
+    assert mech_idx['prd_rxns']['HO2'] == [
+        (('H2', 'O2'), ('HO2', 'H'), (None,))]
+    # Each rxn is listed once even if the species appears twice
+    assert mech_idx['spc_rxns']['OH'].count(
+        (('H2', 'O'), ('OH', 'OH'), (None,))) == 1
+    assert mech_idx['spc_counts']['OH'] == 8
+    assert tuple(mech_idx['thrd_rxns'].keys()) == ('(+M)', '+O(S)')
+    assert mech_idx['molecularity'][(('H', 'O'), ('OH',), ('+O(S)',))] == 3
+
+    # The index can be passed to the checks instead of being rebuilt
+    assert checker.get_lone_spcs(RXN_PARAM_DCT1, 2, mech_idx=mech_idx) == (
+        checker.get_lone_spcs(RXN_PARAM_DCT1, 2))
+    assert checker.get_sources_and_sinks(RXN_PARAM_DCT1, mech_idx=mech_idx) == (
+        checker.get_sources_and_sinks(RXN_PARAM_DCT1))
+
+
 def test__sources_and_sinks():
     """ Test the get_sources_and_sinks and write_sources_and_sinks functions
     """
@@ -213,6 +237,54 @@ def test__large_rates():
     assert large_kts_str3.replace(" ", "") == CORRECT_LARGE_KTS_STR.replace(" ", "")
 
 
+def test__ktp_checks():
+    """ Test the get_ktp_checks, get_ktp_check_table, and write_ktp_checks
+        functions
+    """
+    rxns = (
+        (('OH',), ('H', 'O'), (None,)),
+        (('H2', 'O'), ('OH', 'H'), (None,)),
+        (('H', 'O2'), ('OH', 'O'), (None,)),
+        (('H', 'O'), ('OH',), ('+O(S)',)),
+    )
+    pressures = [1, 10, 'high', 100]
+    ktps = np.full((len(rxns), len(pressures), len(TEMPS)), 1e9)
+    ktps[0, 1] = LARGE_UNIMOLEC_KTS
+    ktps[1, 3] = LARGE_BIMOLEC_KTS
+    ktps[2, 0] = NEGATIVE_KTS
+    ktps[2, 2] = np.nan  # no value at 'high'
+    ktps[3, 0, 1] = np.inf
+    ktps[3, :, 0] = [1e9, 1e10, 1e9, 1e11]  # turns around at 100 atm
+
+    mech_ktp = xarray_wrappers.from_mech_data(rxns, TEMPS, pressures, ktps)
+
+    thresholds = [1e11, 1e15, 1e22]
+    ktp_checks = checker.get_ktp_checks(mech_ktp, thresholds)
+    assert set(ktp_checks.keys()) == set(checker.KTP_CHECKS)
+    assert tuple(zip(*np.nonzero(ktp_checks['large']))) == (
+        (0, 1), (1, 3), (3, 0))
+    assert tuple(zip(*np.nonzero(ktp_checks['negative']))) == ((2, 0),)
+    assert tuple(zip(*np.nonzero(ktp_checks['nonfinite']))) == ((3, 0),)
+    # k(P) turns around at the large values as well
+    assert tuple(zip(*np.nonzero(ktp_checks['nonmonotonic']))) == (
+        (0, 1), (1, 3), (3, 3))
+
+    check_table = checker.get_ktp_check_table(mech_ktp, ktp_checks)
+    assert list(check_table['check']) == (
+        ['large'] * 3 + ['negative', 'nonfinite'] + ['nonmonotonic'] * 3)
+    assert list(check_table['pressure'])[:3] == [10, 100, 1]
+
+    # The text matches that of the per-rxn checks
+    sub_mech_ktp = mech_ktp.isel(rxn=slice(0, 1), pres=slice(0, 2))
+    ktp_checks_str = checker.write_ktp_checks(
+        sub_mech_ktp,
+        {check: flags[:1, :2] for check, flags in ktp_checks.items()},
+        thresholds, sep_str='')
+    sub_rxn_ktp_dct = xarray_wrappers.to_rxn_ktp_dct(sub_mech_ktp)
+    assert ktp_checks_str.startswith(checker.write_large_kts(
+        checker.get_large_kts(sub_rxn_ktp_dct, thresholds), thresholds))
+
+
 def test__lone_species():
     """ Test the get_lone_spcs and write_lone_spcs functions
     """
@@ -280,9 +352,11 @@ def test__missing_spcs():
 
 if __name__ == '__main__':
     test__all_checks()
+    test__mech_idx()
     test__sources_and_sinks()
     test__negative_rates()
     test__large_rates()
+    test__ktp_checks()
     test__lone_species()
     test__duplicates()
     test__mismatches()
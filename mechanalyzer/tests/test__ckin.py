@@ -1,6 +1,7 @@
 """ Tests the ckin.py file
 """
 
+import io
 import os
 import numpy
 from mechanalyzer.parser import ckin_ as ckin
@@ -24,19 +25,30 @@ CORRECT_PARAMS = [1.04e14, 0, 15286]
 CORRECT_SPCS = ('O',)
 CORRECT_THERM = numpy.array([60591.29919473, 63105.13563443, 65600.33145539])
 MECH_STR = 'REACTIONS\nH+O2=OH+O 1.04e14 0 15286\nEND'
+DUP_MECH_STR = """REACTIONS
+H2O2+OH<=>H2O+HO2  1.740E+012  0.000  318.0
+DUP
+H+O2=OH+O  1.04e14 0 15286
+H2O2+OH<=>H2O+HO2  7.590E+013  0.000  7269.0  ! second copy
+DUP
+H2+O=OH+H  5.08e04 2.67 6292
+END
+"""
 
 
 def test_load_rxn_ktp_dcts():
-    """ Tests the load_rxn_ktp_dcts function
+    """ Tests the load_rxn_ktp_dcts function, serially and in parallel
     """
 
-    rxn_ktp_dcts = ckin.load_rxn_ktp_dcts(MECH_FILENAMES, DAT_PATH, TEMPS_LST,
-                                          PRESSURES)
-    assert len(rxn_ktp_dcts) == 2
-    for rxn_ktp_dct in rxn_ktp_dcts:
-        assert tuple(rxn_ktp_dct.keys()) == CORRECT_RXN
-        for ktp_dct in rxn_ktp_dct.values():
-            assert numpy.allclose(ktp_dct[10][1], CORRECT_RATES, rtol=1e-2)
+    for nprocs in (1, 2):
+        rxn_ktp_dcts = ckin.load_rxn_ktp_dcts(
+            MECH_FILENAMES, DAT_PATH, TEMPS_LST, PRESSURES, nprocs=nprocs)
+        assert len(rxn_ktp_dcts) == 2
+        for rxn_ktp_dct in rxn_ktp_dcts:
+            assert tuple(rxn_ktp_dct.keys()) == CORRECT_RXN
+            for ktp_dct in rxn_ktp_dct.values():
+                assert numpy.allclose(ktp_dct[10][1], CORRECT_RATES,
+                                      rtol=1e-2)
 
 
 def test_load_rxn_param_dcts():
@@ -82,9 +94,54 @@ def test_parse_rxn_ktp_dct():
         assert numpy.allclose(ktp_dct[10][1], CORRECT_RATES, rtol=1e-2)
 
 
+def test_iter_rxn_params():
+    """ Tests the streaming parser and rate calculator
+    """
+
+    # Small chunks give the same rxns and params as the full parser
+    ref_rxn_param_dct = ckin.load_rxn_param_dct('mech1.txt', DAT_PATH)
+    rxn_params = ckin.load_rxn_params_iter('mech1.txt', DAT_PATH,
+                                           chunk_size=2)
+    rxn_param_dct = ckin.collect_rxn_param_dct(rxn_params)
+    assert tuple(rxn_param_dct.keys()) == tuple(ref_rxn_param_dct.keys())
+    for rxn, params in rxn_param_dct.items():
+        assert params.get_existing_forms() == (
+            ref_rxn_param_dct[rxn].get_existing_forms())
+
+    # Rates are calculated as the file is read
+    with open(os.path.join(DAT_PATH, 'mech3.txt'), encoding='utf-8') as fobj:
+        rxn_ktp_iter = ckin.iter_rxn_ktp_dcts(
+            ckin.iter_rxn_params(fobj), TEMPS_LST, PRESSURES)
+        rxn, ktp_dct = next(rxn_ktp_iter)
+    assert (rxn,) == CORRECT_RXN
+    assert numpy.allclose(ktp_dct[10][1], CORRECT_RATES, rtol=1e-2)
+
+    # Duplicates that are not adjacent are still yielded once, at the end
+    ref_rxn_param_dct = ckin.parse_rxn_param_dct(DUP_MECH_STR)
+    rxn_params = tuple(ckin.iter_rxn_params(
+        io.StringIO(DUP_MECH_STR), chunk_size=1))
+    rxns = tuple(rxn for rxn, _ in rxn_params)
+    assert len(rxns) == len(set(rxns)) == len(ref_rxn_param_dct)
+    assert rxns[-1] == ((('H2O2', 'OH'), ('H2O', 'HO2'), (None,)))
+    for rxn, params in rxn_params:
+        assert params.get_existing_forms() == (
+            ref_rxn_param_dct[rxn].get_existing_forms())
+
+    ref_rxn_ktp_dct = ckin.parse_rxn_ktp_dct(
+        DUP_MECH_STR, TEMPS_LST, PRESSURES)
+    rxn_ktp_dct = dict(ckin.iter_rxn_ktp_dcts(
+        ckin.iter_rxn_params(io.StringIO(DUP_MECH_STR), chunk_size=1),
+        TEMPS_LST, PRESSURES, chunk_size=1))
+    assert set(rxn_ktp_dct) == set(ref_rxn_ktp_dct)
+    for rxn, ktp_dct in rxn_ktp_dct.items():
+        for pres, (_, kts) in ktp_dct.items():
+            assert numpy.allclose(kts, ref_rxn_ktp_dct[rxn][pres][1])
+
+
 if __name__ == '__main__':
     test_load_rxn_ktp_dcts()
     test_load_rxn_param_dcts()
     test_load_spc_therm_dcts()
     test_load_spc_nasa7_dcts()
     test_parse_rxn_ktp_dct()
+    test_iter_rxn_params()
@@ -174,6 +174,15 @@ def test_rename_spc_dct():
     assert tuple(renamed_dct.values()) == tuple(SPC_IDENT_DCT2.values())
 
 
+def test_get_spc_idx_dct():
+    """ Test the species identity index used for renaming
+    """
+    spc_idx_dct = compare.get_spc_idx_dct(SPC_IDENT_DCT2)
+    assert spc_idx_dct[('InChI=1S/O', 3, 0, 0)] == ['OV']
+    assert spc_idx_dct[('InChI=1S/O', 1, 0, 0)] == ['O(S)V']
+    assert len(spc_idx_dct) == len(SPC_IDENT_DCT2)
+
+
 def test_get_comb_spc_dct():
     """ Test the get_comb_spc_dct function
     """
@@ -289,6 +298,7 @@ def test_align_rxn_ktp_dcts():
 
 if __name__ == '__main__':
     test_rename_spc_dct()
+    test_get_spc_idx_dct()
     test_get_comb_spc_dct()
     test_rename_spc_therm_dct()
     test_rename_rxn_ktp_dct()
@@ -0,0 +1,128 @@
+""" test mechanalyzer.builder._stereo scheduling and combo searches
+"""
+
+import itertools as it
+import multiprocessing
+from mechanalyzer.builder import _stereo
+
+
+SPC_DCT = {
+    'H': {'inchi': 'InChI=1S/H'},
+    'O': {'inchi': 'InChI=1S/O'},
+    'OH': {'inchi': 'InChI=1S/HO/h1H'},
+    'H2': {'inchi': 'InChI=1S/H2/h1H'},
+    'O2': {'inchi': 'InChI=1S/O2/c1-2'},
+    'HO2': {'inchi': 'InChI=1S/HO2/c1-2/h1H'},
+    'H2O': {'inchi': 'InChI=1S/H2O/h1H2'},
+    'CH3': {'inchi': 'InChI=1S/CH3/h1H3'},
+    'CH4': {'inchi': 'InChI=1S/CH4/h1H4'},
+}
+# Three PESs (HO2, H2O, and CH4); the two H2O channels are not connected
+RXN_DCT = {
+    (('H', 'O2'), ('HO2',), ('(+M)',)): None,
+    (('H2', 'O'), ('H', 'OH'), (None,)): None,
+    (('CH3', 'H'), ('CH4',), ('(+M)',)): None,
+    (('HO2',), ('O', 'OH'), (None,)): None,
+    (('H', 'OH'), ('H2O',), ('(+M)',)): None,
+}
+ORDERED_RXNS = (
+    (('H', 'O2'), ('HO2',), ('(+M)',)),
+    (('HO2',), ('O', 'OH'), (None,)),
+    (('H2', 'O'), ('H', 'OH'), (None,)),
+    (('H', 'OH'), ('H2O',), ('(+M)',)),
+    (('CH3', 'H'), ('CH4',), ('(+M)',)),
+)
+
+# Enantiomers of CHBrClF and 2-butanol, and two species without stereo
+X0 = 'InChI=1S/CHBrClF/c2-1(3)4/h1H/t1-/m0/s1'
+X1 = 'InChI=1S/CHBrClF/c2-1(3)4/h1H/t1-/m1/s1'
+Y0 = 'InChI=1S/C4H10O/c1-3-4(2)5/h4-5H,3H2,1-2H3/t4-/m0/s1'
+Y1 = 'InChI=1S/C4H10O/c1-3-4(2)5/h4-5H,3H2,1-2H3/t4-/m1/s1'
+Z = 'InChI=1S/H'
+W = 'InChI=1S/HO/h1H'
+STE_RXNS = (
+    ((X0,), (Y0,), (None,)),
+    ((X0,), (Y1,), (None,)),
+    ((X1,), (Y0,), (None,)),
+    ((X1,), (Y1,), (None,)),
+    ((X0, Z), (W, Y0), (None,)),
+)
+NONSTE_RXNS = (((Z,), (W,), (None,)),)
+
+
+def _fake_ste_rxn_lsts(rxn_ich, enant=True):
+    """ Stand-in for _ste_rxn_lsts: the forward and reverse reactions
+    """
+    _ = enant
+    return ((rxn_ich[0], rxn_ich[1]), (rxn_ich[1], rxn_ich[0])), ''
+
+
+def _expected_ste_rxns(rxn):
+    """ The stereo expansions of a rxn from _fake_ste_rxn_lsts
+    """
+    rxn_ich = _stereo._rxn_name_to_ich(
+        rxn, {name: dct['inchi'] for name, dct in SPC_DCT.items()})
+    return ((rxn_ich[0], rxn_ich[1], rxn[2]),
+            (rxn_ich[1], rxn_ich[0], rxn[2]))
+
+
+def test__expand_mech_stereo_iter():
+    """ test that the stereo expansions come back in PES and connected
+        channel order, with every reaction present
+    """
+
+    # Worker processes only see the stand-in if they are forked
+    nprocs_lst = [1]
+    if multiprocessing.get_start_method() == 'fork':
+        nprocs_lst.append(2)
+
+    ste_rxn_lsts = _stereo._ste_rxn_lsts
+    _stereo._ste_rxn_lsts = _fake_ste_rxn_lsts
+    try:
+        for nprocs in nprocs_lst:
+            results = tuple(_stereo.expand_mech_stereo_iter(
+                RXN_DCT, SPC_DCT, nprocs=nprocs))
+            assert tuple(rxn for rxn, _ in results) == ORDERED_RXNS
+            for rxn, ste_rxns_lst in results:
+                assert ste_rxns_lst == _expected_ste_rxns(rxn)
+
+            all_ste_rxns = _stereo.expand_mech_stereo(
+                RXN_DCT, SPC_DCT, nprocs=nprocs)
+            assert all_ste_rxns == sum(
+                (_expected_ste_rxns(rxn) for rxn in ORDERED_RXNS), ())
+    finally:
+        _stereo._ste_rxn_lsts = ste_rxn_lsts
+
+
+def test__get_best_combo():
+    """ test that the backtracking search finds the same combos as a brute
+        force enumeration of all combinations
+    """
+
+    def _is_good(combo):
+        return not any(
+            _stereo._is_ste_conn(_stereo._enant_rxn(rxn), combo, []) or
+            _stereo._missed_rxn(rxn, STE_RXNS, combo) for rxn in combo)
+
+    ref_combos = [()]
+    for size in range(1, len(STE_RXNS) + 1):
+        combos = [combo for combo in it.combinations(STE_RXNS, size)
+                  if _is_good(combo)]
+        if combos:
+            ref_combos = combos
+
+    # The memoized enantiomers are shared, so they must be immutable
+    assert _stereo._enant_rxn(STE_RXNS[0]) == ((X1,), (Y1,), (None,))
+
+    best_combos = list(_stereo._get_best_combo(STE_RXNS + NONSTE_RXNS))
+    assert len(ref_combos) == 4 and len(ref_combos[0]) == 2
+    assert best_combos == [combo + NONSTE_RXNS for combo in ref_combos]
+
+    # With a size cap, every single rxn is a best combo
+    best_combos = list(_stereo._get_best_combo(STE_RXNS, maxcombo=1))
+    assert best_combos == [(rxn,) for rxn in STE_RXNS]
+
+
+if __name__ == '__main__':
+    test__expand_mech_stereo_iter()
+    test__get_best_combo()
@@ -0,0 +1,68 @@
+""" Tests the mechanalyzer.parser.new_spc functions
+"""
+
+import os
+from mechanalyzer.parser import new_spc as spc_parser
+from mechanalyzer.calculator import ich_cache
+
+# Set paths
+PATH = os.path.dirname(os.path.realpath(__file__))
+DAT_PATH = os.path.join(PATH, 'data')
+SPC_CSV = 'merge_ste.csv'
+
+
+def test_load_raw_mech_spc_dct():
+    """ Tests that the raw parse keeps the values in the file
+    """
+
+    raw_mech_spc_dct = spc_parser.load_raw_mech_spc_dct(SPC_CSV, DAT_PATH)
+    assert list(raw_mech_spc_dct.keys())[:4] == ['H', 'O', 'O2', 'HO']
+    assert raw_mech_spc_dct['O2'] == {
+        'smiles': 'O=O', 'inchi': 'InChI=1S/O2/c1-2',
+        'inchikey': 'MYMOFIZGZYHOMD-UHFFFAOYSA-N', 'mult': 3, 'charge': 0}
+
+
+def test_fill_mech_spc_dct():
+    """ Tests that filling a raw mech_spc_dct, serially or in parallel, gives
+        the same result as the full parse
+    """
+
+    ref_mech_spc_dct = spc_parser.load_mech_spc_dct(SPC_CSV, DAT_PATH)
+    raw_mech_spc_dct = spc_parser.load_raw_mech_spc_dct(SPC_CSV, DAT_PATH)
+    for nprocs in (1, 2):
+        ich_cache.clear_cache()
+        mech_spc_dct = spc_parser.fill_mech_spc_dct(
+            raw_mech_spc_dct, nprocs=nprocs)
+        assert mech_spc_dct == ref_mech_spc_dct
+    assert raw_mech_spc_dct['O2']['inchi'] == 'InChI=1S/O2/c1-2'
+    assert 'fml' not in raw_mech_spc_dct['O2']
+
+
+def test_add_canon_enant_col():
+    """ Tests that the canonical enantiomers are added as the last column,
+        before any inline comment and with the line endings of the file
+    """
+
+    file_str = ("'name','inchi'\n"
+                "! comment\n"
+                "'A','InChI=1S/X/t1-/m0/s1'\n"
+                "\n"
+                "'B','InChI=1S/Y'  ! inline comment\n")
+    mech_spc_dct = {'A': {'canon_enant_ich': 'InChI=1S/X/t1-/m1/s1'},
+                    'B': {'canon_enant_ich': 'InChI=1S/Y'}}
+    ref_file_str = ("'name','inchi','canon_enant_ich'\n"
+                    "! comment\n"
+                    "'A','InChI=1S/X/t1-/m0/s1','InChI=1S/X/t1-/m1/s1'\n"
+                    "\n"
+                    "'B','InChI=1S/Y','InChI=1S/Y'  ! inline comment\n")
+    assert spc_parser.add_canon_enant_col(
+        file_str, mech_spc_dct) == ref_file_str
+    assert spc_parser.add_canon_enant_col(
+        file_str.replace('\n', '\r\n'), mech_spc_dct) == (
+            ref_file_str.replace('\n', '\r\n'))
+
+
+if __name__ == '__main__':
+    test_load_raw_mech_spc_dct()
+    test_fill_mech_spc_dct()
+    test_add_canon_enant_col()
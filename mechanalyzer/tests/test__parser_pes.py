@@ -6,6 +6,7 @@ import tempfile
 import numpy as np
 from ioformat import pathtools
 from mechanalyzer.parser.pes import pes_dictionary
+from mechanalyzer.parser.pes import find_conn_chnls
 from mechanalyzer.parser.spc import build_spc_dct
 
 CWD = os.path.dirname(os.path.realpath(__file__))
@@ -45,9 +46,31 @@ def test__pes_dictionary():
     for key, val in pes_dct.items():
         assert val == results_pes_dct[key]
 
+
+def test__find_conn_chnls():
+    """ test mechanalyzer.parser.pes.find_conn_chnls
+
+        wells, bimol pairs (in either order), bimol-bimol links, and
+        sub-pes merges
+    """
+    pes_rct_lst = [('A',), ('B',), ('B',), ('C', 'D'), ('E', 'F'),
+                   ('I',), ('J',), ('K',), ('D', 'C')]
+    pes_prd_lst = [('B',), ('C', 'D'), ('E', 'F'), ('E', 'F'), ('G', 'H'),
+                   ('J',), ('A',), ('G', 'H'), ('F', 'E')]
+    pes_rxn_name_lst = [f'rxn{idx}' for idx in range(len(pes_rct_lst))]
+
+    # J=A merges sub-pes 1 (I=J) into sub-pes 0 (A=B); C+D=E+F is linked
+    # since both pairs are in sub-pes 0, but E+F=G+H and K=G+H are not
+    connchnls = find_conn_chnls(pes_rct_lst, pes_prd_lst, pes_rxn_name_lst)
+    assert list(connchnls.items()) == [
+        (0, [0, 6, 5, 1, 2, 3, 8]),
+        (2, [7]),
+        (3, [4])]
+
     
 if __name__ == '__main__':
     test__pes_dictionary()
+    test__find_conn_chnls()
     #test__connected_channels_dct() #calls also find_conn_chnls
     #test__print_pes_channels()
     
@@ -0,0 +1,64 @@
+""" test mechanalyzer.builder.rxnclass
+"""
+
+import numpy
+from mechanalyzer.builder import rxnclass
+
+# Subpes with two wells; B is listed first so that its links are met first
+SPECIES_SUBPES = [('B',), ('A',), ('C', 'D'), ('E', 'F'), ('G', 'H')]
+RCT_NAMES_LST = [('A',), ('A',), ('B',), ('A',), ('C', 'D'), ('C', 'D')]
+PRD_NAMES_LST = [('C', 'D'), ('C', 'D'), ('E', 'F'), ('E', 'F'),
+                 ('E', 'F'), ('G', 'H')]
+RCLASSES = ['beta scission', 'addition', 'unclassified',
+            'hydrogen abstraction', 'unclassified', 'unclassified']
+
+
+def test__elem_reac_matrix():
+    """ test mechanalyzer.builder.rxnclass.elem_reac_matrix
+
+        the matrix is symmetric and the last rxn of a couple wins
+    """
+    class_lst, codes = rxnclass.encode_classes(RCLASSES)
+    assert class_lst[0] == ''
+    assert list(class_lst[codes]) == RCLASSES
+
+    elem_reac_mat = rxnclass.elem_reac_matrix(
+        SPECIES_SUBPES, RCT_NAMES_LST, PRD_NAMES_LST, codes)
+    assert numpy.array_equal(elem_reac_mat, elem_reac_mat.T)
+    ref_mat = numpy.array([
+        ['', '', '', 'unclassified', ''],
+        ['', '', 'addition', 'hydrogen abstraction', ''],
+        ['', 'addition', '', 'unclassified', 'unclassified'],
+        ['unclassified', 'hydrogen abstraction', 'unclassified', '', ''],
+        ['', '', 'unclassified', '', '']])
+    assert numpy.array_equal(class_lst[elem_reac_mat], ref_mat)
+
+
+def test__classify_ws():
+    """ test mechanalyzer.builder.rxnclass.classify_ws
+
+        links with no rxn or an unclassified rxn are skipped, and channels
+        with no classified link to a well are not classified
+    """
+    class_lst, codes = rxnclass.encode_classes(RCLASSES)
+    elem_reac_mat = rxnclass.elem_reac_matrix(
+        SPECIES_SUBPES, RCT_NAMES_LST, PRD_NAMES_LST, codes)
+
+    # C+D=E+F goes through A on both sides; G+H is only linked to C+D
+    rxn_types_ws = rxnclass.classify_ws(
+        elem_reac_mat, class_lst, SPECIES_SUBPES,
+        RCT_NAMES_LST[4:], PRD_NAMES_LST[4:])
+    assert rxn_types_ws == ['addition-hydrogen abstraction (WS)', None]
+
+    # No channels, or no wells to link to
+    assert not rxnclass.classify_ws(
+        elem_reac_mat, class_lst, SPECIES_SUBPES, [], [])
+    bimol_species = SPECIES_SUBPES[2:]
+    assert rxnclass.classify_ws(
+        elem_reac_mat[2:, 2:], class_lst, bimol_species,
+        RCT_NAMES_LST[4:], PRD_NAMES_LST[4:]) == [None, None]
+
+
+if __name__ == '__main__':
+    test__elem_reac_matrix()
+    test__classify_ws()
@@ -0,0 +1,69 @@
+""" test mechanalyzer.builder.sort_fct
+"""
+
+import itertools as it
+import numpy
+import pandas as pd
+from mechanalyzer.builder import sort_fct
+
+# Two PESs; the first has two rxns with the same name (a tie)
+RXNS = [(('H', 'O2'), ('HO2',), ('(+M)',)),
+        (('CH3', 'H'), ('CH4',), ('(+M)',)),
+        (('HO2',), ('OH', 'O'), (None,)),
+        (('H', 'O2'), ('HO2',), (None,)),
+        (('H2', 'O'), ('OH', 'H'), (None,))]
+PES_DF = pd.DataFrame(
+    {'pes': [1, 2, 1, 1, 1],
+     'rxn_names': ['H+O2=HO2', 'CH3+H=CH4', 'HO2=OH+O', 'H+O2=HO2',
+                   'H2+O=OH+H'],
+     'rct_names_lst': [rxn[0] for rxn in RXNS],
+     'prd_names_lst': [rxn[1] for rxn in RXNS]},
+    index=pd.Index(RXNS, tupleize_cols=False))
+
+
+def test__conn_chn_df():
+    """ test mechanalyzer.builder.sort_fct.conn_chn_df
+
+        rxns with the same name are numbered in the order of the rows
+    """
+    ref_chnls = {
+        RXNS[0]: (1, 2, (1, (('H', 'O2'), ('HO2',)))),
+        RXNS[1]: (1, 1, (0, (('CH3', 'H'), ('CH4',)))),
+        RXNS[2]: (1, 1, (0, (('HO2',), ('OH', 'O')))),
+        RXNS[3]: (1, 3, (2, (('H', 'O2'), ('HO2',)))),
+        RXNS[4]: (2, 4, (3, (('H2', 'O'), ('OH', 'H')))),
+    }
+    chnl_df = sort_fct.conn_chn_df(PES_DF)
+    assert list(chnl_df.index) == RXNS
+    assert {rxn: tuple(row) for rxn, row in zip(
+        chnl_df.index, chnl_df.values)} == ref_chnls
+
+    # Swapping the rows of the tie swaps their channels
+    chnl_df = sort_fct.conn_chn_df(PES_DF.iloc[::-1])
+    assert tuple(chnl_df.loc[[RXNS[3]], 'chnl']) == (2,)
+    assert tuple(chnl_df.loc[[RXNS[0]], 'chnl']) == (3,)
+
+
+def test__lexsort_idxs():
+    """ test mechanalyzer.builder.sort_fct.lexsort_idxs
+
+        same order as DataFrame.sort_values, with ties and missing values
+    """
+    mech_df = pd.DataFrame(
+        {'spc': ['b', numpy.nan, 'a', 'b', 'c', numpy.nan, 'a'],
+         'val': [1.0, 2.0, numpy.nan, 1.0, 0.5, 2.0, 3.0],
+         'num': [3, 1, 2, 3, 1, 2, 0]},
+        index=[10, 5, 3, 8, 1, 0, 7])
+
+    for columns in (['spc', 'val'], ['val', 'spc'], ['num', 'spc', 'val']):
+        for ascending in it.product((True, False), repeat=len(columns)):
+            ref_idxs = mech_df.index.get_indexer(
+                mech_df.sort_values(by=columns, ascending=list(ascending)
+                                    ).index)
+            idxs = sort_fct.lexsort_idxs(mech_df, columns, list(ascending))
+            assert list(idxs) == list(ref_idxs)
+
+
+if __name__ == '__main__':
+    test__conn_chn_df()
+    test__lexsort_idxs()
@@ -7,6 +7,7 @@ import tempfile
 import numpy as np
 from ioformat import pathtools
 from mechanalyzer.builder import sorter
+from mechanalyzer.builder import sort_fct
 from mechanalyzer.parser import mech as mparser
 from mechanalyzer.parser import ckin_ as ckin_parser
 from mechanalyzer.parser import new_spc as sparser
@@ -275,7 +276,8 @@ def test__sortby_rxnclass():
     sort_lst = ['rxn_class_graph', 'rxn_class_broad', 0]
 
     param_dct_sort, _, cmts_dct, _, _ = sorter.sorted_mech(
-        spc_str, mech_str, isolate_spc, sort_lst, stereo_optns=True)
+        spc_str, mech_str, isolate_spc, sort_lst, stereo_optns=True,
+        nprocs=2)
 
     for rxn in param_dct_sort.keys():
         assert cmts_dct[rxn]['cmts_inline'].split('type')[1] == results[rxn]
@@ -427,6 +429,45 @@ def test__sortby_subpes_chnl():
     assert results == sorted_results
 
 
+def test__sort_lazy_rates():
+    """ test mechanalyzer.parser.sort
+        sorts that do not use rates never evaluate them, and sorts by
+        rxn_max_vals give the same order as with eagerly evaluated rates
+    """
+
+    # Read mechanism files into strings
+    spc_path = os.path.join(CWD, 'data', 'LLNL_species.csv')
+    mech_path = os.path.join(CWD, 'data', 'LLNL_IC8_red_submech.dat')
+    sort_path = None
+
+    spc_str, mech_str, _ = _read_files(spc_path, mech_path, sort_path)
+    spc_dct = sparser.parse_mech_spc_dct(spc_str, canon_ent=False)
+    rxn_param_dct = mparser.parse_mechanism(mech_str, MECH_TYPE)
+
+    # Sorts by pes and subpes leave the param_vals empty
+    for isolate_spc, sort_lst in (([], ['pes', 'subpes', 0]),
+                                  (['IC8', 'IC8-1R'],
+                                   ['species', 'subpes', 1])):
+        srt_mch = sorter.sorting(
+            rxn_param_dct, spc_dct, sort_lst, isolate_spc)
+        assert all(param_vals is None
+                   for param_vals in srt_mch.mech_df['param_vals'].values)
+
+    # Sorting by rates evaluates them, in the same order as before
+    sort_lst = ['rxn_max_vals', 0]
+    ref_rxn_ktp_dct = dict(zip(
+        rxn_param_dct.keys(), sort_fct.sort_param_vals(rxn_param_dct)))
+    ref_srt_mch = sorter.sorting(ref_rxn_ktp_dct, spc_dct, sort_lst, [])
+    ref_sorted_idx, ref_cmts_dct, _ = ref_srt_mch.return_mech_df()
+
+    srt_mch = sorter.sorting(rxn_param_dct, spc_dct, sort_lst, [])
+    sorted_idx, cmts_dct, _ = srt_mch.return_mech_df()
+    assert all(param_vals is not None
+               for param_vals in srt_mch.mech_df['param_vals'].values)
+    assert sorted_idx == ref_sorted_idx
+    assert cmts_dct == ref_cmts_dct
+
+
 # Helper function
 
 
@@ -459,6 +500,7 @@ if __name__ == '__main__':
     test__sortby_species_subpes()
     test__sortby_subpes_chnl()
     test__sort_ktp()
+    test__sort_lazy_rates()
 
     
     
@@ -1,8 +1,18 @@
 """
 Wrappers for the new xarray system. Constructors, Getters, then Setters.
+
+A KTP DataArray holds k(T,P)s on a ("pres", "temp") grid. A mechanism-wide
+KTP DataArray adds a leading "rxn" dimension, so that all rates are in one
+float64 array of shape (num_rxns, num_pressures, num_temps). The 'high'
+pressure of a ktp_dct is stored as numpy.inf, and points where a rxn has no
+value are NaN.
 """
 
+import numpy
 import xarray
+from mechanalyzer.calculator import rates_batch
+from mechanalyzer.calculator import rates_cache
+
 
 # Constructors
 def from_data(temps, press, rates):
@@ -15,31 +25,111 @@ def from_data(temps, press, rates):
     return ktp
 
 
+def from_mech_data(rxns, temps, press, rates):
+    """
+    Construct a mechanism KTP DataArray from data; 'high' in press is
+    replaced by numpy.inf
+    """
+
+    rxn_coord = numpy.empty(len(rxns), dtype=object)
+    rxn_coord[:] = list(rxns)  # keeps the rxn tuples as single entries
+    ktp = xarray.DataArray(
+        numpy.asarray(rates, dtype=float),
+        coords={"rxn": rxn_coord, "pres": _pres_coord(press),
+                "temp": numpy.asarray(temps, dtype=float)},
+        dims=("rxn", "pres", "temp"))
+
+    return ktp
+
+
+def from_rxn_param_dct(rxn_param_dct, temps, press, tref=1.0,
+                       cache_dir=None):
+    """
+    Construct a mechanism KTP DataArray by evaluating a rxn_param_dct on a
+    single T,P grid; the rates are cached in cache_dir if it is given
+    """
+
+    if cache_dir is not None:
+        rxns, rates = rates_cache.eval_rxn_param_dct_dense(
+            rxn_param_dct, temps, press, tref=tref, cache_dir=cache_dir)
+    else:
+        rxns, rates = rates_batch.eval_rxn_param_dct(
+            rxn_param_dct, temps, press, tref=tref)
+
+    return from_mech_data(rxns, temps, press, rates)
+
+
+def from_rxn_ktp_dct(rxn_ktp_dct):
+    """
+    Construct a mechanism KTP DataArray from a rxn_ktp_dct; the grid is the
+    union of all temps and pressures, sorted
+    """
+
+    temps = numpy.unique(numpy.concatenate(
+        [numpy.asarray(temps, dtype=float)
+         for ktp_dct in rxn_ktp_dct.values()
+         for temps, _ in ktp_dct.values()] or [numpy.zeros(0)]))
+    press = numpy.unique(_pres_coord(
+        [pres for ktp_dct in rxn_ktp_dct.values() for pres in ktp_dct]))
+
+    rates = numpy.full((len(rxn_ktp_dct), len(press), len(temps)), numpy.nan)
+    for ridx, ktp_dct in enumerate(rxn_ktp_dct.values()):
+        for pres, (rxn_temps, kts) in ktp_dct.items():
+            pidx = numpy.searchsorted(press, _pres_coord([pres])[0])
+            tidxs = numpy.searchsorted(temps, rxn_temps)
+            rates[ridx, pidx, tidxs] = kts
+
+    return from_mech_data(tuple(rxn_ktp_dct.keys()), temps, press, rates)
+
 
 # Getters
 def get_pressures(ktp):
     """
-    Gets the temperature values
+    Gets the pressure values
     """
 
     return ktp.pres.data
 
 
+def get_pressure_keys(ktp):
+    """
+    Gets the pressure values as ktp_dct keys, with numpy.inf as 'high'
+    """
+
+    return [_pres_key(pres) for pres in get_pressures(ktp)]
+
+
 def get_temperatures(ktp):
     """
-    Gets the pressure values
+    Gets the temperature values
     """
 
     return ktp.temp.data
 
 
-def get_values(rates):
+def get_values(ktp):
+    """
+    Gets the KTP values as a numpy array (a view, not a copy)
+    """
+
+    return numpy.asarray(ktp)
+
+
+def get_rxns(ktp):
+    """
+    Gets the rxns of a mechanism KTP DataArray
+    """
+
+    return tuple(ktp.rxn.data)
+
+
+def get_rxn(ktp, rxn):
     """
-    WORK IN PROGRESS
-    Gets the KTP values
+    Get the KTP DataArray of one rxn from a mechanism KTP DataArray; shares
+    memory with the full array
     """
 
-    return rates
+    return ktp.isel(rxn=ktp.indexes["rxn"].get_loc(rxn))
 
 
 def get_pslice(ktp, ip):
@@ -82,14 +172,65 @@ def get_itslice(ktp, it):
     return ktp.isel(temp=it)
 
 
+def to_ktp_dct(ktp):
+    """
+    Convert a KTP DataArray to a ktp_dct; pressures with no values are
+    skipped, and the kts are views whenever no temps are missing
+    """
+
+    temps = get_temperatures(ktp)
+    rates = get_values(ktp)
+    ktp_dct = {}
+    for pidx, pres in enumerate(get_pressures(ktp)):
+        kts = rates[pidx]
+        valid = ~numpy.isnan(kts)
+        if valid.all():
+            ktp_dct[_pres_key(pres)] = (temps, kts)
+        elif valid.any():
+            ktp_dct[_pres_key(pres)] = (temps[valid], kts[valid])
+
+    return ktp_dct
+
+
+def to_rxn_ktp_dct(ktp):
+    """
+    Convert a mechanism KTP DataArray to a rxn_ktp_dct
+    """
+
+    rxn_ktp_dct = {}
+    for ridx, rxn in enumerate(get_rxns(ktp)):
+        ktp_dct = to_ktp_dct(ktp.isel(rxn=ridx))
+        if ktp_dct:
+            rxn_ktp_dct[rxn] = ktp_dct
+
+    return rxn_ktp_dct
+
 
 # Setters
 def set_rates(ktp, rates):
     """
-    DOES NOT WORK YET. Still fixing!
-    Sets the KTP values
+    Sets the KTP values; returns a new DataArray with the same coordinates
+    """
+
+    rates = numpy.asarray(rates, dtype=float)
+    assert rates.shape == ktp.shape, (
+        f'Shape of rates, {rates.shape}, does not match {ktp.shape}')
+
+    return ktp.copy(data=rates)
+
+
+def _pres_coord(press):
+    """
+    Converts pressures to floats, with 'high' as numpy.inf
+    """
+
+    return numpy.array([numpy.inf if pres == 'high' else pres
+                        for pres in press], dtype=float)
+
+
+def _pres_key(pres):
+    """
+    Converts a pressure coordinate back to a ktp_dct key
     """
 
-    #ktp = ktp.loc[rates]
-    #return ktp
-    pass
+    return 'high' if numpy.isinf(pres) else float(pres)
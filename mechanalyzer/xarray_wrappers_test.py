@@ -9,8 +9,19 @@ Rates = [[1e1, 1e2, 1e3, 1e4], [1e5, 1e6, 1e7, 1e8], [1e9, 1e10, 1e11, 1e12]]
 Ktp = xarray_wrappers.from_data(Temps, Press, Rates)
 print(Ktp)
 
+RxnKtpDct = {
+    (('H', 'O2'), ('OH', 'O'), (None,)): {
+        'high': (numpy.array(Temps), numpy.array([1e10, 2e10, 3e10, 4e10]))},
+    (('H', 'O2'), ('HO2',), ('(+M)',)): {
+        1: (numpy.array(Temps), numpy.array([1e8, 2e8, 3e8, 4e8])),
+        10: (numpy.array(Temps[1:]), numpy.array([2e9, 3e9, 4e9])),
+        'high': (numpy.array(Temps), numpy.array([1e12, 2e12, 3e12, 4e12]))},
+}
+
+
 def test_set_rates():
-    ktp = xarray_wrappers.set_rates(Ktp, Rates)
+    ktp = xarray_wrappers.set_rates(Ktp, numpy.multiply(Rates, 2))
+    assert numpy.allclose(ktp.data, 2 * numpy.array(Rates))
     print(ktp)
 
 def test_get_temperatures():
@@ -51,7 +62,28 @@ def test_get_ipslice():
 def test_get_itslice():
     itslice = xarray_wrappers.get_itslice(Ktp, 0)
     print(itslice)
-    
+
+
+def test_rxn_ktp_dct():
+    mech_ktp = xarray_wrappers.from_rxn_ktp_dct(RxnKtpDct)
+    assert mech_ktp.shape == (2, 3, 4)
+    assert xarray_wrappers.get_rxns(mech_ktp) == tuple(RxnKtpDct)
+
+    # Per-rxn DataArrays share memory with the full array
+    rxn = (('H', 'O2'), ('HO2',), ('(+M)',))
+    rxn_ktp = xarray_wrappers.get_rxn(mech_ktp, rxn)
+    assert numpy.shares_memory(rxn_ktp.data, mech_ktp.data)
+    assert numpy.isnan(rxn_ktp.sel(pres=10, temp=1000).item())
+
+    # Round trip back to a rxn_ktp_dct
+    rxn_ktp_dct = xarray_wrappers.to_rxn_ktp_dct(mech_ktp)
+    for rxn, ktp_dct in RxnKtpDct.items():
+        assert set(rxn_ktp_dct[rxn]) == set(ktp_dct)
+        for pres, (temps, kts) in ktp_dct.items():
+            assert numpy.allclose(rxn_ktp_dct[rxn][pres][0], temps)
+            assert numpy.allclose(rxn_ktp_dct[rxn][pres][1], kts)
+
+
 test_set_rates()
 test_get_pressures()
 test_get_temperatures()
@@ -61,3 +93,4 @@ test_get_tslice()
 test_get_spec_vals()
 test_get_ipslice()
 test_get_itslice()
+test_rxn_ktp_dct()
@@ -3,10 +3,13 @@
     Run with "python check_mech.py <path/to/folder>"
 """
 
+import os
 import numpy as np
 import sys
 import ioformat.pathtools as fileio
 import mechanalyzer.parser.ckin_ as ckin_parser
+from mechanalyzer import xarray_wrappers
+from mechanalyzer.calculator import rates_cache
 from mechanalyzer.builder import checker
 
 # INPUTS
@@ -16,13 +19,21 @@ PRESSURES = [1, 10, 100]
 K_THRESHOLDS = [6e12, 1e15, 1e22]
 RXN_NUM_THRESHOLD = 2
 OUT_FILENAME = 'mech_check.txt'
+TABLE_FILENAME = 'mech_check.csv'
+CACHE_DIR = rates_cache.DEFAULT_CACHE_DIR  # None to turn off rate caching
 
 # Load dcts
 JOB_PATH = sys.argv[1]
 RXN_PARAM_DCT = ckin_parser.load_rxn_param_dct(MECH_FILENAME, JOB_PATH)
-RXN_KTP_DCT = ckin_parser.load_rxn_ktp_dct(MECH_FILENAME, JOB_PATH,
-                                           TEMPS, PRESSURES)
+MECH_KTP = xarray_wrappers.from_rxn_param_dct(RXN_PARAM_DCT, TEMPS[0],
+                                              PRESSURES, cache_dir=CACHE_DIR)
+KTP_CHECKS = checker.get_ktp_checks(MECH_KTP, K_THRESHOLDS)
 
 output_str = checker.run_all_checks(
-    RXN_PARAM_DCT, RXN_KTP_DCT, K_THRESHOLDS, RXN_NUM_THRESHOLD)
+    RXN_PARAM_DCT, None, K_THRESHOLDS, RXN_NUM_THRESHOLD,
+    mech_ktp=MECH_KTP, ktp_checks=KTP_CHECKS)
 fileio.write_file(output_str, JOB_PATH, OUT_FILENAME)
+
+# Table of the flagged k(T,P)s
+check_table = checker.get_ktp_check_table(MECH_KTP, KTP_CHECKS)
+check_table.to_csv(os.path.join(JOB_PATH, TABLE_FILENAME), index=False)
@@ -9,6 +9,7 @@ import mechanalyzer.plotter.rates as plot_rates
 import mechanalyzer.plotter._util as util
 import mechanalyzer.parser.new_spc as spc_parser
 import mechanalyzer.parser.ckin_ as ckin_parser
+from mechanalyzer.calculator import rates_cache
 from ioformat import pathtools
 
 # INPUTS
@@ -41,6 +42,8 @@ SORT_METHOD = 'ratios'  # either 'ratios' or None
 rev_rates = True
 remove_loners = True
 write_file = False
+cache_dir = rates_cache.DEFAULT_CACHE_DIR  # None to turn off rate caching
+nprocs = 'auto'  # processes for loading the files; 1 to load one at a time
 
 
 # RUN FUNCTIONS; DON'T CHANGE THIS
@@ -53,10 +56,11 @@ elif len(sys.argv) == 1:
     JOB_PATH = os.getcwd()
     print(f'No job path input; using the current directory, {JOB_PATH}')
 rxn_ktp_dcts = ckin_parser.load_rxn_ktp_dcts(
-    MECH_FILES, JOB_PATH, TEMPS_LST, pressures)
+    MECH_FILES, JOB_PATH, TEMPS_LST, pressures, batch=True,
+    cache_dir=cache_dir, nprocs=nprocs)
 spc_therm_dcts = ckin_parser.load_spc_therm_dcts(
-    THERM_FILES, JOB_PATH, TEMPS_LST[0])  # NOTE: taking first entry
-spc_dcts = spc_parser.load_mech_spc_dcts(CSV_FILES, JOB_PATH)
+    THERM_FILES, JOB_PATH, TEMPS_LST[0], nprocs=nprocs)  # NOTE: first entry
+spc_dcts = spc_parser.load_mech_spc_dcts(CSV_FILES, JOB_PATH, nprocs=nprocs)
 
 # Get the algn_rxn_ktp_dct
 TEMPS = TEMPS_LST[0]  # function receives a single Numpy array of temps
@@ -83,6 +83,7 @@ REMOVE_LONERS = True
 WRITE_FILE = False  # this currently does nothing
 PRINT_MISSING = True  # print spcs that are in mech(s) but not in spc.csv
 OUT_FILENAME = 'comparetool.out'  #
+NPROCS = 'auto'  # processes for loading the files; 1 to load one at a time
 
 # RUN FUNCTIONS
 # Fix temps to include the sort_temps if it doesn't already
@@ -97,8 +98,9 @@ elif len(sys.argv) == 1:
     JOB_PATH = os.getcwd()
     print(f'No job path input; using the current directory, {JOB_PATH}')
 SPC_THERM_DCTS = ckin_parser.load_spc_therm_dcts(THERMO_FILENAMES, JOB_PATH,
-                                                 TEMPS)
-SPC_DCTS = spc_parser.load_mech_spc_dcts(SPC_CSV_FILENAMES, JOB_PATH)
+                                                 TEMPS, nprocs=NPROCS)
+SPC_DCTS = spc_parser.load_mech_spc_dcts(SPC_CSV_FILENAMES, JOB_PATH,
+                                         nprocs=NPROCS)
 
 # Get the algn_spc_therm_dct
 ALGN_SPC_THERM_DCT = compare.get_algn_spc_therm_dct(
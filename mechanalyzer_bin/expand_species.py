@@ -78,8 +78,10 @@ if OPTS['sort']:
 
 HEADERS = ('smiles', 'inchi', 'inchikey', 'mult', 'charge')
 if OPTS['canonical']:
+    mechanalyzer.calculator.ich_cache.load_cache()
     mech_spc_dct = mechanalyzer.parser.new_spc.add_canonical_enantiomer(
-        mech_spc_dct)
+        mech_spc_dct, nprocs=OPTS['nprocs'])
+    mechanalyzer.calculator.ich_cache.save_cache()
     HEADERS += ('canon_enant_ich',)
 
 
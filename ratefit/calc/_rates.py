@@ -3,7 +3,7 @@ Calculate rates with various fitting functions
 """
 
 import numpy as np
-from scipy.special import eval_chebyt
+from numpy.polynomial.chebyshev import chebvander
 from phydat import phycon
 
 
@@ -382,39 +382,29 @@ def cheb(alpha, tlim, plim, temps, pressures):
         :rtype: dict[pressure: temps]
     """
 
-    def cheb_one_pressure(alpha, tlim, plim, temps, pressure):
-        """ Calculates T,P-dependent rate constants [k(T,P)]s using
-            a Chebyshev functional expression, at a given pressure,
-            across several temperatures.
-        """
+    tmin, tmax = tlim
+    pmin, pmax = plim
+    alpha = np.asarray(alpha, dtype=float)
+    tdeg, pdeg = alpha.shape
 
-        tmin, tmax = tlim
-        pmin, pmax = plim
-        alpha_nrows, alpha_ncols = alpha.shape
-
-        ktps = np.zeros(len(temps))
-        for i, temp in enumerate(temps):
-            ctemp = (
-                (2.0 * temp**(-1) - tmin**(-1) - tmax**(-1)) /
-                (tmax**(-1) - tmin**(-1)))
-            cpress = (
-                (2.0 * np.log10(pressure) - np.log10(pmin) - np.log10(pmax)) /
-                (np.log10(pmax) - np.log10(pmin)))
-
-            logktp = 0.0
-            for j in range(alpha_nrows):
-                for k in range(alpha_ncols):
-                    logktp += (alpha[j][k] * eval_chebyt(j, ctemp) *
-                               eval_chebyt(k, cpress))
-
-            ktps[i] = 10**(logktp)
-
-        return ktps
+    # Build the P basis once and contract it with alpha to get the
+    # T coefficients at every pressure
+    pbasis = _cheb_basis(np.log10(np.asarray(pressures, dtype=float)),
+                         np.log10(pmin), np.log10(pmax), pdeg)
+    tcoeffs = alpha @ pbasis.T  # shape (tdeg, num_pressures)
 
     kp_dct = {}
-    for pressure in pressures:
-        kp_dct[pressure] = cheb_one_pressure(
-            alpha, tlim, plim, temps, pressure)
+    if np.ndim(temps) == 1:
+        tbasis = _cheb_basis(1.0 / np.asarray(temps, dtype=float),
+                             1.0 / tmin, 1.0 / tmax, tdeg)
+        logktps = tbasis @ tcoeffs  # shape (num_temps, num_pressures)
+        for pidx, pressure in enumerate(pressures):
+            kp_dct[pressure] = 10**(logktps[:, pidx])
+    else:
+        for pidx, pressure in enumerate(pressures):
+            tbasis = _cheb_basis(1.0 / np.asarray(temps[pidx], dtype=float),
+                                 1.0 / tmin, 1.0 / tmax, tdeg)
+            kp_dct[pressure] = 10**(tbasis @ tcoeffs[:, pidx])
 
     ktp_dct = _ktp_dct(kp_dct, temps)
 
@@ -486,6 +476,27 @@ def _f_broadening_term(pr_term, alpha, ts3, ts1, ts2, temp):
     return f_term
 
 
+def _cheb_basis(vals, vmin, vmax, num_coeffs):
+    """ Evaluates the first num_coeffs Chebyshev polynomials at a set of
+        values after mapping [vmin, vmax] onto [-1, 1]
+
+        :param vals: values at which to evaluate the polynomials
+        :type vals: numpy.ndarray
+        :param vmin: value mapped to -1
+        :type vmin: float
+        :param vmax: value mapped to 1
+        :type vmax: float
+        :param num_coeffs: number of polynomials (i.e., max degree + 1)
+        :type num_coeffs: int
+        :return basis: polynomial values, basis[i, j] = T_j(vals[i])
+        :rtype: numpy.ndarray of shape (len(vals), num_coeffs)
+    """
+
+    red_vals = (2.0 * vals - vmin - vmax) / (vmax - vmin)
+
+    return chebvander(red_vals, num_coeffs - 1)
+
+
 def p_to_m(pressure, temps, rval=RC2):
     """ Convert the pressure to the concentration of a gas [M]
         assuming an ideal gas form where [M] ~ P/RT.
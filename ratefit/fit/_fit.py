@@ -1,8 +1,11 @@
 """ This is Clayton's new version
 """
 
+import io
 import copy
+import contextlib
 import numpy
+import autorun
 from ratefit.fit import arr
 from ratefit.fit import plog
 from ratefit.fit import cheb
@@ -36,7 +39,7 @@ ALLOWED_FIT_METHODS = (
 
 
 def fit_rxn_ktp_dct(rxn_ktp_dct, fit_method, pdep_dct=None, arrfit_dct=None,
-                    chebfit_dct=None, troefit_dct=None):
+                    chebfit_dct=None, troefit_dct=None, nprocs=1):
     """ Fits all reactions in a rxn_ktp_dct to some desired form
 
         :param rxn_ktp_dct: rate constants to be fitted, for multiple reactions
@@ -51,32 +54,82 @@ def fit_rxn_ktp_dct(rxn_ktp_dct, fit_method, pdep_dct=None, arrfit_dct=None,
         :type chebfit_dct: dict
         :param troefit_dct: instructions for Troe fitting
         :type troefit_dct: dict
+        :param nprocs: number of processes to fit reactions with; if not 1,
+            the printed output of each reaction is captured and printed in
+            the order of the rxn_ktp_dct
+        :type nprocs: int or 'auto'
         :return rxn_param_dct: fitted parameters for each reaction
         :rtype: dict {rxn: params}
         :return rxn_err_dct: fitting errors for each reaction
         :rtype: dict {rxn: err_dct}
     """
-    def rxn_name_str(rxn, newline=False):
-        """ get a reaction name string
-        """
-        return ' = '.join((' + '.join(rxn[0]), ' + '.join(rxn[1])))
 
+    args = (rxn_ktp_dct, fit_method, pdep_dct, arrfit_dct, chebfit_dct,
+            troefit_dct)
+    if nprocs == 1:
+        fit_results = _fit_rxns(*args, tuple(rxn_ktp_dct.keys()),
+                                capture_log=False)
+    else:
+        fit_results = autorun.execute_function_in_parallel(
+            _fit_rxns, tuple(rxn_ktp_dct.keys()), args, nprocs=nprocs)
+    fit_result_dct = dict(fit_results)
+
+    # Assemble the results (and print the logs) in the input order
     rxn_param_dct = {}
     rxn_err_dct = {}
-    for rxn, ktp_dct in rxn_ktp_dct.items():
-        print(f'\nFitting Reaction: {rxn_name_str(rxn)}')
-        params, err_dct = fit_ktp_dct(ktp_dct, fit_method, pdep_dct=pdep_dct,
-                                      arrfit_dct=arrfit_dct,
-                                      chebfit_dct=chebfit_dct,
-                                      troefit_dct=troefit_dct)
+    for rxn in rxn_ktp_dct:
+        params, err_dct, log = fit_result_dct[rxn]
+        if log is not None:
+            print(log, end='')
         if all(x is not None for x in (params, err_dct)):
             rxn_param_dct[rxn] = params
             rxn_err_dct[rxn] = err_dct
-        print('--------------------------------\n')
 
     return rxn_param_dct, rxn_err_dct
 
 
+def _fit_rxns(rxn_ktp_dct, fit_method, pdep_dct, arrfit_dct, chebfit_dct,
+              troefit_dct, rxns, output_queue=None, capture_log=True):
+    """ Fits a subset of the reactions in a rxn_ktp_dct
+
+        :param rxns: reactions to fit
+        :type rxns: tuple
+        :param output_queue: if given, the results are put here (for use with
+            autorun.execute_function_in_parallel) instead of returned
+        :type output_queue: multiprocessing.Queue
+        :param capture_log: whether to return the printed output of each fit
+            rather than print it
+        :type capture_log: Bool
+        :return fit_results: fitting results for each reaction
+        :rtype: tuple ((rxn, (params, err_dct, log)), ...)
+    """
+
+    fit_results = ()
+    for rxn in rxns:
+        log = io.StringIO()
+        with (contextlib.redirect_stdout(log) if capture_log
+              else contextlib.nullcontext()):
+            print(f'\nFitting Reaction: {_rxn_name_str(rxn)}')
+            params, err_dct = fit_ktp_dct(
+                rxn_ktp_dct[rxn], fit_method, pdep_dct=pdep_dct,
+                arrfit_dct=arrfit_dct, chebfit_dct=chebfit_dct,
+                troefit_dct=troefit_dct)
+            print('--------------------------------\n')
+        log = log.getvalue() if capture_log else None
+        fit_results += ((rxn, (params, err_dct, log)),)
+
+    if output_queue is not None:
+        output_queue.put(fit_results)
+
+    return fit_results
+
+
+def _rxn_name_str(rxn):
+    """ get a reaction name string
+    """
+    return ' = '.join((' + '.join(rxn[0]), ' + '.join(rxn[1])))
+
+
 def fit_ktp_dct(ktp_dct, fit_method, pdep_dct=None, arrfit_dct=None,
                 chebfit_dct=None, troefit_dct=None):
     """ Fits a single ktp_dct to some desired form
@@ -12,7 +12,7 @@ RC = phycon.RC_CAL  # universal gas constant in cal/mol-K
 GUESS_BNDS = ((1, 1e4), (0.1, 20), (1, 100))  # guess bounds for double fitting
 
 
-def get_params(ktp_dct, dbltol=15, dbl_iter=1, tref=1.0):
+def get_params(ktp_dct, dbltol=15, dbl_iter=1, tref=1.0, multi_start=False):
     """ Gets the fitting parameters for an Arrhenius fit to rate constant data.
         Also gets the errors of that fit. Performs either a single or double
         Arrhenius fit.
@@ -25,6 +25,9 @@ def get_params(ktp_dct, dbltol=15, dbl_iter=1, tref=1.0):
         :type dbl_iter: int
         :param tref: reference temp for the modified Arrhenius form
         :type tref: float
+        :param multi_start: whether to rank all double-fit initial guesses
+            before refining them (see double_arr)
+        :type multi_start: Bool
         :return params: fitted Arrhenius parameters
         :rtype: autoreact.RxnParams object
         :return err_dct: fitting errors
@@ -62,7 +65,8 @@ def get_params(ktp_dct, dbltol=15, dbl_iter=1, tref=1.0):
 
         # Perfom a double fit
         doub_params, guess_idx = double_arr(temps, kts, sing_params, tref=tref,
-                                            dbltol=dbltol, dbl_iter=dbl_iter)
+                                            dbltol=dbltol, dbl_iter=dbl_iter,
+                                            multi_start=multi_start)
 
         # Assess errors
         doub_err_dct = err.get_err_dct(ktp_dct, doub_params)
@@ -144,7 +148,8 @@ def single_arr(temps, kts, tref=1.0):
     return params
 
 
-def double_arr(temps, kts, sing_params, tref=1.0, dbltol=15, dbl_iter=1):
+def double_arr(temps, kts, sing_params, tref=1.0, dbltol=15, dbl_iter=1,
+               multi_start=False):
     """ Fit a set of T-dependent rate constants to a double Arrhenius form; can
         do so by iterating across a range of guesses by modifying the provided
         single Arrhenius fitting parameters
@@ -161,36 +166,28 @@ def double_arr(temps, kts, sing_params, tref=1.0, dbltol=15, dbl_iter=1):
         :type dbltol: float
         :param dbl_iter: max number of iterations for double fitting
         :type dbl_iter: int
+        :param multi_start: whether to score all initial guesses at once and
+            refine them from best to worst, rather than in a fixed order
+        :type multi_start: Bool
         :return params: fitted double Arrhenius parameters
         :rtype: autoreact.RxnParams object
         :return guess_idx: number of double fits performed
         :rtype: int
     """
 
-    def fit_doub_arr(temps, kts, sing_params, a_change, n_change, tref=1.0,
+    def fit_doub_arr(temps, kts, init_guess, doub_tref, tref=1.0,
                      allow_neg=False):
-        """ Performs one double Arrhenius fit by generating initial guesses
-            using changes to the single Arrhenius fit
+        """ Performs one double Arrhenius fit from an initial guess
 
-            :param a_change: amount by which to vary the A factor
-            :type a_change: float
-            :param n_change: amount by which to vary the temperature exponent
-            :type n_change: float
+            :param init_guess: initial guess, with A at the doub_tref basis
+            :type init_guess: numpy.ndarray [A1, n1, Ea1, A2, n2, Ea2]
+            :param doub_tref: reference temp used during the fit
+            :type doub_tref: float
             :return params: fitted double Arrhenius parameters
             :rtype: autoreact.RxnParams object
             (all other inputs same as parent function)
         """
 
-        sing_a, sing_n, sing_ea = sing_params.arr[0]  # get first (only) entry
-
-        # Get a new tref for the double fit: the logarithmic midpoint temp
-        doub_tref = numpy.sqrt(max(temps) / min(temps)) * min(temps)
-
-        # Generate guesses by varying single parameters
-        sing_a = sing_a * (doub_tref / tref) ** sing_n  # convert to new basis
-        init_guess = [(sing_a * a_change), (sing_n + n_change), sing_ea,
-                      (sing_a * (1 - a_change)), (sing_n - n_change), sing_ea]
-
         # Set bounds: np.inf works better than setting e.g., 1e+300, but slower
         if allow_neg:  # no bounds
             bounds = ([-numpy.inf, -numpy.inf, -numpy.inf, -numpy.inf, 
@@ -204,9 +201,10 @@ def double_arr(temps, kts, sing_params, tref=1.0, dbltol=15, dbl_iter=1):
         # Perform a least-squares fit
         # note: previous version scipy.optimize.leastsq (unbounded): used method='lm'
         # same or better results obtained with x_scale='jac' for new cases tested
-        plsq = least_squares(_resid_func, init_guess, bounds=bounds,
-                             args=(temps, kts, doub_tref), x_scale = 'jac', #method = 'lm',
-                             ftol=1.0E-8, xtol=1.0E-8, max_nfev=100000)
+        plsq = least_squares(_resid_func, init_guess, jac=_resid_jac,
+                             bounds=bounds, args=(temps, kts, doub_tref),
+                             x_scale='jac', ftol=1.0E-8, xtol=1.0E-8,
+                             max_nfev=100000)
 
         # Retrieve the fit params and convert A back to the input tref
         raw_params = list(plsq.x)  # list of length 6
@@ -224,6 +222,28 @@ def double_arr(temps, kts, sing_params, tref=1.0, dbltol=15, dbl_iter=1):
     n_changes = [1.2, 1.5, 1.9, 2.5, 3]
     predef_iter = len(a_changes) * len(n_changes) + 1  # +1 for the first guess
 
+    # Get a new tref for the double fit: the logarithmic midpoint temp
+    doub_tref = numpy.sqrt(max(temps) / min(temps)) * min(temps)
+
+    # Generate guesses by varying single parameters; use SJK's guesses as the
+    # first try, then loop over the predefined A and n changes
+    changes = [(0.5, 2)] + [(a_change, n_change) for n_change in n_changes
+                            for a_change in a_changes]
+    sing_a, sing_n, sing_ea = sing_params.arr[0]  # get first (only) entry
+    sing_a = sing_a * (doub_tref / tref) ** sing_n  # convert to new basis
+    init_guesses = numpy.array([
+        [(sing_a * a_change), (sing_n + n_change), sing_ea,
+         (sing_a * (1 - a_change)), (sing_n - n_change), sing_ea]
+        for a_change, n_change in changes])
+
+    # If indicated, score every guess with one residual evaluation and try
+    # the most promising ones first (NaN costs are sorted to the end)
+    if multi_start:
+        with numpy.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            costs = numpy.sum(
+                _resid_func(init_guesses, temps, kts, doub_tref)**2, axis=1)
+        init_guesses = init_guesses[numpy.argsort(costs)]
+
     # Make a maximum of dbl_iter attempts at a double fit
     max_errs = []
     prev_params = []
@@ -231,17 +251,8 @@ def double_arr(temps, kts, sing_params, tref=1.0, dbltol=15, dbl_iter=1):
     # since this ref_ktp_dct never gets returned
     ref_ktp_dct = {'high': (temps, kts)}  # used for err_dct later
     for guess_idx in range(dbl_iter):
-        # Use SJK's guesses as first try
-        if guess_idx == 0:
-            a_change = 0.5
-            n_change = 2
-        # Otherwise, loop over the predefined A and n changes
-        else:
-            a_change = a_changes[(guess_idx - 1) % 5]
-            n_change = n_changes[int((guess_idx - 1) / 5)]
-
         # Perform a double fit
-        params = fit_doub_arr(temps, kts, sing_params, a_change, n_change,
+        params = fit_doub_arr(temps, kts, init_guesses[guess_idx], doub_tref,
                               tref=tref)
 
         # Get an err_dct and the max error
@@ -266,8 +277,10 @@ def double_arr(temps, kts, sing_params, tref=1.0, dbltol=15, dbl_iter=1):
 def _resid_func(curr_guess, temps, kts, tref):
     """ Computes the residual between fit and data for double fitter
 
-        :param curr_guess: current guess for double Arrhenius params
-        :type curr_guess: list [A1, n1, Ea1, A2, n2, Ea2]
+        :param curr_guess: current guess for double Arrhenius params; several
+            guesses can be evaluated at once by stacking them
+        :type curr_guess: list [A1, n1, Ea1, A2, n2, Ea2] or numpy.ndarray of
+            shape (num_guesses, 6)
         :param temps: temperatures at which rate constants are defined (K)
         :type temps: numpy.ndarray of shape (num_temps,)
         :param kts: rate constants
@@ -275,20 +288,56 @@ def _resid_func(curr_guess, temps, kts, tref):
         :param tref: reference temp for the modified Arrhenius form
         :type tref: float
         :return resid: residual between fit and data
-        :rtype: Numpy.ndarray of shape (num_temps,)
+        :rtype: Numpy.ndarray of shape (num_temps,) or (num_guesses, num_temps)
     """
 
     # Compute the fitted rate constants
-    k_fit1 = curr_guess[0] * numpy.exp(
-        curr_guess[1] * numpy.log(temps / tref) - curr_guess[2] / (RC * temps))
-    k_fit2 = curr_guess[3] * numpy.exp(
-        curr_guess[4] * numpy.log(temps / tref) - curr_guess[5] / (RC * temps))
-    k_fit = k_fit1 + k_fit2
+    curr_guess = numpy.asarray(curr_guess, dtype=float)
+    a_par1, a_par2 = curr_guess[..., [0]], curr_guess[..., [3]]
+    exp1, exp2 = _double_exp_terms(curr_guess, temps, tref)
+    k_fit = a_par1 * exp1 + a_par2 * exp2
     resid = numpy.log10(kts) - numpy.log10(k_fit)
 
     return resid
 
 
+def _resid_jac(curr_guess, temps, kts, tref):
+    """ Computes the analytic Jacobian of the double fitter residual with
+        respect to [A1, n1, Ea1, A2, n2, Ea2]
+
+        :return jac: derivatives of the residual
+        :rtype: Numpy.ndarray of shape (num_temps, 6)
+        (inputs same as _resid_func for a single guess)
+    """
+
+    _ = kts  # the data only shifts the residual, so it drops out
+    a_par1, a_par2 = curr_guess[0], curr_guess[3]
+    exp1, exp2 = _double_exp_terms(curr_guess, temps, tref)
+    k_fit1, k_fit2 = a_par1 * exp1, a_par2 * exp2
+
+    # d(resid)/dp = -(dk/dp) / (k ln10); terms are dk/dA, dk/dn, dk/dEa
+    dlnt, dinvt = numpy.log(temps / tref), -1.0 / (RC * temps)
+    dk_dps = numpy.stack(
+        [exp1, k_fit1 * dlnt, k_fit1 * dinvt,
+         exp2, k_fit2 * dlnt, k_fit2 * dinvt], axis=-1)
+    jac = -dk_dps / ((k_fit1 + k_fit2) * numpy.log(10.0))[:, numpy.newaxis]
+
+    return jac
+
+
+def _double_exp_terms(curr_guess, temps, tref):
+    """ Computes the two T-dependent factors, exp(n ln(T/tref) - Ea/RT), of
+        a double Arrhenius expression (i.e., the k(T)s divided by A)
+    """
+
+    exp1 = numpy.exp(curr_guess[..., [1]] * numpy.log(temps / tref) -
+                     curr_guess[..., [2]] / (RC * temps))
+    exp2 = numpy.exp(curr_guess[..., [4]] * numpy.log(temps / tref) -
+                     curr_guess[..., [5]] / (RC * temps))
+
+    return exp1, exp2
+
+
 def check_for_inf(params):
     """ Checks for infinite values in fitted Arrhenius parameters
 
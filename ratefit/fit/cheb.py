@@ -2,7 +2,7 @@
 """
 
 import numpy
-from scipy.special import eval_chebyt
+from numpy.polynomial.chebyshev import chebvander
 from autoreact.params import RxnParams
 from ratefit.fit import arr
 from ratefit.fit import err
@@ -73,33 +73,85 @@ def get_alpha(ktp_dct, tdeg=4, pdeg=6):
         :rtype: tuple (pmin, pmax)
     """
 
-    def conv_dct_to_array(ktp_dct):
-        """ Converts the contents of a ktp_dct to a Numpy array
+    alphas, tlim, plim = get_alphas([ktp_dct], tdeg=tdeg, pdeg=pdeg)
 
-            :return tp_array: array of kts
-            :rtype: Numpy array of shape (num_temps, num_pressures)
-        """
+    return alphas[0], tlim, plim
 
-        # Check the first pressure to get the number of temps (same for all)
-        num_temps = len(ktp_dct[list(ktp_dct.keys())[0]][0])
-        num_pressures = len(ktp_dct)
-        pt_array = numpy.ndarray([num_pressures, num_temps])
-        pressures = tuple(pressure for pressure in ktp_dct.keys()
-                          if pressure != 'high')
-        for pidx, pressure in enumerate(pressures):
-            _, kts = ktp_dct[pressure]
-            pt_array[pidx, :] = kts
 
-        tp_array = numpy.transpose(pt_array)
+def get_alphas(ktp_dcts, tdeg=4, pdeg=6):
+    """ Performs the Chebyshev fit for several reactions whose rate constants
+        are all on the same grid of temperatures and pressures. The design
+        matrix is built once, and a single least-squares solve is done for
+        all reactions that have k(T,P) values at the same grid points.
 
-        return tp_array
+        :param ktp_dcts: rate constants to be fitted; should be P-dependent
+        :type ktp_dcts: list [ktp_dct1, ktp_dct2, ...]
+        :param tdeg: number of temperature coefficients
+        :type tdeg: int
+        :param pdeg: number of pressure coefficients
+        :type pdeg: int
+        :return alphas: arrays of Chebyshev polynomial coefficients
+        :rtype: numpy.ndarray of shape (num_rxns, tdeg, pdeg)
+        :return tlim: minimum and maximum temperatures of fit
+        :rtype: tuple (tmin, tmax)
+        :return plim: minimum and maximum pressures of fit
+        :rtype: tuple (pmin, pmax)
+    """
 
-    pressures = tuple(pressure for pressure in ktp_dct.keys()
+    pressures = tuple(pressure for pressure in ktp_dcts[0].keys()
                       if pressure != 'high')
-    temps = ktp_dct[pressures[0]][0]  # all temp vectors should be the same
+    temps = ktp_dcts[0][pressures[0]][0]  # all temp vectors should be the same
+
+    # Get the log10 k(T,P)s as columns, flattened with P as the slow index
+    bmat = numpy.zeros((len(pressures) * len(temps), len(ktp_dcts)))
+    for ridx, ktp_dct in enumerate(ktp_dcts):
+        assert all(numpy.allclose(ktp_dct[pressure][0], temps)
+                   for pressure in pressures), (
+            'All ktp_dcts should have the same temps at the same pressures')
+        bmat[:, ridx] = numpy.log10(numpy.concatenate(
+            [ktp_dct[pressure][1] for pressure in pressures]))
+
+    amat, tlim, plim = get_design_matrix(temps, pressures, tdeg, pdeg)
+
+    # Do one least-squares fit for each pattern of missing (NaN) values;
+    # typically all rxns share one pattern, so there is one fit
+    thetas = numpy.zeros((tdeg * pdeg, len(ktp_dcts)))
+    masks, mask_idxs = numpy.unique(~numpy.isnan(bmat), axis=1,
+                                    return_inverse=True)
+    for midx, mask in enumerate(masks.T):
+        ridxs = numpy.flatnonzero(mask_idxs.ravel() == midx)
+        thetas[:, ridxs] = numpy.linalg.lstsq(
+            amat[mask], bmat[numpy.ix_(mask, ridxs)], rcond=RCOND)[0]
+
+    # theta has P as the slow index; reshape to alpha[tidx, pidx]
+    alphas = numpy.transpose(
+        thetas.T.reshape(len(ktp_dcts), pdeg, tdeg), (0, 2, 1))
+
+    return alphas, tlim, plim
+
+
+def get_design_matrix(temps, pressures, tdeg, pdeg):
+    """ Builds the Chebyshev design matrix on a grid of temperatures and
+        pressures as the Kronecker product of the P and T basis matrices
+
+        :param temps: temperatures of the grid (K)
+        :type temps: numpy.ndarray
+        :param pressures: pressures of the grid (atm)
+        :type pressures: tuple
+        :param tdeg: number of temperature coefficients
+        :type tdeg: int
+        :param pdeg: number of pressure coefficients
+        :type pdeg: int
+        :return amat: design matrix; rows are (P, T) grid points and columns
+            are (P, T) coefficients, both with P as the slow index
+        :rtype: numpy.ndarray of shape (num_p * num_t, pdeg * tdeg)
+        :return tlim: minimum and maximum temperatures of fit
+        :rtype: tuple (tmin, tmax)
+        :return plim: minimum and maximum pressures of fit
+        :rtype: tuple (pmin, pmax)
+    """
 
-    # Get info on temps and pressures
-    tnum, pnum = len(temps), len(pressures)
+    temps = numpy.asarray(temps, dtype=float)
     tmin, tmax = min(temps), max(temps)
     pmin, pmax = min(pressures), max(pressures)
 
@@ -109,49 +161,11 @@ def get_alpha(ktp_dct, tdeg=4, pdeg=6):
     pred = (2*numpy.log10(pressures) - numpy.log10(pmin) - numpy.log10(pmax))\
         / (numpy.log10(pmax) - numpy.log10(pmin))
 
-    # Convert the ktp_dct to a Numpy array of shape (num_temps, num_pressures)
-    tp_array = conv_dct_to_array(ktp_dct)
-
-    # Create matrices for fits
-    amat = numpy.zeros((tnum * pnum, tdeg * pdeg), numpy.float64)
-    bvec = numpy.zeros((tnum * pnum), numpy.float64)
-    nzero = 0
-    for tidx1, temp in enumerate(tred):
-        for pidx1, press in enumerate(pred):
-            for tidx2 in range(tdeg):
-                for pidx2 in range(pdeg):
-                    idx1 = (pidx1 * tnum + tidx1)
-                    idx2 = (pidx2 * tdeg + tidx2)
-                    amat[idx1, idx2] = (
-                        eval_chebyt(tidx2, temp) * eval_chebyt(pidx2, press))
-            if tp_array[tidx1, pidx1] is not None:
-                bvec[idx1] = numpy.log10(tp_array[tidx1, pidx1])
-            else:
-                bvec[idx1] = None
-                nzero += 1
-
-    nnonzero = tnum * pnum - nzero
-    idxp = -1
-    amatp = numpy.zeros((nnonzero, tdeg * pdeg), numpy.float64)
-    bvecp = numpy.zeros((nnonzero), numpy.float64)
-    for idx in range(tnum*pnum):
-        if not numpy.isnan(bvec[idx]):
-            idxp += 1
-            bvecp[idxp] = bvec[idx]
-            for idx2 in range(tdeg*pdeg):
-                amatp[idxp, idx2] = amat[idx, idx2]
-
-    # Perform least-squares fit to get alpha coefficients
-    theta = numpy.linalg.lstsq(amatp, bvecp, rcond=RCOND)[0]
-
-    alpha = numpy.zeros((tdeg, pdeg), numpy.float64)
-    for tidx2 in range(tdeg):
-        for pidx2 in range(pdeg):
-            alpha[tidx2, pidx2] = theta[pidx2 * tdeg + tidx2]
+    amat = numpy.kron(chebvander(pred, pdeg - 1), chebvander(tred, tdeg - 1))
     tlim = (tmin, tmax)
     plim = (pmin, pmax)
 
-    return alpha, tlim, plim
+    return amat, tlim, plim
 
 
 def check_viability(ktp_dct):
@@ -56,7 +56,38 @@ def test_double():
     max_err = err.get_max_err(err_dct)
     assert max_err < 15  # %
 
+    # Multi-start mode should do at least as well
+    _, err_dct = arr.get_params(KTP_DCT_2, dbl_iter=5, multi_start=True)
+    max_err = err.get_max_err(err_dct)
+    assert max_err < 15  # %
+
+
+def test_resid_jac():
+    """ Test the analytic Jacobian of the double Arrhenius residual
+    """
+    guess = numpy.array([3e10, 0.5, -200, 2e9, 2.1, 3000])
+    jac = arr._resid_jac(guess, TEMPS_2, KTS_2, 300)
+
+    # Compare against central finite differences
+    fd_jac = numpy.zeros_like(jac)
+    for idx in range(6):
+        step = numpy.zeros(6)
+        step[idx] = 1e-6 * abs(guess[idx])
+        fd_jac[:, idx] = (
+            arr._resid_func(guess + step, TEMPS_2, KTS_2, 300) -
+            arr._resid_func(guess - step, TEMPS_2, KTS_2, 300)) / (2 * step[idx])
+    col_scale = numpy.max(numpy.abs(fd_jac), axis=0)
+    assert numpy.allclose(jac, fd_jac, rtol=1e-5, atol=1e-7 * col_scale)
+
+    # Stacked guesses give the same residuals as individual ones
+    guesses = numpy.array([guess, 1.1 * guess])
+    resids = arr._resid_func(guesses, TEMPS_2, KTS_2, 300)
+    assert resids.shape == (2, len(TEMPS_2))
+    assert numpy.allclose(
+        resids[1], arr._resid_func(1.1 * guess, TEMPS_2, KTS_2, 300))
+
 
 if __name__ == '__main__':
     test_single()
     test_double()
+    test_resid_jac()
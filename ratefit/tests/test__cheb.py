@@ -89,5 +89,26 @@ def test_cheb():
     assert max_err < 5
 
 
+def test_get_alphas():
+    """ test ratefit.fit.cheb.get_alphas
+    """
+
+    # Second rxn has a missing value, so it needs its own least-squares fit
+    ktp_dct2 = {pressure: (temps, kts.copy())
+                for pressure, (temps, kts) in KTP_DCT.items()}
+    ktp_dct2[1.0][1][3] = numpy.nan
+    ktp_dcts = [KTP_DCT, ktp_dct2, KTP_DCT]
+
+    alphas, tlim, plim = cheb.get_alphas(ktp_dcts, tdeg=TDEG, pdeg=PDEG)
+    assert alphas.shape == (3, TDEG, PDEG)
+    for ridx, ktp_dct in enumerate(ktp_dcts):
+        alpha, tlim1, plim1 = cheb.get_alpha(ktp_dct, tdeg=TDEG, pdeg=PDEG)
+        assert numpy.allclose(alphas[ridx], alpha)
+        assert numpy.allclose(tlim, tlim1)
+        assert numpy.allclose(plim, plim1)
+    assert numpy.allclose(alphas[0], alphas[2])
+
+
 if __name__ == '__main__':
     test_cheb()
+    test_get_alphas()
@@ -217,9 +217,28 @@ def test_fit_rxn_ktp_dct():
         assert numpy.allclose(ref_arr_params, params.arr)
 
 
+def test_fit_rxn_ktp_dct_parallel():
+    """ Tests the fitting of a rxn_ktp_dct using multiple processes
+    """
+
+    rxn_ktp_dct = {}
+    for idx in range(4):
+        for rxn, ktp_dct in RXN_KTP_DCT.items():
+            rxn_ktp_dct[(rxn[0], rxn[1] + (f'X{idx}',), rxn[2])] = ktp_dct
+
+    ref_rxn_param_dct, _ = fit.fit_rxn_ktp_dct(rxn_ktp_dct, 'arr')
+    rxn_param_dct, rxn_err_dct = fit.fit_rxn_ktp_dct(
+        rxn_ktp_dct, 'arr', nprocs=2)
+    assert list(rxn_param_dct.keys()) == list(rxn_ktp_dct.keys())
+    assert list(rxn_err_dct.keys()) == list(rxn_ktp_dct.keys())
+    for rxn, params in rxn_param_dct.items():
+        assert numpy.allclose(ref_rxn_param_dct[rxn].arr, params.arr)
+
+
 if __name__ == '__main__':
     test_assess_fit_method()
     test_fit_arr()
     test_fit_plog()
     test_fit_cheb()
     test_fit_rxn_ktp_dct()
+    test_fit_rxn_ktp_dct_parallel()
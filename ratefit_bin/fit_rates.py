@@ -24,6 +24,8 @@ PAR.add_argument('-c', '--chemkin', default='rate.ckin',
                  help='Chemkin ouput name (rate.ckin)')
 PAR.add_argument('-f', '--fit-method', default='plog',
                  help='method to fit the rates (plog, chebyshev)')
+PAR.add_argument('-n', '--nprocs', default=1, type=int,
+                 help='number of processes to fit reactions with (1)')
 OPTS = vars(PAR.parse_args())
 
 # Read label dct
@@ -37,7 +39,7 @@ rxn_ktp_dct = mess_io.reader.rates.get_rxn_ktp_dct(
 
 # Fit rates
 rxn_param_dct, rxn_err_dct = ratefit.fit.fit_rxn_ktp_dct(
-    rxn_ktp_dct, OPTS['fit_method'],
+    rxn_ktp_dct, OPTS['fit_method'], nprocs=OPTS['nprocs'],
 )
 
 # Get the comments dct and write the Chemkin string